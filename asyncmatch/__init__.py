@@ -1,6 +1,47 @@
+from .abort_condition import (
+    AbortCondition,
+    AbortSignal,
+    add_abort_condition,
+    remove_abort_condition,
+)
 from .assert_eventually import (
     assert_eventually,
     wait_until,
+    assert_all_eventually,
+    assert_any_eventually,
+    wait_until_all,
+    wait_until_any,
+)
+from .assert_consistently import assert_consistently, assert_stable_for
+from .async_assert_eventually import (
+    assert_eventually_async,
+    wait_until_async,
+)
+from .async_probe import AsyncProbe
+from .broker import RemoteSource, SampleBroker
+from .calibration import CalibrationStore
+from .change_detecting_probe import ChangeDetectingProbe
+from .clock import Clock, SystemClock, VirtualClock
+from .command_probe import CommandProbe, CommandStreamProbe, Shell
+from .composite_probe import AllOfProbe, AnyOfProbe
+from .exceptions import SynchronisationTimeout, WaitAborted
+from .http_probe import HttpConnectionPool, HttpProbe
+from .log_file_probe import LogFileProbe
+from .notifying_probe import NotifyingProbe
+from .poll_observer import PollObserver, add_observer, remove_observer
+from .poll_schedule import (
+    PollSchedule,
+    FixedDelay,
+    ExponentialBackoff,
+    DecorrelatedJitter,
+    FastStart,
 )
-from .exceptions import SynchronisationTimeout
-from .probe import Probe
\ No newline at end of file
+from .poll_scheduler import PollScheduler
+from .poll_statistics import PollStatistics
+from .poll_trace import PollTracer
+from .probe import Probe
+from .sample_source import SampleSource
+from .source_probe import SourceProbe
+from .stream_probe import StreamProbe
+from .wait_options import WaitOptions
+from .watch import Watch, watch
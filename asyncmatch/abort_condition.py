@@ -0,0 +1,96 @@
+from .callable_probe import _callable_description
+from .notification import Notification
+from collections.abc import Callable, Iterable
+from threading import Lock
+from typing import Optional
+
+class AbortCondition:
+    """
+    Something that, once it has happened, means that no wait can succeed,
+    e.g. the service under test has crashed. A Poller checks its abort
+    conditions alongside the probe, and gives up at once when one is met.
+
+    The predicate returns whether the condition is met, or a string saying
+    why, e.g. the exit status of the crashed service.
+    """
+
+    def __init__(self, predicate: Callable[[], bool | str | None], description: Optional[str] = None):
+        self._predicate = predicate
+        self._description = description or _callable_description(predicate)
+
+    @property
+    def notification(self) -> Optional[Notification]:
+        """
+        Set when the condition is met, to wake a Poller at once, if the
+        condition knows when that happens.
+        """
+        return None
+
+    def reason(self) -> Optional[str]:
+        """
+        Why the wait should be aborted, or None if it should not.
+        """
+        result = self._predicate()
+        if not result:
+            return None
+        return result if isinstance(result, str) else self._description
+
+class AbortSignal(AbortCondition):
+    """
+    An abort condition that is met when it is told to abort, e.g. by a
+    watchdog thread or a test double's disconnect callback. Any Poller
+    waiting is woken at once.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._reason: Optional[str] = None
+        self._notification = Notification()
+
+    @property
+    def notification(self) -> Notification:
+        return self._notification
+
+    def abort(self, reason: str) -> None:
+        """
+        Abort every wait watching the signal, now and until it is reset.
+        Safe to call from any thread.
+        """
+        with self._lock:
+            self._reason = reason
+        self._notification.set()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._reason = None
+
+    def reason(self) -> Optional[str]:
+        with self._lock:
+            return self._reason
+
+def as_abort_condition(condition: AbortCondition | Callable[[], bool | str | None]) -> AbortCondition:
+    if isinstance(condition, AbortCondition):
+        return condition
+    return AbortCondition(condition)
+
+_abort_conditions: tuple[AbortCondition, ...] = ()
+
+def add_abort_condition(condition: AbortCondition | Callable[[], bool | str | None]) -> AbortCondition:
+    """
+    Abort every wait from now on if the condition is met, e.g. for the rest
+    of a test session. Returns the condition, to remove it later.
+    """
+    global _abort_conditions
+    condition = as_abort_condition(condition)
+    _abort_conditions = (*_abort_conditions, condition)
+    return condition
+
+def remove_abort_condition(condition: AbortCondition) -> None:
+    global _abort_conditions
+    _abort_conditions = tuple(c for c in _abort_conditions if c is not condition)
+
+def abort_conditions(conditions: Iterable[AbortCondition]) -> tuple[AbortCondition, ...]:
+    """
+    The given abort conditions together with those added for every wait.
+    """
+    return (*conditions, *_abort_conditions)
@@ -0,0 +1,55 @@
+from .assert_eventually import _get_probe, _make_poller, _report_abort_of_probe, _report_failure_of_probe, _wait_for_poller
+from .poll_schedule import PollSchedule
+from .poller import Poller, PollerAborted, PollerViolation
+from .probe import Probe
+from .wait_options import WaitOptions
+from collections.abc import Callable
+from typing import Optional, Unpack
+
+def _hold_for_poller(poller: Poller, probe: Probe, reason: str) -> None:
+    try:
+        poller.check_consistently(probe)
+    except PollerViolation as violation:
+        _report_failure_of_probe(probe, reason, AssertionError, violation.notes)
+    except PollerAborted as aborted:
+        _report_abort_of_probe(probe, reason, aborted)
+
+def assert_consistently(probe: Probe | Callable[[], bool], duration: float, poll_delay: float | PollSchedule, reason: Optional[str] = "", **options: Unpack[WaitOptions]) -> None:
+    """
+    Polls some system state using the Probe, checking that it remains
+    satisfied for the whole duration. The AssertionError is raised as soon as
+    the probe is not satisfied, rather than at the end of the duration, and
+    says how long the probe remained satisfied.
+
+    A NotifyingProbe is resampled whenever it is notified. To see a
+    violation that comes and goes between polls, the probe must latch it,
+    e.g. in an event callback, so that it is still unsatisfied when
+    resampled: a probe that samples only the current state may have
+    reverted by then. The duration
+    is never shortened by calibration, as that would weaken the assertion.
+    The keyword options are as for assert_eventually.
+    """
+    probe = _get_probe(probe, options.get("sample_budget"))
+    _hold_for_poller(
+        _make_poller(probe, duration, poll_delay, options, calibrate=False),
+        probe,
+        reason)
+
+def assert_stable_for(probe: Probe | Callable[[], bool], duration: float, stable_for: float, poll_delay: float | PollSchedule, reason: Optional[str] = "", **options: Unpack[WaitOptions]) -> None:
+    """
+    Polls some system state using the Probe until it is satisfied, as
+    assert_eventually does, and then checks that it remains satisfied for a
+    further ``stable_for`` seconds, as assert_consistently does. A probe that
+    is satisfied only briefly, e.g. a relay that bounces, fails as soon as it
+    is seen to be unsatisfied again.
+    """
+    probe = _get_probe(probe, options.get("sample_budget"))
+    _wait_for_poller(
+        _make_poller(probe, duration, poll_delay, options),
+        probe,
+        reason,
+        AssertionError)
+    _hold_for_poller(
+        _make_poller(probe, stable_for, poll_delay, options, calibrate=False),
+        probe,
+        reason)
@@ -1,37 +1,78 @@
+from .abort_condition import as_abort_condition
+from .calibration import calibrated, call_site
 from .callable_probe import CallableProbe
-from .exceptions import SynchronisationTimeout
+from .composite_probe import AllOfProbe, AnyOfProbe
+from .exceptions import SynchronisationTimeout, WaitAborted
+from .poll_schedule import PollSchedule
 from .probe import Probe
-from .poller import Poller, PollerTimeout
+from .poller import Poller, PollerAborted, PollerTimeout
+from .sample_history import SampleHistory
+from .sampler import BudgetedSampler, Sampler
 from .timeout import Timeout
-from collections.abc import Callable
+from .wait_options import WaitOptions
+from collections.abc import Callable, Iterable
+from functools import partial
 from hamcrest.core.string_description import StringDescription
 from hamcrest.core.helpers.ismock import ismock
-from typing import Optional
+from typing import Optional, Unpack
 
-def _report_failure_of_probe(probe: Probe, reason: str, exc_type: Exception) -> None:
+def _report_failure_of_probe(probe: Probe, reason: str, exc_type: Exception, notes: Iterable[str] = ()) -> None:
     description = StringDescription()
     description.append_text(reason).  \
         append_text("\nExpected: ").  \
         append_description_of(probe). \
         append_text("\n     but: ")
     probe.describe_mismatch(description)
+    for note in notes:
+        description.append_text(f"\n    note: {note}")
     raise exc_type(description) from None
 
-def _get_probe(probe: Probe | Callable[[], bool]) -> Probe:
+def _report_abort_of_probe(probe: Probe, reason: str, aborted: PollerAborted) -> None:
+    _report_failure_of_probe(
+        probe,
+        reason,
+        partial(WaitAborted, reason=aborted.reason),
+        [f"aborted: {aborted.reason}", *aborted.notes])
+
+def _get_probe(probe: Probe | Callable[[], bool], sample_budget: Optional[float] = None) -> Probe:
     """
-    Converts a callable into a CallableProbe instance if necessary.
+    Converts a callable into a CallableProbe instance if necessary. Under a
+    sample budget, the callable is not called until the Poller samples it.
     """
     if isinstance(probe, Probe):
         return probe
-    return CallableProbe(probe)
+    return CallableProbe(probe, sample=sample_budget is None)
 
 def _wait_for_poller(poller: Poller, probe: Probe, reason: str, exc_type: Exception) -> None:
     try:
         poller.check(probe)
-    except PollerTimeout:
-        _report_failure_of_probe(probe, reason, exc_type)
+    except PollerTimeout as timeout:
+        _report_failure_of_probe(probe, reason, exc_type, timeout.notes)
+    except PollerAborted as aborted:
+        _report_abort_of_probe(probe, reason, aborted)
 
-def assert_eventually(probe: Probe | Callable[[], bool], duration: float, poll_delay: float, reason: Optional[str] = "") -> None:
+def _make_poller(probe: Probe, duration: float, poll_delay: float | PollSchedule, options: WaitOptions, poller_type: type[Poller] = Poller, calibrate: bool = True) -> Poller:
+    """
+    Makes the Poller for a wait, given the WaitOptions passed to the wait.
+    """
+    unknown = options.keys() - WaitOptions.__annotations__.keys()
+    if unknown:
+        raise TypeError(f"unexpected wait option(s): {', '.join(sorted(unknown))}")
+    sample_budget = options.get("sample_budget")
+    history = options.get("history", 0)
+    site = call_site()
+    if calibrate:
+        duration, poll_delay = calibrated(probe, duration, poll_delay, site)
+    timeout = Timeout(duration, poll_delay, options.get("fixed_rate", False), options.get("clock"))
+    return poller_type(
+        timeout,
+        BudgetedSampler(sample_budget) if sample_budget is not None else Sampler(),
+        history=SampleHistory(history, timeout.clock) if history else None,
+        abort_conditions=[as_abort_condition(c) for c in options.get("abort_if", ())],
+        sample_first=sample_budget is not None,
+        call_site=site)
+
+def assert_eventually(probe: Probe | Callable[[], bool], duration: float, poll_delay: float | PollSchedule, reason: Optional[str] = "", **options: Unpack[WaitOptions]) -> None:
     """
     Polls some system state using the Probe, until it is satisfied or it times
     out. ``assert_eventually`` is designed to integrate well with PyUnit, pytest
@@ -41,21 +82,86 @@ def assert_eventually(probe: Probe | Callable[[], bool], duration: float, poll_d
 
     It is also compatible with the PyHamcrest library, allowing the use of matchers
     to define the conditions that must be met by the probe.
+
+    The poll_delay may be a number or a PollSchedule. With ``fixed_rate``, the
+    time taken to sample is deducted from each polling delay. With a
+    ``sample_budget``, each sample, including the first, is taken on a worker
+    thread and abandoned if it takes longer than the budget, so that a hung
+    sample cannot hold up the assertion by more than the budget. With a ``history``, the failure message
+    includes a timeline of up to that many of the latest changes in the state
+    of the probe. If any of the ``abort_if`` conditions, or those added with
+    add_abort_condition, is met, a WaitAborted is raised at once. Given a
+    ``clock``, such as a VirtualClock, time is told and waited out by it.
     """
+    probe = _get_probe(probe, options.get("sample_budget"))
     _wait_for_poller(
-        Poller(Timeout(duration, poll_delay)),
-        _get_probe(probe),
+        _make_poller(probe, duration, poll_delay, options),
+        probe,
         reason,
         AssertionError)
 
-def wait_until(probe: Probe | Callable[[], bool], duration: float, poll_delay: float, reason: Optional[str] = "") -> None:
+def wait_until(probe: Probe | Callable[[], bool], duration: float, poll_delay: float | PollSchedule, reason: Optional[str] = "", **options: Unpack[WaitOptions]) -> None:
     """
     Similar to assert_eventaully, but raises a SynchronisationTimeout if the
     Poller times out.
     """
 
+    probe = _get_probe(probe, options.get("sample_budget"))
     _wait_for_poller(
-        Poller(Timeout(duration, poll_delay)),
-        _get_probe(probe),
+        _make_poller(probe, duration, poll_delay, options),
+        probe,
+        reason,
+        SynchronisationTimeout)
+
+def _wait_for_composite(composite: AllOfProbe | AnyOfProbe, poller: Poller, reason: str, exc_type: Exception) -> None:
+    with composite:
+        _wait_for_poller(poller, composite, reason, exc_type)
+
+def assert_all_eventually(probes: Iterable[Probe | Callable[[], bool]], duration: float, poll_delay: float | PollSchedule, reason: Optional[str] = "", **options: Unpack[WaitOptions]) -> None:
+    """
+    Polls several probes concurrently under one shared timeout, until every
+    one of them has been satisfied. The AssertionError raised on timeout
+    describes each probe that was not satisfied.
+    """
+    composite = AllOfProbe(_get_probe(p, options.get("sample_budget")) for p in probes)
+    _wait_for_composite(
+        composite,
+        _make_poller(composite, duration, poll_delay, options),
+        reason,
+        AssertionError)
+
+def assert_any_eventually(probes: Iterable[Probe | Callable[[], bool]], duration: float, poll_delay: float | PollSchedule, reason: Optional[str] = "", **options: Unpack[WaitOptions]) -> None:
+    """
+    Polls several probes concurrently under one shared timeout, until any one
+    of them is satisfied.
+    """
+    composite = AnyOfProbe(_get_probe(p, options.get("sample_budget")) for p in probes)
+    _wait_for_composite(
+        composite,
+        _make_poller(composite, duration, poll_delay, options),
+        reason,
+        AssertionError)
+
+def wait_until_all(probes: Iterable[Probe | Callable[[], bool]], duration: float, poll_delay: float | PollSchedule, reason: Optional[str] = "", **options: Unpack[WaitOptions]) -> None:
+    """
+    Similar to assert_all_eventually, but raises a SynchronisationTimeout if
+    the Poller times out.
+    """
+    composite = AllOfProbe(_get_probe(p, options.get("sample_budget")) for p in probes)
+    _wait_for_composite(
+        composite,
+        _make_poller(composite, duration, poll_delay, options),
+        reason,
+        SynchronisationTimeout)
+
+def wait_until_any(probes: Iterable[Probe | Callable[[], bool]], duration: float, poll_delay: float | PollSchedule, reason: Optional[str] = "", **options: Unpack[WaitOptions]) -> None:
+    """
+    Similar to assert_any_eventually, but raises a SynchronisationTimeout if
+    the Poller times out.
+    """
+    composite = AnyOfProbe(_get_probe(p, options.get("sample_budget")) for p in probes)
+    _wait_for_composite(
+        composite,
+        _make_poller(composite, duration, poll_delay, options),
         reason,
         SynchronisationTimeout)
\ No newline at end of file
@@ -0,0 +1,55 @@
+from .assert_eventually import _make_poller, _report_abort_of_probe, _report_failure_of_probe
+from .async_poller import AsyncPoller
+from .callable_probe import AsyncCallableProbe, CallableProbe
+from .exceptions import SynchronisationTimeout
+from .poller import PollerAborted, PollerTimeout
+from .poll_schedule import PollSchedule
+from .probe import Probe
+from .wait_options import WaitOptions
+from collections.abc import Awaitable, Callable
+from inspect import iscoroutinefunction
+from typing import Optional, Unpack
+
+def _get_async_probe(probe: Probe | Callable[[], bool] | Callable[[], Awaitable[bool]], sample_budget: Optional[float] = None) -> Probe:
+    """
+    Converts a callable or coroutine function into a probe if necessary. As
+    for _get_probe, a callable is not called until sampled under a budget.
+    """
+    if isinstance(probe, Probe):
+        return probe
+    if iscoroutinefunction(probe) or iscoroutinefunction(getattr(probe, "__call__", None)):
+        return AsyncCallableProbe(probe)
+    return CallableProbe(probe, sample=sample_budget is None)
+
+async def _wait_for_async_poller(poller: AsyncPoller, probe: Probe, reason: str, exc_type: Exception) -> None:
+    try:
+        await poller.check(probe)
+    except PollerTimeout as timeout:
+        _report_failure_of_probe(probe, reason, exc_type, timeout.notes)
+    except PollerAborted as aborted:
+        _report_abort_of_probe(probe, reason, aborted)
+
+async def assert_eventually_async(probe: Probe | Callable[[], bool] | Callable[[], Awaitable[bool]], duration: float, poll_delay: float | PollSchedule, reason: Optional[str] = "", **options: Unpack[WaitOptions]) -> None:
+    """
+    The awaitable counterpart of assert_eventually. Polls the probe on the
+    running event loop, so other coroutines keep running while it waits.
+    The probe may be an AsyncProbe, a Probe, or a plain or coroutine function.
+    """
+    probe = _get_async_probe(probe, options.get("sample_budget"))
+    await _wait_for_async_poller(
+        _make_poller(probe, duration, poll_delay, options, AsyncPoller),
+        probe,
+        reason,
+        AssertionError)
+
+async def wait_until_async(probe: Probe | Callable[[], bool] | Callable[[], Awaitable[bool]], duration: float, poll_delay: float | PollSchedule, reason: Optional[str] = "", **options: Unpack[WaitOptions]) -> None:
+    """
+    Similar to assert_eventually_async, but raises a SynchronisationTimeout if
+    the AsyncPoller times out.
+    """
+    probe = _get_async_probe(probe, options.get("sample_budget"))
+    await _wait_for_async_poller(
+        _make_poller(probe, duration, poll_delay, options, AsyncPoller),
+        probe,
+        reason,
+        SynchronisationTimeout)
@@ -0,0 +1,47 @@
+from .async_probe import AsyncProbe
+from .notifying_probe import NotifyingProbe
+from .poll_observer import ObservedCheck, observe
+from .poller import Poller
+from .probe import Probe
+from typing import Optional
+
+class AsyncPoller(Poller):
+    """
+    A Poller that waits on the running event loop instead of blocking its
+    thread, so that many checks can run concurrently on a single loop.
+    """
+
+    async def _sleep_async(self, probe: Probe) -> None:
+        if isinstance(probe, NotifyingProbe):
+            await self.timeout.wait_async(probe.notification)
+        elif self._wake_notification is not None:
+            await self.timeout.wait_async(self._wake_notification)
+        else:
+            await self.timeout.sleep_async()
+
+    async def _sample_async(self, probe: Probe, check: Optional[ObservedCheck]) -> None:
+        start = check.now() if check is not None else 0.0
+        await self.sampler.sample_async(probe, self.timeout)
+        if check is not None:
+            check.sampled(start)
+
+    async def check(self, probe: Probe) -> None:
+        """
+        Check the probe until it is satisfied, the timeout expires or an abort
+        condition is met.
+        """
+        check = observe(probe, self.observers, self.call_site, self.timeout.clock)
+        self._watch_aborts(probe)
+        try:
+            if self.sample_first or isinstance(probe, AsyncProbe):
+                await self._sample_async(probe, check)
+            while not self._observed_satisfied(probe, check):
+                self._check_aborted(check)
+                if self.timeout.timed_out():
+                    raise self._timed_out(check)
+                await self._sleep_async(probe)
+                await self._sample_async(probe, check)
+            self._satisfied(check)
+        finally:
+            self._unwatch_aborts()
+            self.sampler.release()
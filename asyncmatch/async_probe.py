@@ -0,0 +1,18 @@
+from .probe import Probe
+
+class AsyncProbe(Probe):
+
+    """
+    Probes some state of the subject-under-test, where sampling is
+    itself asynchronous, e.g. an HTTP request made with aiohttp.
+    """
+
+    async def sample(self) -> None:
+        """
+        Sample the state of the subject-under-test without blocking the
+        event loop.
+
+        An AsyncProbe cannot sample in its initialiser, so the AsyncPoller
+        samples it once before the first check.
+        """
+        raise NotImplementedError
@@ -0,0 +1,243 @@
+"""
+A local broker process that owns named sample sources, so that parallel test
+processes, e.g. pytest-xdist workers, share one sampler of each device instead
+of contending for it.
+
+The broker listens on a Unix domain socket, and samples each source at most
+once per tick, however many processes are reading it. Snapshots are sent
+pickled, so the socket is only accessible to its owner, and the broker must
+only be used between trusted local processes.
+"""
+from .sample_source import SampleSource
+from argparse import ArgumentParser
+from collections.abc import Callable, Mapping
+from importlib import import_module
+from socketserver import StreamRequestHandler, ThreadingUnixStreamServer
+from threading import Lock, Thread
+from typing import Any, Optional
+import os
+import pickle
+import socket
+import struct
+import sys
+import tempfile
+
+_HEADER = struct.Struct("!I")
+# How often the server checks whether it has been asked to shut down
+_SHUTDOWN_POLL = 0.05
+
+def _send(stream, message: Any) -> None:
+    payload = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    stream.sendall(_HEADER.pack(len(payload)) + payload)
+
+def _receive_exactly(stream, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = stream.recv(size)
+        if not chunk:
+            raise ConnectionError("connection closed by peer")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+def _receive(stream) -> Any:
+    (size,) = _HEADER.unpack(_receive_exactly(stream, _HEADER.size))
+    return pickle.loads(_receive_exactly(stream, size))
+
+def _picklable(error: BaseException) -> BaseException:
+    try:
+        pickle.dumps(error)
+        return error
+    except Exception:
+        return RuntimeError(repr(error))
+
+class _Handler(StreamRequestHandler):
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections.add(self.connection)
+
+    def finish(self) -> None:
+        with self.server.lock:
+            self.server.connections.discard(self.connection)
+        super().finish()
+
+    def handle(self) -> None:
+        while True:
+            try:
+                name = _receive(self.connection)
+            except ConnectionError:
+                return
+            response = self.server.broker._serve(name)
+            try:
+                _send(self.connection, response)
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                _send(self.connection, ("error", RuntimeError(f"cannot send snapshot of {name!r}: {e}")))
+
+class _Server(ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, broker: "SampleBroker"):
+        super().__init__(path, _Handler)
+        self.broker = broker
+        self.lock = Lock()
+        self.connections: set[socket.socket] = set()
+
+    def server_close(self) -> None:
+        super().server_close()
+        with self.lock:
+            for connection in self.connections:
+                try:
+                    connection.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+class SampleBroker:
+    """
+    Serves snapshots from named sample sources over a Unix domain socket.
+    Each source is a SampleSource, or a callable that takes a snapshot, which
+    is sampled at most once per ``tick`` seconds.
+    """
+
+    def __init__(self, path: str | os.PathLike, sources: Mapping[str, SampleSource | Callable[[], Any]], tick: float = 0.1):
+        self.path = os.fspath(path)
+        self._sources = {
+            name: source if isinstance(source, SampleSource) else SampleSource(source, ttl=tick)
+            for name, source in sources.items()}
+        self._server: Optional[_Server] = None
+        self._thread: Optional[Thread] = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _serve(self, name: str) -> tuple:
+        source = self._sources.get(name)
+        if source is None:
+            return "error", KeyError(f"no sample source named {name!r}")
+        try:
+            return "ok", source.read()
+        except Exception as e:
+            return "error", _picklable(e)
+
+    def _bind(self) -> None:
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        # Bind and listen in a directory only the owner can enter, and only
+        # then move the socket into place, so that it is never accessible to
+        # anyone else, and accepts connections as soon as it exists
+        private = tempfile.mkdtemp(prefix="am-", dir=os.path.dirname(self.path) or None)
+        staging = os.path.join(private, "s")
+        try:
+            self._server = _Server(staging, self)
+            os.chmod(staging, 0o600)
+            os.rename(staging, self.path)
+        except BaseException:
+            if self._server is not None:
+                self._server.server_close()
+                self._server = None
+            raise
+        finally:
+            if os.path.exists(staging):
+                os.unlink(staging)
+            os.rmdir(private)
+
+    def start(self) -> None:
+        """
+        Serve on a background thread.
+        """
+        self._bind()
+        self._thread = Thread(target=self._server.serve_forever, args=(_SHUTDOWN_POLL,), name="asyncmatch-broker", daemon=True)
+        self._thread.start()
+
+    def serve_forever(self) -> None:
+        self._bind()
+        try:
+            self._server.serve_forever(_SHUTDOWN_POLL)
+        finally:
+            self._close()
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._close()
+
+    def _close(self) -> None:
+        self._server.server_close()
+        self._server = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+class RemoteSource(SampleSource):
+    """
+    A SampleSource whose snapshots are read from a named source of a
+    SampleBroker, possibly in another process. Use it with a SourceProbe, or
+    anywhere else a SampleSource can be used.
+    """
+
+    def __init__(self, path: str | os.PathLike, name: str, ttl: float = 0.0):
+        super().__init__(self._request, ttl)
+        self._path = os.fspath(path)
+        self._name = name
+        self._connection: Optional[socket.socket] = None
+        self._connection_lock = Lock()
+
+    def close(self) -> None:
+        with self._connection_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _connect(self) -> socket.socket:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            connection.connect(self._path)
+        except OSError:
+            connection.close()
+            raise
+        return connection
+
+    def _exchange(self) -> tuple:
+        if self._connection is None:
+            self._connection = self._connect()
+        try:
+            _send(self._connection, self._name)
+            return _receive(self._connection)
+        except OSError:
+            self._connection.close()
+            self._connection = None
+            raise
+
+    def _request(self) -> Any:
+        with self._connection_lock:
+            try:
+                status, value = self._exchange()
+            except OSError:
+                # The broker may have restarted, so reconnect once
+                status, value = self._exchange()
+        if status != "ok":
+            raise value
+        return value
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = ArgumentParser(
+        prog="python -m asyncmatch.broker",
+        description="Serve named sample sources to test processes over a Unix domain socket.")
+    parser.add_argument("--socket", required=True, help="path of the Unix domain socket")
+    parser.add_argument("--tick", type=float, default=0.1, help="least time between samples of a source")
+    parser.add_argument("factory", help="module:function returning a mapping of names to sources")
+    args = parser.parse_args(argv)
+    module_name, _, function_name = args.factory.partition(":")
+    sources = getattr(import_module(module_name), function_name)()
+    try:
+        SampleBroker(args.socket, sources, args.tick).serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+from .poll_observer import ObservedCheck, PollObserver, add_observer, remove_observer
+from .poll_schedule import ExponentialBackoff, PollSchedule
+from .probe import Probe
+from argparse import ArgumentParser
+from hamcrest.core.string_description import StringDescription
+from math import ceil
+from pathlib import Path
+from threading import Lock
+from typing import NamedTuple, Optional
+import json
+import os
+import sys
+
+class Observation(NamedTuple):
+    elapsed: float
+    satisfied: bool
+
+class Recommendation(NamedTuple):
+    """
+    Timeout parameters recommended for a probe from its history.
+    """
+    observations: int
+    p50: float
+    p95: float
+    p99: float
+    max: float
+    duration: float
+    initial_poll_delay: float
+    max_poll_delay: float
+
+    def poll_schedule(self) -> PollSchedule:
+        return ExponentialBackoff(self.initial_poll_delay, self.max_poll_delay)
+
+def _percentile(ordered: list[float], percent: float) -> float:
+    return ordered[min(len(ordered) - 1, max(0, ceil(percent / 100 * len(ordered)) - 1))]
+
+def recommend(observations: list[Observation], margin: float = 3.0, min_observations: int = 5) -> Optional[Recommendation]:
+    """
+    Recommends a duration of ``margin`` times the 99th percentile of the time
+    taken to be satisfied, and a polling delay starting at a tenth of the
+    median time and backing off to a fifth of the 99th percentile. Timeouts
+    count as having taken as long as they waited. Returns None if there are
+    too few observations to go on.
+    """
+    if len(observations) < min_observations:
+        return None
+    ordered = sorted(o.elapsed for o in observations)
+    p50, p95, p99 = (_percentile(ordered, p) for p in (50, 95, 99))
+    initial_poll_delay = max(p50 / 10, 0.001)
+    return Recommendation(
+        observations=len(ordered),
+        p50=p50,
+        p95=p95,
+        p99=p99,
+        max=ordered[-1],
+        duration=max(p99 * margin, 10 * initial_poll_delay),
+        initial_poll_delay=initial_poll_delay,
+        max_poll_delay=max(p99 / 5, initial_poll_delay))
+
+class CalibrationStore:
+    """
+    An append-only file of the time each probe took to be satisfied, one
+    JSON object per line, identifying probes by their self-description and
+    the call site of the wait.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self._path = Path(path)
+        self._lock = Lock()
+
+    def record(self, probe: str, elapsed: float, satisfied: bool) -> None:
+        line = json.dumps({"probe": probe, "elapsed": round(elapsed, 6), "satisfied": satisfied})
+        with self._lock, open(self._path, "a", encoding="utf-8") as store:
+            store.write(line + "\n")
+
+    def observations(self) -> dict[str, list[Observation]]:
+        observations = {}
+        try:
+            with open(self._path, encoding="utf-8") as store:
+                for line in store:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A line torn by a concurrent writer
+                        continue
+                    observations.setdefault(record["probe"], []).append(
+                        Observation(record["elapsed"], record["satisfied"]))
+        except FileNotFoundError:
+            pass
+        return observations
+
+    def recommendations(self, margin: float = 3.0, min_observations: int = 5) -> dict[str, Recommendation]:
+        recommendations = {}
+        for probe, observations in self.observations().items():
+            recommendation = recommend(observations, margin, min_observations)
+            if recommendation is not None:
+                recommendations[probe] = recommendation
+        return recommendations
+
+    def compact(self, keep: int = 1000) -> None:
+        """
+        Rewrites the store keeping only the latest observations of each probe.
+        """
+        with self._lock:
+            observations = self.observations()
+            temporary = self._path.with_suffix(self._path.suffix + ".tmp")
+            with open(temporary, "w", encoding="utf-8") as store:
+                for probe, history in observations.items():
+                    for observation in history[-keep:]:
+                        store.write(json.dumps({"probe": probe, **observation._asdict()}) + "\n")
+            os.replace(temporary, self._path)
+
+def _identity(description: str, call_site: Optional[str]) -> str:
+    return description if call_site is None else f"{description} at {call_site}"
+
+class CalibrationRecorder(PollObserver):
+    """
+    Records the outcome of every check it observes in a CalibrationStore.
+    """
+
+    def __init__(self, store: CalibrationStore):
+        self.store = store
+
+    def on_satisfied(self, check: ObservedCheck, time_remaining: float) -> None:
+        self.store.record(_identity(check.description, check.call_site), check.elapsed(), True)
+
+    def on_timeout(self, check: ObservedCheck) -> None:
+        self.store.record(_identity(check.description, check.call_site), check.elapsed(), False)
+
+_recorder: Optional[CalibrationRecorder] = None
+_recommendations: dict[str, Recommendation] = {}
+
+def enable(store: CalibrationStore, apply: bool = False) -> None:
+    """
+    Records the time every check takes to be satisfied in the store. With
+    ``apply``, assert_eventually and wait_until also use the parameters
+    recommended by the history already in the store, for probes with enough
+    history, polling as recommended and never waiting longer than the
+    recommended duration.
+    """
+    global _recorder, _recommendations
+    disable()
+    _recorder = CalibrationRecorder(store)
+    _recommendations = store.recommendations() if apply else {}
+    add_observer(_recorder)
+
+def disable() -> None:
+    global _recorder, _recommendations
+    if _recorder is not None:
+        remove_observer(_recorder)
+    _recorder = None
+    _recommendations = {}
+
+_package = os.path.dirname(os.path.abspath(__file__))
+
+def call_site() -> Optional[str]:
+    """
+    The file and line that started the wait being made, i.e. the innermost
+    caller outside asyncmatch, or None when calibration is not enabled. A
+    probe's description alone does not tell apart e.g. two lambdas, which
+    both describe themselves as "<lambda> to be satisfied".
+    """
+    if _recorder is None:
+        return None
+    frame = sys._getframe(1)
+    while frame is not None and os.path.dirname(os.path.abspath(frame.f_code.co_filename)) == _package:
+        frame = frame.f_back
+    if frame is None:
+        return None
+    filename = frame.f_code.co_filename
+    try:
+        filename = os.path.relpath(filename)
+    except ValueError:
+        # On another drive
+        pass
+    return f"{Path(filename).as_posix()}:{frame.f_lineno}"
+
+def calibrated(probe: Probe, duration: float, poll_delay: float | PollSchedule, call_site: Optional[str] = None) -> tuple[float, float | PollSchedule]:
+    """
+    Returns the timeout parameters to use for the probe waited for at the
+    call site, which are those given unless recommendations are being
+    applied. Without a call site, the probe's history cannot be told apart
+    from that of another probe with the same description, so it is not used.
+    """
+    if not _recommendations or call_site is None:
+        return duration, poll_delay
+    recommendation = _recommendations.get(_identity(str(StringDescription().append_description_of(probe)), call_site))
+    if recommendation is None:
+        return duration, poll_delay
+    return min(duration, recommendation.duration), recommendation.poll_schedule()
+
+def report(store: CalibrationStore, margin: float = 3.0, min_observations: int = 5) -> str:
+    lines = [f"{'n':>6} {'timeouts':>8} {'p50 (s)':>8} {'p95 (s)':>8} {'p99 (s)':>8} {'max (s)':>8} "
+             f"{'duration':>9} {'poll delay':>14}  probe"]
+    for probe, observations in sorted(store.observations().items()):
+        timeouts = sum(not o.satisfied for o in observations)
+        recommendation = recommend(observations, margin, min_observations)
+        if recommendation is None:
+            lines.append(f"{len(observations):>6} {timeouts:>8} {'(too few observations)':>59}  {probe}")
+            continue
+        poll_delay = f"{recommendation.initial_poll_delay:.3f}-{recommendation.max_poll_delay:.3f}"
+        lines.append(
+            f"{len(observations):>6} {timeouts:>8} {recommendation.p50:>8.3f} {recommendation.p95:>8.3f} "
+            f"{recommendation.p99:>8.3f} {recommendation.max:>8.3f} {recommendation.duration:>9.3f} "
+            f"{poll_delay:>14}  {probe}")
+    return "\n".join(lines)
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = ArgumentParser(
+        prog="python -m asyncmatch.calibration",
+        description="Report the time probes took to be satisfied, and recommend timeout parameters.")
+    parser.add_argument("store", help="path of the calibration store")
+    parser.add_argument("--margin", type=float, default=3.0,
+                        help="multiple of the 99th percentile to recommend as the duration")
+    parser.add_argument("--min-observations", type=int, default=5,
+                        help="fewest observations needed to make a recommendation")
+    parser.add_argument("--compact", type=int, metavar="KEEP",
+                        help="first rewrite the store keeping the latest KEEP observations of each probe")
+    args = parser.parse_args(argv)
+    store = CalibrationStore(args.store)
+    if args.compact is not None:
+        store.compact(args.compact)
+    print(report(store, args.margin, args.min_observations))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
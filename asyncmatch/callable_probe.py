@@ -1,6 +1,8 @@
+from .async_probe import AsyncProbe
 from .probe import Probe
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from inspect import isclass
+from typing import Optional
 
 def _callable_description(callable_obj: Callable) -> str:
     """
@@ -20,17 +22,31 @@ def _callable_description(callable_obj: Callable) -> str:
     return "Martin"
 
 class CallableProbe(Probe):
-    def __init__(self, probe_func: Callable[[], bool]):
+    """
+    A Probe that calls a callable returning whether it is satisfied. If the
+    callable is expensive, ``changed`` can be a cheap callable returning
+    whether anything may have changed, and the probe is not sampled again
+    until it returns True.
+
+    The callable is first called on construction, unless ``sample`` is False,
+    e.g. so that a Poller can take the first sample under a sample budget.
+    """
+    def __init__(self, probe_func: Callable[[], bool], changed: Optional[Callable[[], bool]] = None, *, sample: bool = True):
         self._description = _callable_description(probe_func)
         self._satisfied = False
         self._probe_func = probe_func
+        self._changed = None
 
-        self.sample()
+        if sample:
+            self.sample()
+        self._changed = changed
     
     def is_satisfied(self) -> bool:
         return self._satisfied
 
     def sample(self) -> None:
+        if self._changed is not None and not self._changed():
+            return
         self._satisfied = self._probe_func()
 
     def describe_to(self, description):
@@ -38,3 +54,21 @@ class CallableProbe(Probe):
 
     def describe_mismatch(self, description):
         description.append_text(f"{self._description} was not satisfied")
+
+class AsyncCallableProbe(AsyncProbe):
+    def __init__(self, probe_func: Callable[[], Awaitable[bool]]):
+        self._description = _callable_description(probe_func)
+        self._satisfied = False
+        self._probe_func = probe_func
+
+    def is_satisfied(self) -> bool:
+        return self._satisfied
+
+    async def sample(self) -> None:
+        self._satisfied = await self._probe_func()
+
+    def describe_to(self, description):
+        description.append_text(f"{self._description} to be satisfied")
+
+    def describe_mismatch(self, description):
+        description.append_text(f"{self._description} was not satisfied")
@@ -0,0 +1,75 @@
+from .probe import Probe
+from collections.abc import Hashable
+from hashlib import blake2b
+from typing import Any
+
+def content_fingerprint(snapshot: Any) -> Hashable:
+    """
+    Fingerprints a snapshot by its repr, which suits snapshots built from
+    dictionaries, lists, strings and numbers. It does not suit a snapshot
+    whose repr leaves out some of its content, such as an object with the
+    default repr, which shows only its identity, or a large NumPy array,
+    whose repr is truncated: a change to what is left out goes unseen.
+    """
+    return blake2b(repr(snapshot).encode(), digest_size=16).digest()
+
+class ChangeDetectingProbe(Probe):
+
+    """
+    A Probe that takes a snapshot of the subject-under-test and matches it,
+    where matching is expensive, e.g. a nested matcher over a device tree.
+
+    Each snapshot is fingerprinted, and while the fingerprint is unchanged the
+    result of matching the previous snapshot is reused. If has_changed is
+    overridden to cheaply tell that nothing has changed, taking the snapshot
+    is skipped too.
+    """
+
+    def snapshot(self) -> Any:
+        """
+        Take a snapshot of the state of the subject-under-test.
+        """
+        raise NotImplementedError
+
+    def matches(self, snapshot: Any) -> bool:
+        """
+        Check whether a snapshot satisfies the probe.
+        """
+        raise NotImplementedError
+
+    def fingerprint(self, snapshot: Any) -> Hashable:
+        """
+        A cheap key that is equal for snapshots that would match alike, such
+        as a hash or a version counter. By default, content_fingerprint, so
+        override it for snapshots whose repr does not show all their content.
+        """
+        return content_fingerprint(snapshot)
+
+    def has_changed(self) -> bool:
+        """
+        Whether the state may have changed since the last snapshot. By
+        default, it is always assumed that it may have.
+        """
+        return True
+
+    @property
+    def last_snapshot(self) -> Any:
+        """
+        The snapshot taken by the most recent sample, to describe a mismatch.
+        """
+        return self.__dict__.get("_last_snapshot")
+
+    def is_satisfied(self) -> bool:
+        return self.__dict__.get("_satisfied", False)
+
+    def sample(self) -> None:
+        sampled = "_fingerprint" in self.__dict__
+        if sampled and not self.has_changed():
+            return
+        snapshot = self.snapshot()
+        fingerprint = self.fingerprint(snapshot)
+        self._last_snapshot = snapshot
+        if sampled and fingerprint == self._fingerprint:
+            return
+        self._fingerprint = fingerprint
+        self._satisfied = self.matches(snapshot)
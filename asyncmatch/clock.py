@@ -0,0 +1,127 @@
+from .notification import Notification
+from asyncio import sleep as async_sleep
+from collections.abc import Callable
+from heapq import heappop, heappush
+from itertools import count
+from threading import Lock
+from time import monotonic, sleep
+
+class Clock:
+    """
+    Tells the time, and waits, for a Timeout. Times are in seconds from an
+    arbitrary origin.
+    """
+
+    def now(self) -> float:
+        raise NotImplementedError
+
+    def sleep(self, seconds: float) -> None:
+        raise NotImplementedError
+
+    async def sleep_async(self, seconds: float) -> None:
+        raise NotImplementedError
+
+    def wait(self, notification: Notification, seconds: float) -> bool:
+        """
+        Waits for the notification for at most ``seconds``, returning whether
+        it was set. The notification is cleared either way.
+        """
+        raise NotImplementedError
+
+    async def wait_async(self, notification: Notification, seconds: float) -> bool:
+        raise NotImplementedError
+
+class SystemClock(Clock):
+    """
+    Real time, from a monotonic clock, which is unaffected by changes to the
+    system time.
+    """
+
+    def now(self) -> float:
+        return monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        sleep(seconds)
+
+    async def sleep_async(self, seconds: float) -> None:
+        await async_sleep(seconds)
+
+    def wait(self, notification: Notification, seconds: float) -> bool:
+        return notification.wait(seconds)
+
+    async def wait_async(self, notification: Notification, seconds: float) -> bool:
+        return await notification.wait_async(seconds)
+
+class VirtualClock(Clock):
+    """
+    Time that passes only when something waits, and then instantly, so that a
+    wait of minutes takes microseconds. Callbacks scheduled with call_at or
+    call_later run when the clock reaches their time, on the thread that is
+    waiting, e.g. to change the state of a fake subject-under-test. A wait
+    on a notification ends early if a callback sets it.
+
+    The clock is deterministic when only its callbacks change the state that
+    is probed. A change made by another thread is only seen at the end of
+    the next wait, as if it was made then.
+    """
+
+    def __init__(self, start: float = 0.0):
+        self._lock = Lock()
+        self._now = start
+        self._callbacks: list[tuple[float, int, Callable[[], None]]] = []
+        self._sequence = count()
+
+    def now(self) -> float:
+        with self._lock:
+            return self._now
+
+    def call_at(self, when: float, callback: Callable[[], None]) -> None:
+        """
+        Calls back once the clock reaches ``when``. Callbacks due at the same
+        time are called in the order they were scheduled.
+        """
+        with self._lock:
+            heappush(self._callbacks, (when, next(self._sequence), callback))
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> None:
+        self.call_at(self.now() + delay, callback)
+
+    def _next_due(self, until: float) -> Callable[[], None] | None:
+        # Moves the time to the next callback due by ``until``, or to ``until``
+        with self._lock:
+            if self._callbacks and self._callbacks[0][0] <= until:
+                when, _, callback = heappop(self._callbacks)
+                self._now = max(self._now, when)
+                return callback
+            self._now = max(self._now, until)
+            return None
+
+    def advance(self, seconds: float) -> None:
+        """
+        Moves the time on, calling back any callbacks due on the way.
+        """
+        until = self.now() + seconds
+        while (callback := self._next_due(until)) is not None:
+            callback()
+
+    def sleep(self, seconds: float) -> None:
+        self.advance(seconds)
+
+    async def sleep_async(self, seconds: float) -> None:
+        self.advance(seconds)
+        # Let other coroutines run, as a real sleep would
+        await async_sleep(0)
+
+    def wait(self, notification: Notification, seconds: float) -> bool:
+        until = self.now() + seconds
+        while not notification.wait(0):
+            callback = self._next_due(until)
+            if callback is None:
+                return notification.wait(0)
+            callback()
+        return True
+
+    async def wait_async(self, notification: Notification, seconds: float) -> bool:
+        notified = self.wait(notification, seconds)
+        await async_sleep(0)
+        return notified
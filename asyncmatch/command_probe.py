@@ -0,0 +1,161 @@
+from .change_detecting_probe import ChangeDetectingProbe
+from .stream_probe import StreamProbe
+from collections.abc import Callable, Hashable, Sequence
+from hamcrest.core.description import Description
+from hamcrest.core.matcher import Matcher
+from hashlib import blake2b
+from subprocess import DEVNULL, PIPE, Popen, run
+from threading import Lock, Thread
+from time import monotonic
+from typing import Any, Optional
+from uuid import uuid4
+import os
+import signal
+
+def _decode(output: bytes) -> str:
+    return output.decode(errors="replace")
+
+def _command_text(command: str | Sequence[str]) -> str:
+    return command if isinstance(command, str) else " ".join(command)
+
+class Shell:
+    """
+    A long-lived shell that runs commands one at a time, so that running a
+    command does not start a new shell, or fork the Python process, each
+    time. Commands are run with their input from /dev/null, and must not
+    exit the shell. Safe to share between threads and probes.
+    """
+
+    def __init__(self, executable: str = "/bin/sh"):
+        self._lock = Lock()
+        self._process = Popen([executable], stdin=PIPE, stdout=PIPE, stderr=DEVNULL)
+
+    def run(self, command: str) -> tuple[int, bytes]:
+        """
+        Runs the command, returning its exit status and its output.
+        """
+        marker = uuid4().hex.encode()
+        # The newline before the marker ends any unfinished last line of output
+        script = b"{ " + command.encode() + b"\n} </dev/null\nprintf '\\n%s %d\\n' " + marker + b" $?\n"
+        with self._lock:
+            self._process.stdin.write(script)
+            self._process.stdin.flush()
+            lines = []
+            while True:
+                line = self._process.stdout.readline()
+                if not line:
+                    raise EOFError(f"the shell exited running {command!r}")
+                if line.startswith(marker + b" "):
+                    break
+                lines.append(line)
+        return int(line.split()[1]), b"".join(lines)[:-1]
+
+    def close(self) -> None:
+        with self._lock:
+            self._process.stdin.close()
+            self._process.wait()
+            self._process.stdout.close()
+
+    def __enter__(self) -> "Shell":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+class CommandProbe(ChangeDetectingProbe):
+    """
+    Probes the output of a command, e.g. ``lsusb``, parsed into a structure
+    to match with a Hamcrest matcher. By default the output is decoded to a
+    string.
+
+    The output is only parsed and matched when it differs from the previous
+    run. The command is run no more often than every ``min_interval``
+    seconds, however short the poll delay. Given a Shell, the command is run
+    by the shell rather than by starting a new process for each sample.
+    """
+
+    def __init__(self, command: str | Sequence[str], matcher: Matcher, parse: Callable[[bytes], Any] = _decode, *, min_interval: float = 0.0, shell: Optional[Shell] = None):
+        if shell is not None and not isinstance(command, str):
+            raise TypeError("a command run by a Shell must be a string")
+        self.command = command
+        self.matcher = matcher
+        self._parse = parse
+        self._min_interval = min_interval
+        self._shell = shell
+        self._last_run = None
+        self.returncode = None
+        self.parsed = None
+        self.sample()
+
+    def _run(self) -> tuple[int, bytes]:
+        if self._shell is not None:
+            return self._shell.run(self.command)
+        completed = run(self.command, shell=isinstance(self.command, str), stdin=DEVNULL, stdout=PIPE, stderr=DEVNULL)
+        return completed.returncode, completed.stdout
+
+    def has_changed(self) -> bool:
+        return self._last_run is None or monotonic() - self._last_run >= self._min_interval
+
+    def snapshot(self) -> bytes:
+        self._last_run = monotonic()
+        self.returncode, output = self._run()
+        return output
+
+    def fingerprint(self, snapshot: bytes) -> Hashable:
+        return blake2b(snapshot, digest_size=16).digest()
+
+    def matches(self, snapshot: bytes) -> bool:
+        self.parsed = self._parse(snapshot)
+        return self.matcher.matches(self.parsed)
+
+    def describe_to(self, description: Description) -> None:
+        description.append_text(f"output of `{_command_text(self.command)}` matching ") \
+            .append_description_of(self.matcher)
+
+    def describe_mismatch(self, description: Description) -> None:
+        self.matcher.describe_mismatch(self.parsed, description)
+        if self.returncode:
+            description.append_text(f" (exit status {self.returncode})")
+
+class CommandStreamProbe(StreamProbe):
+    """
+    Probes the lines written by a long-running command that watches for
+    changes, e.g. ``udevadm monitor``, so that nothing needs to be run to
+    sample. Each line wakes the Poller. Only one process is started, when
+    the probe is created, so create the probe before acting. Close the
+    probe, or use it as a context manager, to stop the command.
+    """
+
+    _item = "line"
+
+    def __init__(self, command: str | Sequence[str], matcher: Matcher, *then: Matcher, encoding: str = "utf-8"):
+        super().__init__(matcher, *then)
+        self.command = command
+        self._encoding = encoding
+        # In a session of its own, so that closing stops any children too
+        self._process = Popen(command, shell=isinstance(command, str), stdin=DEVNULL, stdout=PIPE, stderr=DEVNULL, start_new_session=True)
+        self._reader = Thread(target=self._read, name="asyncmatch-command", daemon=True)
+        self._reader.start()
+
+    def _read(self) -> None:
+        for line in self._process.stdout:
+            self.feed(line.decode(self._encoding, errors="replace").rstrip("\r\n"))
+
+    def close(self) -> None:
+        try:
+            os.killpg(self._process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        self._process.wait()
+        self._reader.join()
+        self._process.stdout.close()
+
+    def __enter__(self) -> "CommandStreamProbe":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def describe_to(self, description: Description) -> None:
+        super().describe_to(description)
+        description.append_text(f" from `{_command_text(self.command)}`")
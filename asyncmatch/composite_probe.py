@@ -0,0 +1,117 @@
+from .probe import Probe
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from hamcrest.core.description import Description
+from hamcrest.core.string_description import StringDescription
+
+def _describe(probe: Probe) -> str:
+    return str(StringDescription().append_description_of(probe))
+
+class _CompositeProbe(Probe):
+    """
+    Samples several probes concurrently, one worker thread per probe. Close
+    the composite, or use it as a context manager, to release the workers.
+    """
+
+    _conjunction = ""
+
+    def __init__(self, probes: Iterable[Probe]):
+        self._probes = list(probes)
+        if not self._probes:
+            raise ValueError("at least one probe is required")
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _sample_concurrently(self, probes: list[Probe]) -> dict[Probe, BaseException]:
+        """
+        Samples the probes concurrently, returning the exceptions raised by
+        any that failed to sample.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=len(self._probes),
+                thread_name_prefix="asyncmatch-sample")
+        futures = {probe: self._executor.submit(probe.sample) for probe in probes}
+        return {probe: future.exception() for probe, future in futures.items()
+                if future.exception() is not None}
+
+    def describe_to(self, description: Description) -> None:
+        description.append_text(f"{self._conjunction} of:")
+        for probe in self._probes:
+            description.append_text("\n          ").append_description_of(probe)
+
+    def _describe_mismatches(self, description: Description, probes: list[Probe]) -> None:
+        for probe in probes:
+            description.append_text(f"\n          {_describe(probe)}: ")
+            probe.describe_mismatch(description)
+
+class AllOfProbe(_CompositeProbe):
+    """
+    Satisfied once every one of its probes has been satisfied. A probe that has
+    been satisfied is not sampled again. If sampling any probe raises an
+    exception, the exception is raised at once, because the composite can no
+    longer be satisfied.
+    """
+
+    _conjunction = "all"
+
+    def __init__(self, probes: Iterable[Probe]):
+        super().__init__(probes)
+        self._unsatisfied = [p for p in self._probes if not p.is_satisfied()]
+
+    def is_satisfied(self) -> bool:
+        return not self._unsatisfied
+
+    def sample(self) -> None:
+        errors = self._sample_concurrently(self._unsatisfied)
+        if errors:
+            raise next(iter(errors.values()))
+        self._unsatisfied = [p for p in self._unsatisfied if not p.is_satisfied()]
+
+    def describe_mismatch(self, description: Description) -> None:
+        description.append_text(
+            f"{len(self._unsatisfied)} of {len(self._probes)} probes were not satisfied")
+        self._describe_mismatches(description, self._unsatisfied)
+
+class AnyOfProbe(_CompositeProbe):
+    """
+    Satisfied once any one of its probes is satisfied. A probe that raises an
+    exception when sampled is no longer sampled, and the exception is raised
+    when none of the probes remain.
+    """
+
+    _conjunction = "any"
+
+    def __init__(self, probes: Iterable[Probe]):
+        super().__init__(probes)
+        self._satisfied = any(p.is_satisfied() for p in self._probes)
+        self._candidates = list(self._probes)
+        self._errors: dict[Probe, BaseException] = {}
+
+    def is_satisfied(self) -> bool:
+        return self._satisfied
+
+    def sample(self) -> None:
+        errors = self._sample_concurrently(self._candidates)
+        self._errors.update(errors)
+        self._candidates = [p for p in self._candidates if p not in errors]
+        if not self._candidates:
+            raise next(reversed(errors.values()))
+        self._satisfied = any(p.is_satisfied() for p in self._candidates)
+
+    def describe_mismatch(self, description: Description) -> None:
+        description.append_text(
+            f"none of {len(self._probes)} probes were satisfied")
+        self._describe_mismatches(description, self._candidates)
+        for probe, error in self._errors.items():
+            description.append_text(f"\n          {_describe(probe)}: raised {error!r}")
@@ -5,3 +5,12 @@ class SynchronisationTimeout(Exception):
     """
     def __init__(self, msg: str):
         super().__init__(msg)
+
+class WaitAborted(Exception):
+    """
+    Raised when a wait is given up because an abort condition was met. The
+    reason says why.
+    """
+    def __init__(self, msg: str, reason: str = ""):
+        super().__init__(msg)
+        self.reason = reason
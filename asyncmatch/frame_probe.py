@@ -0,0 +1,246 @@
+from .probe import Probe
+from collections.abc import Callable, Sequence
+from hamcrest.core.base_matcher import BaseMatcher
+from hamcrest.core.description import Description
+from hamcrest.core.matcher import Matcher
+from typing import Optional
+import numpy as np
+
+# x, y, width and height, in pixels
+Region = tuple[int, int, int, int]
+
+def _describe_region(region: Optional[Region]) -> str:
+    if region is None:
+        return "frame"
+    x, y, width, height = region
+    return f"frame region of {width}x{height} at ({x}, {y})"
+
+def _format(values) -> str:
+    values = np.round(np.asarray(values, dtype=float), 1)
+    if values.ndim == 0:
+        return f"{values:g}"
+    return "(" + ", ".join(f"{value:g}" for value in values) + ")"
+
+def _describe_statistics(pixels: np.ndarray, description: Description) -> None:
+    description.append_text(
+        f"had mean {_format(pixels.mean(axis=(0, 1)))}, "
+        f"min {_format(pixels.min(axis=(0, 1)))}, "
+        f"max {_format(pixels.max(axis=(0, 1)))}")
+
+class FrameMatcher(BaseMatcher[np.ndarray]):
+    """
+    Matches a frame, as a NumPy array of shape (height, width) or (height,
+    width, channels), or a region of it given as (x, y, width, height). The
+    region is a view of the frame, so no pixels are copied.
+    """
+
+    def __init__(self, region: Optional[Region] = None):
+        self.region = region
+
+    def _crop(self, frame: np.ndarray) -> Optional[np.ndarray]:
+        if self.region is None:
+            return frame
+        x, y, width, height = self.region
+        pixels = frame[y:y + height, x:x + width]
+        return pixels if pixels.shape[:2] == (height, width) else None
+
+    def _matches(self, item: np.ndarray) -> bool:
+        pixels = self._crop(item)
+        return pixels is not None and self._matches_pixels(pixels)
+
+    def _matches_pixels(self, pixels: np.ndarray) -> bool:
+        raise NotImplementedError
+
+    def describe_mismatch(self, item: np.ndarray, mismatch_description: Description) -> None:
+        pixels = self._crop(item)
+        if pixels is None:
+            height, width = item.shape[:2]
+            mismatch_description.append_text(f"was a frame of {width}x{height}, without the {_describe_region(self.region)}")
+        else:
+            mismatch_description.append_text(f"the {_describe_region(self.region)} ")
+            self._describe_pixels(pixels, mismatch_description)
+
+    def _describe_pixels(self, pixels: np.ndarray, description: Description) -> None:
+        _describe_statistics(pixels, description)
+
+class _PixelwiseMatcher(FrameMatcher):
+    """
+    Matches when every pixel is within a tolerance of a target. A pixel out
+    of tolerance in a downsampled view is out of tolerance in the frame, so
+    the view is checked first, to reject a mismatching frame cheaply. The
+    view keeps every ``downsample``th row whole, as skipping columns too
+    would break up the contiguous runs of pixels that NumPy is fast over.
+    """
+
+    def __init__(self, tolerance: float, region: Optional[Region], downsample: int):
+        super().__init__(region)
+        self.tolerance = tolerance
+        self.downsample = downsample
+        self._buffers: dict[tuple, np.ndarray] = {}
+
+    def _target(self, pixels: np.ndarray, step: int) -> np.ndarray:
+        raise NotImplementedError
+
+    def _difference(self, pixels: np.ndarray, target: np.ndarray) -> np.ndarray:
+        # Widened, so that unsigned pixels do not wrap around, and to hold a
+        # fractional target, into a buffer that is reused for every frame of
+        # the same shape
+        dtype = np.result_type(pixels.dtype, target.dtype, np.int16)
+        key = (pixels.shape, dtype)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = np.empty(pixels.shape, dtype)
+        np.subtract(pixels, target, out=buffer, dtype=dtype)
+        return np.abs(buffer, out=buffer)
+
+    def _matches_pixels(self, pixels: np.ndarray) -> bool:
+        step = self.downsample
+        if step > 1 and self._difference(pixels[::step], self._target(pixels, step)).max() > self.tolerance:
+            return False
+        return self._difference(pixels, self._target(pixels, 1)).max() <= self.tolerance
+
+    def _describe_pixels(self, pixels: np.ndarray, description: Description) -> None:
+        difference = self._difference(pixels, self._target(pixels, 1))
+        if difference.ndim == 3:
+            difference = difference.max(axis=2)
+        within = np.count_nonzero(difference <= self.tolerance) / difference.size
+        _describe_statistics(pixels, description)
+        description.append_text(
+            f", differing by up to {_format(difference.max())} and by {_format(difference.mean())} on average, "
+            f"with {within:.1%} of pixels within {self.tolerance:g}")
+
+class FrameHasColour(_PixelwiseMatcher):
+
+    def __init__(self, colour: float | Sequence[float], tolerance: float, region: Optional[Region], downsample: int):
+        super().__init__(tolerance, region, downsample)
+        self.colour = np.asarray(colour)
+        self._rows: dict[int, np.ndarray] = {}
+
+    def _channels_differ(self, pixels: np.ndarray) -> bool:
+        # A single value is compared with every channel
+        if self.colour.ndim == 0:
+            return False
+        return pixels.ndim != 3 or pixels.shape[2] != len(self.colour)
+
+    def _matches_pixels(self, pixels: np.ndarray) -> bool:
+        return not self._channels_differ(pixels) and super()._matches_pixels(pixels)
+
+    def _describe_pixels(self, pixels: np.ndarray, description: Description) -> None:
+        if self._channels_differ(pixels):
+            shape = f"had {pixels.shape[2]} channel(s)" if pixels.ndim == 3 else "was greyscale"
+            description.append_text(f"{shape}, but the colour has {len(self.colour)} channel(s)")
+        else:
+            super()._describe_pixels(pixels, description)
+
+    def _target(self, pixels: np.ndarray, step: int) -> np.ndarray:
+        if self.colour.ndim == 0:
+            return self.colour
+        # A whole row of the colour, as broadcasting a single pixel across
+        # the frame is many times slower
+        width = pixels.shape[1]
+        row = self._rows.get(width)
+        if row is None:
+            row = self._rows[width] = np.tile(self.colour, (width, 1))
+        return row
+
+    def describe_to(self, description: Description) -> None:
+        description.append_text(f"a {_describe_region(self.region)} of colour {_format(self.colour)}")
+        if self.tolerance:
+            description.append_text(f" within {self.tolerance:g}")
+
+class FrameResembles(_PixelwiseMatcher):
+
+    def __init__(self, reference: np.ndarray, tolerance: float, region: Optional[Region], downsample: int):
+        super().__init__(tolerance, region, downsample)
+        self.reference = reference
+
+    def _target(self, pixels: np.ndarray, step: int) -> np.ndarray:
+        return self.reference[::step]
+
+    def _matches_pixels(self, pixels: np.ndarray) -> bool:
+        return pixels.shape == self.reference.shape and super()._matches_pixels(pixels)
+
+    def _describe_pixels(self, pixels: np.ndarray, description: Description) -> None:
+        if pixels.shape != self.reference.shape:
+            description.append_text(f"had shape {pixels.shape}, not the reference's {self.reference.shape}")
+        else:
+            super()._describe_pixels(pixels, description)
+
+    def describe_to(self, description: Description) -> None:
+        description.append_text(f"a {_describe_region(self.region)} resembling the reference")
+        if self.tolerance:
+            description.append_text(f" within {self.tolerance:g}")
+
+class FrameHasMean(FrameMatcher):
+
+    def __init__(self, low: float, high: float, region: Optional[Region]):
+        super().__init__(region)
+        self.low = low
+        self.high = high
+
+    def _matches_pixels(self, pixels: np.ndarray) -> bool:
+        return self.low <= pixels.mean() <= self.high
+
+    def describe_to(self, description: Description) -> None:
+        description.append_text(f"a {_describe_region(self.region)} with mean between {self.low:g} and {self.high:g}")
+
+def has_colour(colour: float | Sequence[float], *, tolerance: float = 0, region: Optional[Region] = None, downsample: int = 4) -> Matcher[np.ndarray]:
+    """
+    Matches a frame, or a region of it, in which every channel of every
+    pixel is within the tolerance of the colour, e.g. a status LED or a
+    splash screen. The colour is a value per channel, or a single value.
+    Every ``downsample``th row is checked first, to reject a frame cheaply.
+    """
+    return FrameHasColour(colour, tolerance, region, downsample)
+
+def resembles(reference: np.ndarray, *, tolerance: float = 0, region: Optional[Region] = None, downsample: int = 4) -> Matcher[np.ndarray]:
+    """
+    Matches a frame, or a region of it, in which every channel of every
+    pixel is within the tolerance of the reference image, which has the
+    shape of the frame or region. As for has_colour, a downsampled view is
+    checked first.
+    """
+    return FrameResembles(reference, tolerance, region, downsample)
+
+def has_mean_between(low: float, high: float, *, region: Optional[Region] = None) -> Matcher[np.ndarray]:
+    """
+    Matches a frame, or a region of it, whose mean over all its pixels and
+    channels is between low and high, e.g. to tell that a backlight is on.
+    """
+    return FrameHasMean(low, high, region)
+
+class FrameProbe(Probe):
+    """
+    Probes frames, e.g. from a frame grabber, matching each frame as a NumPy
+    array with a Hamcrest matcher such as has_colour, resembles or
+    has_mean_between.
+
+    The grab function is called with the previous frame, or None the first
+    time, and returns the new frame. A grabber that can fill an array in
+    place, e.g. cv2.VideoCapture.read, should fill and return the one given,
+    so that no frame is allocated per sample. The frame is kept as
+    ``frame``, to describe a mismatch, until the next sample overwrites it.
+
+    The matchers reuse buffers between frames, so each probe should have its
+    own.
+    """
+
+    def __init__(self, grab: Callable[[Optional[np.ndarray]], np.ndarray], matcher: Matcher[np.ndarray]):
+        self._grab = grab
+        self.matcher = matcher
+        self.frame: Optional[np.ndarray] = None
+        self._satisfied = False
+        self.sample()
+
+    def sample(self) -> None:
+        self.frame = self._grab(self.frame)
+        self._satisfied = self.matcher.matches(self.frame)
+
+    def is_satisfied(self) -> bool:
+        return self._satisfied
+
+    def describe_to(self, description: Description) -> None:
+        description.append_description_of(self.matcher)
+
+    def describe_mismatch(self, description: Description) -> None:
+        self.matcher.describe_mismatch(self.frame, description)
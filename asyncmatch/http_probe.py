@@ -0,0 +1,176 @@
+from .change_detecting_probe import ChangeDetectingProbe
+from collections.abc import Callable, Hashable, Mapping
+from hamcrest.core.description import Description
+from hamcrest.core.matcher import Matcher
+from http.client import HTTPConnection, HTTPException, HTTPMessage, HTTPSConnection
+from threading import Lock
+from typing import Any, NamedTuple, Optional
+from urllib.parse import urlsplit
+import json
+
+class HttpResponse(NamedTuple):
+    status: int
+    reason: str
+    headers: HTTPMessage
+    body: bytes
+
+class HttpConnectionPool:
+    """
+    Keeps connections to each host alive between requests, so that polling
+    an endpoint does not connect afresh for every sample. Safe to share
+    between threads and probes.
+    """
+
+    def __init__(self, timeout: float = 5.0):
+        self._timeout = timeout
+        self._lock = Lock()
+        self._idle: dict[tuple[str, str, int], list[HTTPConnection]] = {}
+
+    def _connection(self, key: tuple[str, str, int]) -> tuple[HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        scheme, host, port = key
+        connection_type = HTTPSConnection if scheme == "https" else HTTPConnection
+        return connection_type(host, port, timeout=self._timeout), False
+
+    def _release(self, key: tuple[str, str, int], connection: HTTPConnection) -> None:
+        with self._lock:
+            self._idle.setdefault(key, []).append(connection)
+
+    def request(self, method: str, url: str, headers: Optional[Mapping[str, str]] = None) -> HttpResponse:
+        """
+        Makes a request on a pooled connection, returning the whole response.
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"not an HTTP URL: {url}")
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        while True:
+            connection, reused = self._connection(key)
+            try:
+                connection.request(method, target, headers=dict(headers or {}))
+                response = connection.getresponse()
+                body = response.read()
+            except BaseException as e:
+                # Never return a connection in an unknown state to the pool
+                connection.close()
+                if reused and isinstance(e, (HTTPException, ConnectionError)):
+                    # The server closed the idle connection, so try another
+                    continue
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(key, connection)
+            return HttpResponse(response.status, response.reason, response.headers, body)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    def __enter__(self) -> "HttpConnectionPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+_shared_pool: Optional[HttpConnectionPool] = None
+_shared_pool_lock = Lock()
+
+def _get_shared_pool() -> HttpConnectionPool:
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = HttpConnectionPool()
+        return _shared_pool
+
+class HttpProbe(ChangeDetectingProbe):
+    """
+    Probes a resource over HTTP, e.g. a REST endpoint, matching its body,
+    parsed as JSON by default, with a Hamcrest matcher.
+
+    Connections are kept alive in a pool, shared by all probes unless one is
+    given. Each sample is a conditional GET, using the ETag and Last-Modified
+    of the previous response, so an unchanged resource costs a 304 with no
+    body. The body is only parsed and matched when it has changed.
+
+    A response other than a 2xx, a failure to connect, or a body that cannot
+    be parsed, e.g. while the service is starting, leaves the probe
+    unsatisfied, and is described as the mismatch. A parse function other
+    than the default should raise ValueError for a body it cannot parse.
+    """
+
+    def __init__(self, url: str, matcher: Matcher, parse: Callable[[bytes], Any] = json.loads, *, headers: Optional[Mapping[str, str]] = None, pool: Optional[HttpConnectionPool] = None):
+        self.url = url
+        self.matcher = matcher
+        self._parse = parse
+        self._headers = dict(headers or {})
+        self._pool = pool or _get_shared_pool()
+        self._validators: dict[str, str] = {}
+        self._response: Optional[tuple] = None
+        self.parsed = None
+        self._parse_error: Optional[ValueError] = None
+        self.sample()
+
+    def _request(self) -> HttpResponse:
+        return self._pool.request("GET", self.url, {**self._headers, **self._validators})
+
+    def snapshot(self) -> tuple:
+        """
+        The status and body of the resource, or the error that prevented
+        getting it.
+        """
+        try:
+            response = self._request()
+        except (OSError, HTTPException) as e:
+            self._validators = {}
+            return ("error", f"{type(e).__name__}: {e}")
+        if response.status == 304 and self._response is not None:
+            return self._response
+        validators = {}
+        if "ETag" in response.headers:
+            validators["If-None-Match"] = response.headers["ETag"]
+        if "Last-Modified" in response.headers:
+            validators["If-Modified-Since"] = response.headers["Last-Modified"]
+        self._validators = validators if 200 <= response.status < 300 else {}
+        self._response = (response.status, response.reason, response.body)
+        return self._response
+
+    def fingerprint(self, snapshot: tuple) -> Hashable:
+        # The body itself, as comparing it costs less than hashing its repr
+        return snapshot
+
+    def matches(self, snapshot: tuple) -> bool:
+        self.parsed = None
+        self._parse_error = None
+        status = snapshot[0]
+        if status == "error" or not 200 <= status < 300:
+            return False
+        try:
+            self.parsed = self._parse(snapshot[2])
+        except ValueError as e:
+            self._parse_error = e
+            return False
+        return self.matcher.matches(self.parsed)
+
+    def describe_to(self, description: Description) -> None:
+        description.append_text(f"GET {self.url} returning ").append_description_of(self.matcher)
+
+    def describe_mismatch(self, description: Description) -> None:
+        snapshot = self.last_snapshot
+        if snapshot[0] == "error":
+            description.append_text(f"the request failed with {snapshot[1]}")
+        elif not 200 <= snapshot[0] < 300:
+            description.append_text(f"the response was {snapshot[0]} {snapshot[1]}")
+        elif self._parse_error is not None:
+            body = snapshot[2]
+            excerpt = repr(body[:60]) + ("..." if len(body) > 60 else "")
+            description.append_text(f"the body {excerpt} could not be parsed: {self._parse_error}")
+        else:
+            self.matcher.describe_mismatch(self.parsed, description)
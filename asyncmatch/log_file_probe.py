@@ -0,0 +1,241 @@
+from .stream_probe import StreamProbe
+from hamcrest.core.description import Description
+from hamcrest.core.matcher import Matcher
+from pathlib import Path
+from threading import Thread, current_thread
+from typing import BinaryIO, Optional
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import weakref
+
+_CHUNK_SIZE = 1 << 20
+
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct("iIII")
+
+def _load_inotify():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+_libc = _load_inotify()
+
+class _Inotify:
+    """
+    Calls back whenever a file in a directory is written, created or renamed
+    into place, using inotify. Watching the directory rather than the file
+    sees the file being rotated or created.
+
+    The callback, a bound method, is held weakly, so that the watching
+    thread does not keep its object alive. The thread closes the inotify
+    file descriptors when it stops.
+    """
+
+    def __init__(self, directory: Path, name: str, callback):
+        self._name = os.fsencode(name)
+        self._callback = weakref.WeakMethod(callback)
+        self._fd = _libc.inotify_init1(_IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+        if _libc.inotify_add_watch(self._fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"cannot watch {directory}")
+        self._stop_read, self._stop_write = os.pipe()
+        self._thread = Thread(target=self._run, name="asyncmatch-inotify", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            while True:
+                readable, _, _ = select.select([self._fd, self._stop_read], [], [])
+                if self._stop_read in readable:
+                    return
+                if self._concerns_file(os.read(self._fd, 4096)):
+                    self._call_back()
+        finally:
+            os.close(self._fd)
+            os.close(self._stop_read)
+
+    def _call_back(self) -> None:
+        # Not a local of _run, which would keep the object alive between events
+        callback = self._callback()
+        if callback is not None:
+            callback()
+
+    def _concerns_file(self, events: bytes) -> bool:
+        offset = 0
+        while offset < len(events):
+            _, _, _, length = _EVENT_HEADER.unpack_from(events, offset)
+            offset += _EVENT_HEADER.size
+            if events[offset:offset + length].rstrip(b"\0") == self._name:
+                return True
+            offset += length
+        return False
+
+    def close(self) -> None:
+        os.write(self._stop_write, b"\0")
+        os.close(self._stop_write)
+        # A probe collected by the watching thread is closed on that thread
+        if current_thread() is not self._thread:
+            self._thread.join()
+
+class _FileTail:
+    """
+    Reads the lines appended to a file since the previous read, following the
+    file when it is rotated, i.e. replaced by a new file, or truncated.
+    """
+
+    def __init__(self, path: Path, from_start: bool):
+        self._path = path
+        self._file: Optional[BinaryIO] = None
+        self._identity = None
+        self._offset = 0
+        self._partial = b""
+        self._reopen(from_start)
+
+    def _reopen(self, from_start: bool) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._partial = b""
+        try:
+            self._file = open(self._path, "rb")
+        except FileNotFoundError:
+            self._identity = None
+            return
+        status = os.fstat(self._file.fileno())
+        self._identity = (status.st_dev, status.st_ino)
+        self._offset = 0 if from_start else status.st_size
+
+    def _read_chunk(self) -> bytes:
+        self._file.seek(self._offset)
+        data = self._file.read(_CHUNK_SIZE)
+        self._offset += len(data)
+        return data
+
+    def _read_lines(self) -> list[bytes]:
+        while True:
+            data = self._read_chunk()
+            lines = (self._partial + data).split(b"\n")
+            self._partial = lines.pop()
+            if lines or not data:
+                return lines
+
+    def read_lines(self) -> list[bytes]:
+        """
+        Returns complete lines appended since the previous read, reading at
+        most one chunk of the file at a time. An empty list means there is
+        nothing more to read.
+        """
+        try:
+            status = os.stat(self._path)
+        except FileNotFoundError:
+            # Between rotating away the old file and creating the new one
+            status = None
+        if self._file is None:
+            if status is None:
+                return []
+            self._reopen(from_start=True)
+            if self._file is None:
+                return []
+        if status is not None and (status.st_dev, status.st_ino) != self._identity:
+            # Rotated: finish reading the old file before following the new one
+            lines = self._read_lines()
+            if lines:
+                return lines
+            self._reopen(from_start=True)
+            return self.read_lines()
+        if status is not None and status.st_size < self._offset:
+            # Truncated in place, e.g. by copytruncate
+            self._offset = 0
+            self._partial = b""
+        return self._read_lines()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+class LogFileProbe(StreamProbe):
+    """
+    Probes for lines being written to a log file. Each sample reads only the
+    bytes appended since the previous sample, and matches only the new lines,
+    so sampling a large log is as cheap as sampling a small one. The log may
+    be rotated or truncated while it is being probed, and need not exist
+    until the service creates it.
+
+    As with a StreamProbe, several matchers are satisfied by distinct lines
+    matching each of them in turn. Only lines written after the probe is
+    created are considered, unless ``from_start``. Lines are decoded with
+    the encoding and have the line ending removed.
+
+    Where inotify is available, the probe is notified whenever the file
+    changes, so the Poller wakes at once rather than at the next poll. Close
+    the probe, or use it as a context manager, to stop watching the file. A
+    probe that is not closed, e.g. because an assertion failed, stops
+    watching when it is garbage collected.
+    """
+
+    _item = "line"
+
+    def __init__(self, path: str | os.PathLike, matcher: Matcher, *then: Matcher, from_start: bool = False, encoding: str = "utf-8"):
+        super().__init__(matcher, *then)
+        self.path = Path(path)
+        self._encoding = encoding
+        self._tail = _FileTail(self.path, from_start)
+        self._inotify = None
+        if _libc is not None:
+            try:
+                self._inotify = _Inotify(self.path.parent, self.path.name, self.notify)
+            except OSError:
+                pass
+        self._finalizer = weakref.finalize(self, LogFileProbe._release, self._inotify, self._tail)
+
+    @staticmethod
+    def _release(inotify: Optional[_Inotify], tail: _FileTail) -> None:
+        if inotify is not None:
+            inotify.close()
+        tail.close()
+
+    @property
+    def watching(self) -> bool:
+        """
+        Whether the file is watched with inotify, rather than only polled.
+        """
+        return self._inotify is not None
+
+    def sample(self) -> None:
+        while not self.is_satisfied():
+            lines = self._tail.read_lines()
+            if not lines:
+                return
+            self._arrived.extend(
+                line.decode(self._encoding, errors="replace").rstrip("\r") for line in lines)
+            super().sample()
+
+    def close(self) -> None:
+        self._finalizer()
+        self._inotify = None
+
+    def __enter__(self) -> "LogFileProbe":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def describe_to(self, description: Description) -> None:
+        super().describe_to(description)
+        description.append_text(f" in {self.path}")
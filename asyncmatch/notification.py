@@ -0,0 +1,71 @@
+from asyncio import AbstractEventLoop, Future, get_running_loop, wait
+from collections.abc import Callable
+from threading import Event, Lock
+
+def _resolve(future: Future) -> None:
+    if not future.done():
+        future.set_result(True)
+
+class Notification:
+    """
+    A thread-safe wake-up signal. It may be set from any thread, e.g. an MQTT
+    client callback, and waited on either by blocking a thread or from a
+    coroutine.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._event = Event()
+        self._async_waiters: list[tuple[AbstractEventLoop, Future]] = []
+        self._callbacks: list[Callable[[], None]] = []
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """
+        Call back whenever the notification is set, on the thread setting it,
+        for a waiter that is not a thread or a coroutine.
+        """
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def remove_callback(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def set(self) -> None:
+        with self._lock:
+            self._event.set()
+            waiters, self._async_waiters = self._async_waiters, []
+            callbacks = list(self._callbacks)
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future)
+        for callback in callbacks:
+            callback()
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Blocks until the notification is set or the timeout elapses, and
+        returns True if it was set. The notification is cleared either way.
+        """
+        notified = self._event.wait(timeout)
+        self._event.clear()
+        return notified
+
+    async def wait_async(self, timeout: float) -> bool:
+        """
+        The awaitable counterpart of wait.
+        """
+        loop = get_running_loop()
+        with self._lock:
+            if self._event.is_set():
+                self._event.clear()
+                return True
+            future = loop.create_future()
+            waiter = (loop, future)
+            self._async_waiters.append(waiter)
+        await wait([future], timeout=timeout)
+        with self._lock:
+            if waiter in self._async_waiters:
+                self._async_waiters.remove(waiter)
+            self._event.clear()
+        return future.done()
@@ -0,0 +1,25 @@
+from .notification import Notification
+from .probe import Probe
+
+class NotifyingProbe(Probe):
+
+    """
+    A Probe that can be told when the state of the subject-under-test may
+    have changed. A Poller waiting on a NotifyingProbe wakes and samples as
+    soon as it is notified, so the poll delay is only a fallback.
+    """
+
+    @property
+    def notification(self) -> Notification:
+        # Created lazily, so that subclasses need not call __init__
+        try:
+            return self._notification
+        except AttributeError:
+            return self.__dict__.setdefault("_notification", Notification())
+
+    def notify(self) -> None:
+        """
+        Wake any Poller waiting on this probe. Safe to call from any thread,
+        e.g. from a test double's message callback.
+        """
+        self.notification.set()
@@ -0,0 +1,137 @@
+from .clock import Clock, SystemClock
+from .probe import Probe
+from collections.abc import Iterable
+from functools import cached_property
+from hamcrest.core.string_description import StringDescription
+from time import perf_counter
+from typing import Optional
+
+class ObservedCheck:
+    """
+    One check of a Probe by a Poller, as seen by PollObservers. Times are
+    measured with ``time.perf_counter``, unless the Poller's Timeout has a
+    clock other than the system clock, e.g. a VirtualClock, in which case
+    they are told by that clock, and ``real_time`` is False.
+    """
+
+    def __init__(self, probe: Probe, observers: tuple["PollObserver", ...], call_site: Optional[str] = None, clock: Optional[Clock] = None):
+        self.probe = probe
+        self.call_site = call_site
+        self.real_time = clock is None or isinstance(clock, SystemClock)
+        self.now = perf_counter if self.real_time else clock.now
+        self.started_at = self.now()
+        self.samples = 0
+        self._observers = observers
+        for observer in observers:
+            observer.on_start(self)
+
+    @cached_property
+    def description(self) -> str:
+        """
+        The probe's self-description, which identifies the probe in reports.
+        """
+        return str(StringDescription().append_description_of(self.probe))
+
+    def elapsed(self) -> float:
+        return self.now() - self.started_at
+
+    def checked(self, satisfied: bool, start: float) -> None:
+        duration = self.now() - start
+        for observer in self._observers:
+            observer.on_check(self, satisfied, start, duration)
+
+    def sampled(self, start: float) -> None:
+        duration = self.now() - start
+        self.samples += 1
+        for observer in self._observers:
+            observer.on_sample(self, start, duration)
+
+    def satisfied(self, time_remaining: float) -> None:
+        for observer in self._observers:
+            observer.on_satisfied(self, time_remaining)
+
+    def timed_out(self) -> None:
+        for observer in self._observers:
+            observer.on_timeout(self)
+
+    def violated(self) -> None:
+        for observer in self._observers:
+            observer.on_violation(self)
+
+    def aborted(self) -> None:
+        for observer in self._observers:
+            observer.on_abort(self)
+
+class PollObserver:
+    """
+    Observes Pollers checking probes. Override the events of interest.
+    """
+
+    def on_start(self, check: ObservedCheck) -> None:
+        """
+        A Poller has started to check a probe.
+        """
+        pass
+
+    def on_sample(self, check: ObservedCheck, start: float, duration: float) -> None:
+        """
+        The Poller has sampled the probe, which took ``duration`` seconds.
+        """
+        pass
+
+    def on_check(self, check: ObservedCheck, satisfied: bool, start: float, duration: float) -> None:
+        """
+        The Poller has asked whether the probe is satisfied, which took
+        ``duration`` seconds.
+        """
+        pass
+
+    def on_satisfied(self, check: ObservedCheck, time_remaining: float) -> None:
+        """
+        The probe was satisfied, with ``time_remaining`` seconds to spare.
+        """
+        pass
+
+    def on_timeout(self, check: ObservedCheck) -> None:
+        """
+        The Poller timed out before the probe was satisfied.
+        """
+        pass
+
+    def on_violation(self, check: ObservedCheck) -> None:
+        """
+        The probe was not satisfied while checking that it remained so.
+        """
+        pass
+
+    def on_abort(self, check: ObservedCheck) -> None:
+        """
+        The Poller gave up because an abort condition was met.
+        """
+        pass
+
+_observers: tuple[PollObserver, ...] = ()
+
+def add_observer(observer: PollObserver) -> None:
+    """
+    Observe every Poller from now on, including those used by
+    assert_eventually and wait_until.
+    """
+    global _observers
+    _observers = (*_observers, observer)
+
+def remove_observer(observer: PollObserver) -> None:
+    global _observers
+    _observers = tuple(o for o in _observers if o is not observer)
+
+def observe(probe: Probe, observers: Iterable[PollObserver], call_site: Optional[str] = None, clock: Optional[Clock] = None) -> Optional[ObservedCheck]:
+    """
+    Starts observing a check of the probe, or returns None if there is
+    nobody observing, so that an unobserved check costs nothing to time.
+    The call site, if known, is the file and line that started the wait,
+    and the clock is that of the wait's Timeout.
+    """
+    observers = (*observers, *_observers)
+    if not observers:
+        return None
+    return ObservedCheck(probe, observers, call_site, clock)
@@ -0,0 +1,115 @@
+from collections.abc import Callable, Iterator
+from itertools import repeat
+from random import Random
+from time import monotonic
+from typing import Optional
+
+def _check_positive(**values: float) -> None:
+    for name, value in values.items():
+        if value <= 0:
+            raise ValueError(f"{name} must be positive, not {value}")
+
+class PollSchedule:
+    """
+    Decides how long to wait before each successive sample of a Probe.
+    """
+
+    def delays(self) -> Iterator[float]:
+        """
+        Returns a fresh, unbounded iterator over the polling delays of a
+        single wait.
+        """
+        raise NotImplementedError
+
+    def delays_for(self, elapsed: Callable[[], float]) -> Iterator[float]:
+        """
+        As delays, for a wait that tells how long it has been waiting, in
+        seconds on its clock, when ``elapsed`` is called. A schedule that
+        depends on the time elapsed, rather than on the number of samples,
+        overrides this.
+        """
+        return self.delays()
+
+class FixedDelay(PollSchedule):
+    """
+    The same polling delay every time.
+    """
+
+    def __init__(self, delay: float):
+        self._delay = delay
+
+    def delays(self) -> Iterator[float]:
+        return repeat(self._delay)
+
+class ExponentialBackoff(PollSchedule):
+    """
+    Multiplies the polling delay by a constant factor after every sample, up
+    to a maximum delay.
+    """
+
+    def __init__(self, initial: float, maximum: float, factor: float = 2.0):
+        _check_positive(initial=initial, maximum=maximum)
+        if factor < 1.0:
+            raise ValueError(f"factor must be at least 1, not {factor}")
+        self._initial = initial
+        self._maximum = maximum
+        self._factor = factor
+
+    def delays(self) -> Iterator[float]:
+        delay = min(self._initial, self._maximum)
+        while True:
+            yield delay
+            delay = min(delay * self._factor, self._maximum)
+
+class DecorrelatedJitter(PollSchedule):
+    """
+    Backs off randomly, with each delay drawn between the base delay and three
+    times the previous delay, up to a maximum delay. Waits that start together
+    then drift apart rather than sampling a shared resource in lockstep.
+    """
+
+    def __init__(self, base: float, maximum: float, rng: Optional[Random] = None):
+        _check_positive(base=base, maximum=maximum)
+        self._base = base
+        self._maximum = maximum
+        self._rng = rng or Random()
+
+    def delays(self) -> Iterator[float]:
+        delay = self._base
+        while True:
+            delay = min(self._maximum, self._rng.uniform(self._base, delay * 3))
+            yield delay
+
+class FastStart(PollSchedule):
+    """
+    Polls with a short delay for an initial period, so that waits which are
+    satisfied quickly pass quickly, then follows another schedule.
+
+    The period is the time elapsed since the wait started, including the
+    time spent sampling, so a slow sample shortens the fast start rather
+    than lengthening it. Outside a wait, it is measured from the first delay
+    by a monotonic clock.
+    """
+
+    def __init__(self, delay: float, period: float, then: PollSchedule):
+        _check_positive(delay=delay, period=period)
+        self._delay = delay
+        self._period = period
+        self._then = then
+
+    def delays(self) -> Iterator[float]:
+        start = monotonic()
+        return self.delays_for(lambda: monotonic() - start)
+
+    def delays_for(self, elapsed: Callable[[], float]) -> Iterator[float]:
+        while elapsed() < self._period:
+            yield self._delay
+        yield from self._then.delays_for(elapsed)
+
+def as_poll_schedule(poll_delay: float | PollSchedule) -> PollSchedule:
+    """
+    Converts a fixed polling delay into a PollSchedule if necessary.
+    """
+    if isinstance(poll_delay, PollSchedule):
+        return poll_delay
+    return FixedDelay(poll_delay)
@@ -0,0 +1,236 @@
+from .assert_eventually import _get_probe, _make_poller, _report_abort_of_probe, _report_failure_of_probe
+from .clock import Clock, SystemClock, VirtualClock
+from .exceptions import SynchronisationTimeout, WaitAborted
+from .notifying_probe import NotifyingProbe
+from .poll_observer import ObservedCheck, observe
+from .poll_schedule import PollSchedule
+from .poller import Poller, PollerAborted, PollerTimeout
+from .probe import Probe
+from .wait_options import WaitOptions
+from collections.abc import Callable
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from heapq import heappop, heappush
+from itertools import count
+from threading import Condition, Thread
+from typing import Optional, Unpack
+
+class _ScheduledWait:
+    """
+    One wait for a probe, polled a step at a time by a PollScheduler, in the
+    same order as Poller.check: check, wait, sample, check, and so on.
+    """
+
+    def __init__(self, poller: Poller, probe: Probe, reason: str, exc_type: type[Exception], wake: Callable[[], None]):
+        self.poller = poller
+        self.probe = probe
+        self.reason = reason
+        self.exc_type = exc_type
+        self.future = Future()
+        self.check: Optional[ObservedCheck] = None
+        self.wake = wake
+        self.started = False
+        self.released = False
+        # Guarded by the scheduler's lock
+        self.generation = 0
+        self.running = False
+        self.woken = False
+
+    def _release(self) -> None:
+        if self.released:
+            return
+        self.released = True
+        self.poller._unwatch_aborts()
+        self.poller.sampler.release()
+
+    def _finish(self, exception: Optional[BaseException] = None) -> None:
+        self._release()
+        try:
+            if exception is None:
+                self.future.set_result(None)
+            else:
+                self.future.set_exception(exception)
+        except InvalidStateError:
+            # Cancelled by the caller while being polled
+            pass
+
+    def cancel(self) -> None:
+        self._release()
+        self.future.cancel()
+
+    def poll(self) -> Optional[float]:
+        """
+        Takes the next step, returning how long to wait before the next, or
+        None once the future is resolved.
+        """
+        poller, probe = self.poller, self.probe
+        if self.future.cancelled():
+            self._release()
+            return None
+        try:
+            if self.started:
+                poller._sample(probe, self.check)
+            else:
+                self.started = True
+                self.check = observe(probe, poller.observers, poller.call_site, poller.timeout.clock)
+                poller._watch_aborts(probe, self.wake)
+                if poller.sample_first:
+                    poller._sample(probe, self.check)
+            if poller._observed_satisfied(probe, self.check):
+                poller._satisfied(self.check)
+                self._finish()
+                return None
+            poller._check_aborted(self.check)
+            if poller.timeout.timed_out():
+                raise poller._timed_out(self.check)
+            return poller.timeout.next_sleep()
+        except PollerTimeout as timeout:
+            try:
+                _report_failure_of_probe(probe, self.reason, self.exc_type, timeout.notes)
+            except self.exc_type as failure:
+                self._finish(failure)
+        except PollerAborted as aborted:
+            try:
+                _report_abort_of_probe(probe, self.reason, aborted)
+            except WaitAborted as failure:
+                self._finish(failure)
+        except BaseException as e:
+            self._finish(e)
+        return None
+
+class PollScheduler:
+    """
+    Polls many waits from one timer thread and a small pool of workers,
+    rather than each wait occupying a thread of its own. The timer keeps a
+    heap of the time each wait is next due, and hands each wait to a worker
+    when it is due. Each wait returns a Future, which is resolved when the
+    probe is satisfied, or fails with the exception that assert_eventually or
+    wait_until would have raised.
+
+    A NotifyingProbe, or an abort condition, is polled as soon as it is
+    notified. Cancelling a wait's Future stops polling it. Close the
+    scheduler, or use it as a context manager, to stop it, which cancels the
+    waits that are still pending.
+
+    Given a clock, every wait is timed by it. A VirtualClock is moved on to
+    the time the next wait is due whenever no wait is being polled.
+    """
+
+    def __init__(self, workers: int = 4, clock: Optional[Clock] = None):
+        self._clock = clock or SystemClock()
+        self._condition = Condition()
+        self._running = 0
+        self._due: list[tuple[float, int, int, _ScheduledWait]] = []
+        self._sequence = count()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asyncmatch-poll")
+        self._timer = Thread(target=self._run, name="asyncmatch-scheduler", daemon=True)
+        self._timer.start()
+
+    def __enter__(self) -> "PollScheduler":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def assert_eventually(self, probe: Probe | Callable[[], bool], duration: float, poll_delay: float | PollSchedule, reason: Optional[str] = "", **options: Unpack[WaitOptions]) -> Future:
+        """
+        Schedules a wait like assert_eventually, whose Future fails with an
+        AssertionError if the probe is not satisfied in time.
+        """
+        return self._submit(probe, duration, poll_delay, reason, AssertionError, options)
+
+    def wait_until(self, probe: Probe | Callable[[], bool], duration: float, poll_delay: float | PollSchedule, reason: Optional[str] = "", **options: Unpack[WaitOptions]) -> Future:
+        """
+        Schedules a wait like wait_until, whose Future fails with a
+        SynchronisationTimeout if the probe is not satisfied in time.
+        """
+        return self._submit(probe, duration, poll_delay, reason, SynchronisationTimeout, options)
+
+    def _submit(self, probe, duration, poll_delay, reason, exc_type, options: WaitOptions) -> Future:
+        if "clock" in options:
+            raise TypeError("a scheduled wait is timed by the scheduler's clock")
+        probe = _get_probe(probe, options.get("sample_budget"))
+        poller = _make_poller(probe, duration, poll_delay, {**options, "clock": self._clock})
+        wake = lambda: self._wake(wait)
+        wait = _ScheduledWait(poller, probe, reason, exc_type, wake)
+        # A wait cancelled by the caller is dropped as soon as it is woken
+        wait.future.add_done_callback(lambda future: future.cancelled() and wake())
+        if isinstance(probe, NotifyingProbe):
+            probe.notification.add_callback(wake)
+            wait.future.add_done_callback(lambda _: probe.notification.remove_callback(wake))
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("the scheduler is closed")
+            self._schedule(wait, 0.0)
+        return wait.future
+
+    def _schedule(self, wait: _ScheduledWait, delay: float) -> None:
+        # Rescheduling a wait makes any earlier entry in the heap stale
+        wait.generation += 1
+        heappush(self._due, (self._clock.now() + delay, next(self._sequence), wait.generation, wait))
+        self._condition.notify()
+
+    def _wake(self, wait: _ScheduledWait) -> None:
+        with self._condition:
+            if wait.running:
+                wait.woken = True
+            elif (wait.future.cancelled() or not wait.future.done()) and not self._closed:
+                self._schedule(wait, 0.0)
+
+    def _run(self) -> None:
+        with self._condition:
+            while not self._closed:
+                if not self._due:
+                    self._condition.wait()
+                    continue
+                due, _, generation, wait = self._due[0]
+                now = self._clock.now()
+                if due > now:
+                    self._wait_until_due(due - now)
+                    continue
+                heappop(self._due)
+                if generation != wait.generation:
+                    continue
+                if wait.future.cancelled():
+                    wait.cancel()
+                    continue
+                wait.running = True
+                self._running += 1
+                self._executor.submit(self._poll, wait)
+
+    def _wait_until_due(self, delay: float) -> None:
+        if not isinstance(self._clock, VirtualClock):
+            self._condition.wait(delay)
+        elif self._running:
+            # The polls running may schedule waits that are due sooner
+            self._condition.wait()
+        else:
+            self._clock.sleep(delay)
+
+    def _poll(self, wait: _ScheduledWait) -> None:
+        delay = None
+        try:
+            delay = wait.poll()
+        finally:
+            with self._condition:
+                wait.running = False
+                self._running -= 1
+                self._condition.notify()
+                if delay is not None and self._closed:
+                    wait.cancel()
+                elif delay is not None:
+                    if wait.woken:
+                        wait.woken = False
+                        delay = 0.0
+                    self._schedule(wait, delay)
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            pending = [wait for _, _, _, wait in self._due]
+            self._due.clear()
+            self._condition.notify()
+        self._timer.join()
+        self._executor.shutdown(wait=True)
+        for wait in pending:
+            wait.cancel()
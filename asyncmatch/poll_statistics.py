@@ -0,0 +1,150 @@
+from .poll_observer import ObservedCheck, PollObserver
+from bisect import bisect_left
+from threading import Lock
+from typing import Any
+
+# Bucket upper bounds in seconds, from 10us to 100s, four per decade
+_BUCKET_BOUNDS = tuple(10 ** (exponent / 4) for exponent in range(-20, 9))
+
+class Histogram:
+    """
+    Counts durations in logarithmic buckets, using constant memory however
+    many durations are recorded.
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, duration: float) -> None:
+        self.counts[bisect_left(_BUCKET_BOUNDS, duration)] += 1
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+    def percentile(self, percent: float) -> float:
+        """
+        Returns the upper bound of the bucket containing the percentile, or
+        the largest duration recorded if that is smaller.
+        """
+        if not self.count:
+            return 0.0
+        rank = percent / 100 * self.count
+        seen = 0
+        for bound, count in zip(_BUCKET_BOUNDS, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+            "buckets": {f"{bound:.6g}": count for bound, count
+                        in zip((*_BUCKET_BOUNDS, float("inf")), self.counts) if count},
+        }
+
+class ProbeStatistics:
+    """
+    The statistics gathered for all checks of probes with one description.
+    """
+
+    def __init__(self):
+        self.checks = 0
+        self.satisfied = 0
+        self.timed_out = 0
+        self.samples = 0
+        self.time_to_satisfy = Histogram()
+        self.sample_latency = Histogram()
+        self.check_latency = Histogram()
+        self.least_time_remaining = float("inf")
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "checks": self.checks,
+            "satisfied": self.satisfied,
+            "timed_out": self.timed_out,
+            "samples": self.samples,
+            "least_time_remaining": self.least_time_remaining if self.satisfied else None,
+            "time_to_satisfy": self.time_to_satisfy.as_dict(),
+            "sample_latency": self.sample_latency.as_dict(),
+            "check_latency": self.check_latency.as_dict(),
+        }
+
+class PollStatistics(PollObserver):
+    """
+    Aggregates how long checks take to be satisfied, how many samples they
+    take, and how long sampling and matching take, per probe description.
+    Nothing is gathered until it is registered with ``add_observer`` or
+    given to a Poller.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._probes: dict[str, ProbeStatistics] = {}
+
+    def _statistics(self, check: ObservedCheck) -> ProbeStatistics:
+        statistics = self._probes.get(check.description)
+        if statistics is None:
+            statistics = self._probes[check.description] = ProbeStatistics()
+        return statistics
+
+    def on_start(self, check: ObservedCheck) -> None:
+        with self._lock:
+            self._statistics(check).checks += 1
+
+    def on_sample(self, check: ObservedCheck, start: float, duration: float) -> None:
+        with self._lock:
+            self._statistics(check).sample_latency.record(duration)
+
+    def on_check(self, check: ObservedCheck, satisfied: bool, start: float, duration: float) -> None:
+        with self._lock:
+            self._statistics(check).check_latency.record(duration)
+
+    def on_satisfied(self, check: ObservedCheck, time_remaining: float) -> None:
+        elapsed = check.elapsed()
+        with self._lock:
+            statistics = self._statistics(check)
+            statistics.satisfied += 1
+            statistics.samples += check.samples
+            statistics.time_to_satisfy.record(elapsed)
+            statistics.least_time_remaining = min(statistics.least_time_remaining, time_remaining)
+
+    def on_timeout(self, check: ObservedCheck) -> None:
+        with self._lock:
+            statistics = self._statistics(check)
+            statistics.timed_out += 1
+            statistics.samples += check.samples
+
+    def probes(self) -> dict[str, ProbeStatistics]:
+        with self._lock:
+            return dict(self._probes)
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """
+        The statistics for every probe description, e.g. to dump as JSON.
+        """
+        with self._lock:
+            return {description: statistics.as_dict()
+                    for description, statistics in self._probes.items()}
+
+    def report(self) -> str:
+        """
+        A table of the probes, those taking longest to satisfy first.
+        """
+        lines = [f"{'checks':>7} {'timeouts':>8} {'samples':>8} {'p50 (s)':>8} {'p99 (s)':>8} {'max (s)':>8}  probe"]
+        rows = sorted(self.probes().items(), key=lambda item: item[1].time_to_satisfy.total, reverse=True)
+        for description, statistics in rows:
+            time_to_satisfy = statistics.time_to_satisfy
+            lines.append(
+                f"{statistics.checks:>7} {statistics.timed_out:>8} {statistics.samples:>8} "
+                f"{time_to_satisfy.percentile(50):>8.3f} {time_to_satisfy.percentile(99):>8.3f} "
+                f"{time_to_satisfy.max:>8.3f}  {description}")
+        return "\n".join(lines)
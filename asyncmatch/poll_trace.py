@@ -0,0 +1,122 @@
+from .poll_observer import ObservedCheck, PollObserver
+from itertools import count
+from pathlib import Path
+from threading import Lock, get_native_id
+from time import perf_counter
+from typing import Any, Optional
+import atexit
+import json
+import os
+
+def _microseconds(seconds: float) -> float:
+    return round(seconds * 1e6, 3)
+
+class PollTracer(PollObserver):
+    """
+    Writes a timeline of the checks it observes as a Chrome trace, which can
+    be opened in Perfetto or chrome://tracing. Each check is a span labelled
+    with the probe's description, on a track of its own so that overlapping
+    checks can be told apart, and each sample and each check of whether the
+    probe is satisfied is a span on the thread that made it.
+
+    Checks timed by a virtual clock are left out, as their times are not
+    on the timeline of the trace.
+
+    Events are buffered in memory and appended to the file when the buffer
+    fills, or when the tracer is flushed. The file is completed when the
+    tracer is closed, which happens at the latest when the process exits.
+    """
+
+    def __init__(self, path: str | os.PathLike, buffer_size: int = 10000):
+        self.path = Path(path)
+        self._buffer_size = buffer_size
+        self._lock = Lock()
+        self._events: list[dict[str, Any]] = []
+        self._ids = count(1)
+        self._pid = os.getpid()
+        self._written = 0
+        self._closed = False
+        self.path.write_text("[")
+        self._append({"name": "process_name", "ph": "M", "pid": self._pid, "args": {"name": "asyncmatch"}})
+        atexit.register(self.close)
+
+    def _append(self, event: dict[str, Any]) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._events.append(event)
+            full = len(self._events) >= self._buffer_size
+        if full:
+            self.flush()
+
+    def _span(self, name: str, category: str, start: float, duration: float, args: Optional[dict[str, Any]] = None) -> None:
+        event = {"name": name, "cat": category, "ph": "X", "pid": self._pid, "tid": get_native_id(),
+                 "ts": _microseconds(start), "dur": _microseconds(duration)}
+        if args:
+            event["args"] = args
+        self._append(event)
+
+    def add_span(self, name: str, start: float, end: float, category: str = "test") -> None:
+        """
+        Adds a span of something else to the timeline, e.g. a test or its
+        act phase, with times from ``time.perf_counter``.
+        """
+        self._span(name, category, start, end - start)
+
+    def _check_ended(self, check: ObservedCheck, outcome: str) -> None:
+        # Emitted once the check has ended, as an async span so that checks on
+        # the same thread, e.g. from a PollScheduler, may overlap
+        if not check.real_time:
+            return
+        common = {"name": check.description, "cat": "wait", "pid": self._pid, "id": next(self._ids)}
+        self._append({**common, "ph": "b", "ts": _microseconds(check.started_at),
+                      "args": {"outcome": outcome, "samples": check.samples}})
+        self._append({**common, "ph": "e", "ts": _microseconds(perf_counter())})
+
+    def on_sample(self, check: ObservedCheck, start: float, duration: float) -> None:
+        if check.real_time:
+            self._span("sample", "sample", start, duration, {"probe": check.description})
+
+    def on_check(self, check: ObservedCheck, satisfied: bool, start: float, duration: float) -> None:
+        if check.real_time:
+            self._span("is_satisfied", "check", start, duration, {"probe": check.description, "satisfied": satisfied})
+
+    def on_satisfied(self, check: ObservedCheck, time_remaining: float) -> None:
+        self._check_ended(check, "satisfied")
+
+    def on_timeout(self, check: ObservedCheck) -> None:
+        self._check_ended(check, "timed out")
+
+    def on_violation(self, check: ObservedCheck) -> None:
+        self._check_ended(check, "violated")
+
+    def on_abort(self, check: ObservedCheck) -> None:
+        self._check_ended(check, "aborted")
+
+    def flush(self) -> None:
+        """
+        Appends the buffered events to the file.
+        """
+        with self._lock:
+            events, self._events = self._events, []
+            if self._closed or not events:
+                return
+            with open(self.path, "a", encoding="utf-8") as trace:
+                for event in events:
+                    trace.write(",\n" if self._written else "\n")
+                    trace.write(json.dumps(event))
+                    self._written += 1
+
+    def close(self) -> None:
+        """
+        Flushes the buffered events and completes the file. Events observed
+        afterwards are discarded.
+        """
+        self.flush()
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            with open(self.path, "a", encoding="utf-8") as trace:
+                trace.write("\n]\n")
+        atexit.unregister(self.close)
@@ -1,15 +1,94 @@
+from .abort_condition import AbortCondition, abort_conditions
+from .notification import Notification
+from .notifying_probe import NotifyingProbe
+from .poll_observer import ObservedCheck, PollObserver, observe
+from .sample_history import SampleHistory
+from .sampler import Sampler
 from .timeout import Timeout
 from .probe import Probe
+from collections.abc import Callable, Iterable
+from typing import Optional
 
 class PollerTimeout(Exception):
     """
-    Exception raised when the poller times out while checking a probe.
+    Exception raised when the poller times out while checking a probe. The
+    notes say anything else worth reporting about the check.
     """
-    pass
+    def __init__(self, notes: Optional[list[str]] = None):
+        super().__init__()
+        self.notes = notes or []
+
+class PollerViolation(Exception):
+    """
+    Exception raised when a probe that should have remained satisfied was
+    not. The notes say anything else worth reporting about the check.
+    """
+    def __init__(self, notes: Optional[list[str]] = None):
+        super().__init__()
+        self.notes = notes or []
+
+class PollerAborted(Exception):
+    """
+    Exception raised when an abort condition is met while checking a probe.
+    The reason says why, and the notes say anything else worth reporting.
+    """
+    def __init__(self, reason: str, notes: Optional[list[str]] = None):
+        super().__init__(reason)
+        self.reason = reason
+        self.notes = notes or []
 
 class Poller:
-    def __init__(self, timeout: Timeout):
+    """
+    Checks a probe until the Timeout expires. The probe is expected to have
+    been sampled already, unless ``sample_first``, in which case the Poller
+    takes the first sample through its Sampler. The call site, if known, is
+    passed on to observers.
+    """
+
+    def __init__(self, timeout: Timeout, sampler: Optional[Sampler] = None, observers: Iterable[PollObserver] = (), history: Optional[SampleHistory] = None, abort_conditions: Iterable[AbortCondition] = (), sample_first: bool = False, call_site: Optional[str] = None):
         self.timeout = timeout
+        self.sampler = sampler or Sampler()
+        self.observers = tuple(observers)
+        self.history = history
+        self.abort_conditions = tuple(abort_conditions)
+        self.sample_first = sample_first
+        self.call_site = call_site
+        self._aborts: tuple[AbortCondition, ...] = ()
+        self._wake: Optional[Callable[[], None]] = None
+        self._wake_notification: Optional[Notification] = None
+
+    def _watch_aborts(self, probe: Probe, wake: Optional[Callable[[], None]] = None) -> None:
+        """
+        Starts watching the abort conditions, and those added for every wait.
+        A condition that is notified when it is met wakes the Poller, or calls
+        ``wake`` if given.
+        """
+        self._aborts = abort_conditions(self.abort_conditions)
+        notifications = [c.notification for c in self._aborts if c.notification is not None]
+        if not notifications:
+            return
+        if wake is None:
+            if not isinstance(probe, NotifyingProbe):
+                self._wake_notification = Notification()
+            wake = (self._wake_notification or probe.notification).set
+        self._wake = wake
+        for notification in notifications:
+            notification.add_callback(wake)
+
+    def _unwatch_aborts(self) -> None:
+        if self._wake is not None:
+            for condition in self._aborts:
+                if condition.notification is not None:
+                    condition.notification.remove_callback(self._wake)
+        self._aborts, self._wake, self._wake_notification = (), None, None
+
+    def _check_aborted(self, check: Optional[ObservedCheck]) -> None:
+        for condition in self._aborts:
+            reason = condition.reason()
+            if reason is not None:
+                if check is not None:
+                    check.aborted()
+                raise PollerAborted(reason, self._notes())
 
     def _probe_satisfied(self, probe: Probe) -> bool:
         satisfied = probe.is_satisfied()
@@ -17,12 +96,92 @@ class Poller:
             raise TypeError(f"Probe {probe} did not return a boolean value")
         return satisfied
 
+    def _observed_satisfied(self, probe: Probe, check: Optional[ObservedCheck]) -> bool:
+        start = check.now() if check is not None else 0.0
+        satisfied = self._probe_satisfied(probe)
+        if check is not None:
+            check.checked(satisfied, start)
+        if self.history is not None:
+            self.history.record(probe, satisfied)
+        return satisfied
+
+    def _sleep(self, probe: Probe) -> None:
+        if isinstance(probe, NotifyingProbe):
+            self.timeout.wait(probe.notification)
+        elif self._wake_notification is not None:
+            self.timeout.wait(self._wake_notification)
+        else:
+            self.timeout.sleep()
+
+    def _sample(self, probe: Probe, check: Optional[ObservedCheck]) -> None:
+        start = check.now() if check is not None else 0.0
+        self.sampler.sample(probe, self.timeout)
+        if check is not None:
+            check.sampled(start)
+
+    def _satisfied(self, check: Optional[ObservedCheck]) -> None:
+        if check is not None:
+            check.satisfied(self.timeout.time_remaining())
+
+    def _notes(self) -> list[str]:
+        notes = self.sampler.notes()
+        if self.history is not None:
+            notes += self.history.notes()
+        return notes
+
+    def _timed_out(self, check: Optional[ObservedCheck]) -> PollerTimeout:
+        if check is not None:
+            check.timed_out()
+        return PollerTimeout(self._notes())
+
+    def _violated(self, check: Optional[ObservedCheck], start: float) -> PollerViolation:
+        if check is not None:
+            check.violated()
+        return PollerViolation([f"violated after {self.timeout.clock.now() - start:.3f}s", *self._notes()])
+
     def check(self, probe: Probe) -> None:
         """
-        Check the probe until it is satisfied or the timeout expires.
+        Check the probe until it is satisfied, the timeout expires or an abort
+        condition is met.
         """
-        while not self._probe_satisfied(probe):
-            if self.timeout.timed_out():
-                raise PollerTimeout()
-            self.timeout.sleep()
-            probe.sample()
\ No newline at end of file
+        check = observe(probe, self.observers, self.call_site, self.timeout.clock)
+        self._watch_aborts(probe)
+        try:
+            if self.sample_first:
+                self._sample(probe, check)
+            while not self._observed_satisfied(probe, check):
+                self._check_aborted(check)
+                if self.timeout.timed_out():
+                    raise self._timed_out(check)
+                self._sleep(probe)
+                self._sample(probe, check)
+            self._satisfied(check)
+        finally:
+            self._unwatch_aborts()
+            self.sampler.release()
+
+    def check_consistently(self, probe: Probe) -> None:
+        """
+        Check that the probe remains satisfied until the timeout expires,
+        failing as soon as it is not. A NotifyingProbe is resampled whenever
+        it is notified, as well as at each poll, so a transient violation is
+        seen only if the probe latches it until then. Observers are told of a
+        violation, but not of a probe that remained satisfied, which is not
+        a wait for the probe to be satisfied.
+        """
+        start = self.timeout.clock.now()
+        check = observe(probe, self.observers, self.call_site, self.timeout.clock)
+        self._watch_aborts(probe)
+        try:
+            if self.sample_first:
+                self._sample(probe, check)
+            while self._observed_satisfied(probe, check):
+                self._check_aborted(check)
+                if self.timeout.timed_out():
+                    return
+                self._sleep(probe)
+                self._sample(probe, check)
+            raise self._violated(check, start)
+        finally:
+            self._unwatch_aborts()
+            self.sampler.release()
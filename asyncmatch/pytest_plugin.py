@@ -0,0 +1,183 @@
+"""
+A pytest plugin that keeps the timing parameters of assert_eventually and
+wait_until in one place, and reports which waits take longest.
+
+Enable it with ``-p asyncmatch.pytest_plugin`` on the command line, or with
+``pytest_plugins = ["asyncmatch.pytest_plugin"]`` in the top-level conftest.py.
+"""
+from .assert_eventually import assert_eventually as _assert_eventually, wait_until as _wait_until
+from .poll_observer import ObservedCheck, PollObserver, add_observer, remove_observer
+from .poll_trace import PollTracer
+from collections.abc import Callable
+from pathlib import Path
+from threading import Lock
+from time import perf_counter
+from typing import NamedTuple, Optional
+import pytest
+
+DEFAULT_DURATION = 5.0
+DEFAULT_POLL_DELAY = 0.1
+
+class Timing(NamedTuple):
+    duration: float
+    poll_delay: float
+
+class WaitRecord(NamedTuple):
+    nodeid: str
+    probe: str
+    elapsed: float
+    satisfied: bool
+
+class WaitRecorder(PollObserver):
+    """
+    Records every check that finishes, attributing it to the test running at
+    the time.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.nodeid = ""
+        self.waits: list[WaitRecord] = []
+
+    def _record(self, check: ObservedCheck, satisfied: bool) -> None:
+        record = WaitRecord(self.nodeid, check.description, check.elapsed(), satisfied)
+        with self._lock:
+            self.waits.append(record)
+
+    def on_satisfied(self, check: ObservedCheck, time_remaining: float) -> None:
+        self._record(check, True)
+
+    def on_timeout(self, check: ObservedCheck) -> None:
+        self._record(check, False)
+
+    def slowest(self, count: int) -> list[WaitRecord]:
+        with self._lock:
+            return sorted(self.waits, key=lambda wait: wait.elapsed, reverse=True)[:count]
+
+    def total_per_test(self) -> dict[str, float]:
+        totals = {}
+        with self._lock:
+            for wait in self.waits:
+                totals[wait.nodeid] = totals.get(wait.nodeid, 0.0) + wait.elapsed
+        return totals
+
+_recorder_key = pytest.StashKey[WaitRecorder]()
+_tracer_key = pytest.StashKey[Optional[PollTracer]]()
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("asyncmatch")
+    group.addoption("--asyncmatch-duration", type=float, default=None,
+                    help="default duration of assert_eventually and wait_until fixtures, in seconds")
+    group.addoption("--asyncmatch-poll-delay", type=float, default=None,
+                    help="default polling delay of assert_eventually and wait_until fixtures, in seconds")
+    group.addoption("--asyncmatch-slowest", type=int, default=None, metavar="N",
+                    help="report the N slowest waits at the end of the session (0 to disable)")
+    group.addoption("--asyncmatch-trace", default=None, metavar="PATH",
+                    help="write a timeline of the tests and their waits to PATH as a Chrome trace")
+    parser.addini("asyncmatch_duration", "default duration of assert_eventually and wait_until fixtures",
+                  default=str(DEFAULT_DURATION))
+    parser.addini("asyncmatch_poll_delay", "default polling delay of assert_eventually and wait_until fixtures",
+                  default=str(DEFAULT_POLL_DELAY))
+    parser.addini("asyncmatch_slowest", "number of slowest waits to report at the end of the session",
+                  default="10")
+    parser.addini("asyncmatch_trace", "path of a Chrome trace of the tests and their waits, if any",
+                  default="")
+
+def _option(config: pytest.Config, name: str, convert: Callable):
+    value = config.getoption(f"asyncmatch_{name}")
+    return value if value is not None else convert(config.getini(f"asyncmatch_{name}"))
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers",
+        "asyncmatch(duration=None, poll_delay=None): timing of the assert_eventually and wait_until fixtures")
+    recorder = WaitRecorder()
+    config.stash[_recorder_key] = recorder
+    add_observer(recorder)
+    tracer = None
+    trace = _option(config, "trace", str)
+    if trace:
+        path = Path(trace)
+        if hasattr(config, "workerinput"):
+            # One file per pytest-xdist worker
+            path = path.with_stem(f"{path.stem}-{config.workerinput['workerid']}")
+        tracer = PollTracer(path)
+        add_observer(tracer)
+    config.stash[_tracer_key] = tracer
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    recorder = config.stash.get(_recorder_key, None)
+    if recorder is not None:
+        remove_observer(recorder)
+    tracer = config.stash.get(_tracer_key, None)
+    if tracer is not None:
+        remove_observer(tracer)
+        tracer.close()
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item: pytest.Item, nextitem: Optional[pytest.Item]):
+    recorder = item.config.stash[_recorder_key]
+    recorder.nodeid = item.nodeid
+    start = perf_counter()
+    yield
+    tracer = item.config.stash[_tracer_key]
+    if tracer is not None:
+        tracer.add_span(item.nodeid, start, perf_counter())
+    recorder.nodeid = ""
+
+def pytest_terminal_summary(terminalreporter, exitstatus: int, config: pytest.Config) -> None:
+    count = _option(config, "slowest", int)
+    recorder = config.stash[_recorder_key]
+    if count <= 0 or not recorder.waits:
+        return
+    terminalreporter.write_sep("=", f"asyncmatch: {count} slowest waits")
+    for wait in recorder.slowest(count):
+        outcome = "" if wait.satisfied else " (timed out)"
+        terminalreporter.write_line(f"{wait.elapsed:8.3f}s {wait.nodeid}: {wait.probe}{outcome}")
+    terminalreporter.write_sep("-", "asyncmatch: total wait time per test")
+    totals = sorted(recorder.total_per_test().items(), key=lambda total: total[1], reverse=True)
+    for nodeid, total in totals[:count]:
+        terminalreporter.write_line(f"{total:8.3f}s {nodeid}")
+
+@pytest.fixture
+def asyncmatch_timing(request: pytest.FixtureRequest) -> Timing:
+    """
+    The timing parameters for the test, from its asyncmatch marker, else the
+    command line, else the ini file.
+    """
+    config = request.config
+    timing = Timing(_option(config, "duration", float), _option(config, "poll_delay", float))
+    marker = request.node.get_closest_marker("asyncmatch")
+    if marker is not None:
+        timing = timing._replace(**marker.kwargs)
+    return timing
+
+@pytest.fixture
+def assert_eventually(asyncmatch_timing: Timing) -> Callable[..., None]:
+    """
+    assert_eventually, taking its duration and polling delay from the
+    configuration unless they are given.
+    """
+    def assert_eventually(probe, reason: str = "", *, duration: Optional[float] = None, poll_delay=None, **kwargs) -> None:
+        _assert_eventually(
+            probe,
+            duration if duration is not None else asyncmatch_timing.duration,
+            poll_delay if poll_delay is not None else asyncmatch_timing.poll_delay,
+            reason,
+            **kwargs)
+    return assert_eventually
+
+@pytest.fixture
+def wait_until(asyncmatch_timing: Timing) -> Callable[..., None]:
+    """
+    wait_until, taking its duration and polling delay from the configuration
+    unless they are given.
+    """
+    def wait_until(probe, reason: str = "", *, duration: Optional[float] = None, poll_delay=None, **kwargs) -> None:
+        _wait_until(
+            probe,
+            duration if duration is not None else asyncmatch_timing.duration,
+            poll_delay if poll_delay is not None else asyncmatch_timing.poll_delay,
+            reason,
+            **kwargs)
+    return wait_until
@@ -0,0 +1,66 @@
+from .clock import Clock, SystemClock
+from .probe import Probe
+from collections import deque
+from hamcrest.core.string_description import StringDescription
+from typing import Optional
+
+class _Entry:
+    __slots__ = ("time", "state", "repeats")
+
+    def __init__(self, time: float, state: str):
+        self.time = time
+        self.state = state
+        self.repeats = 1
+
+class SampleHistory:
+    """
+    Records the states in which a Poller saw a probe, as the probe describes
+    its mismatch, so that a timeout can report how the state changed over
+    time. Only changes of state are kept, in a ring buffer holding the latest
+    ``capacity`` of them, so memory is bounded however long the wait. Times
+    are told by the clock, which should be that of the Timeout.
+    """
+
+    def __init__(self, capacity: int, clock: Optional[Clock] = None):
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, not {capacity}")
+        self._clock = clock or SystemClock()
+        self._entries: deque[_Entry] = deque(maxlen=capacity)
+        self._started_at: Optional[float] = None
+        self._dropped = 0
+
+    def record(self, probe: Probe, satisfied: bool) -> None:
+        now = self._clock.now()
+        if self._started_at is None:
+            self._started_at = now
+        if satisfied:
+            state = "satisfied"
+        else:
+            description = StringDescription()
+            probe.describe_mismatch(description)
+            state = str(description)
+        if self._entries and self._entries[-1].state == state:
+            self._entries[-1].repeats += 1
+            return
+        if len(self._entries) == self._entries.maxlen:
+            self._dropped += 1
+        self._entries.append(_Entry(now - self._started_at, state))
+
+    def timeline(self) -> list[str]:
+        """
+        One line per change of state, giving the time since the first sample,
+        the state, and how many samples in a row saw it.
+        """
+        lines = []
+        if self._dropped:
+            lines.append(f"... {self._dropped} earlier state(s) not kept")
+        for entry in self._entries:
+            repeats = f" (x{entry.repeats})" if entry.repeats > 1 else ""
+            state = entry.state.replace("\n", "\n          ")
+            lines.append(f"+{entry.time:.3f}s {state}{repeats}")
+        return lines
+
+    def notes(self) -> list[str]:
+        if not self._entries:
+            return []
+        return ["states seen:" + "".join(f"\n          {line}" for line in self.timeline())]
@@ -0,0 +1,69 @@
+from collections.abc import Callable
+from concurrent.futures import Future
+from threading import Lock
+from time import monotonic
+from typing import Any, Optional
+
+class SampleSource:
+    """
+    Reads snapshots of some state of the subject-under-test on behalf of any
+    number of probes, e.g. the whole USB device tree.
+
+    A snapshot is reused by every read within ``ttl`` seconds of it being
+    taken. Reads that arrive while a snapshot is being taken wait for it,
+    rather than taking another, so an expensive snapshot is taken at most
+    once however many probes and concurrent waits share the source.
+    """
+
+    def __init__(self, read: Callable[[], Any], ttl: float = 0.0):
+        self._read = read
+        self._ttl = ttl
+        self._lock = Lock()
+        self._snapshot = None
+        self._taken_at: Optional[float] = None
+        self._in_flight: Optional[Future] = None
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """
+        Counts the snapshots taken, so that a probe can tell cheaply whether
+        the snapshot has changed.
+        """
+        return self._version
+
+    def read(self) -> Any:
+        return self.read_versioned()[0]
+
+    def read_versioned(self) -> tuple[Any, int]:
+        """
+        Reads a snapshot together with its version.
+        """
+        with self._lock:
+            if self._taken_at is not None and monotonic() - self._taken_at < self._ttl:
+                return self._snapshot, self._version
+            in_flight = self._in_flight
+            if in_flight is None:
+                self._in_flight = Future()
+        if in_flight is not None:
+            return in_flight.result()
+        return self._take_snapshot()
+
+    def _take_snapshot(self) -> tuple[Any, int]:
+        future = self._in_flight
+        start = monotonic()
+        try:
+            snapshot = self._read()
+        except BaseException as e:
+            with self._lock:
+                self._in_flight = None
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._snapshot = snapshot
+            self._taken_at = start
+            self._version += 1
+            self._in_flight = None
+            versioned = snapshot, self._version
+        future.set_result(versioned)
+        return versioned
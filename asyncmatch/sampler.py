@@ -0,0 +1,178 @@
+from .async_probe import AsyncProbe
+from .probe import Probe
+from .timeout import Timeout
+from asyncio import TimeoutError as AsyncTimeoutError, wait as async_wait, wait_for, wrap_future
+from collections.abc import Callable
+from concurrent.futures import Future, wait
+from enum import Enum
+from inspect import isawaitable
+from queue import SimpleQueue
+from threading import Thread
+from time import monotonic
+
+class Sampler:
+    """
+    Samples a Probe on behalf of a Poller. This sampler simply calls the
+    probe's sample method.
+    """
+
+    def sample(self, probe: Probe, timeout: Timeout) -> None:
+        probe.sample()
+
+    async def sample_async(self, probe: Probe, timeout: Timeout) -> None:
+        result = probe.sample()
+        if isawaitable(result):
+            await result
+
+    def notes(self) -> list[str]:
+        """
+        Notes about the sampling to report if the Poller times out.
+        """
+        return []
+
+    def release(self) -> None:
+        """
+        Release any resources held for sampling, once the Poller is done.
+        """
+        pass
+
+class StuckWorkerPolicy(Enum):
+    """
+    What a BudgetedSampler does with a worker whose sample overran its budget.
+    """
+
+    # Keep the worker, and skip sampling until the stuck sample completes
+    REUSE = "reuse"
+    # Abandon the worker, and sample with a new one
+    DISCARD = "discard"
+
+class _Worker:
+    """
+    A daemon thread that runs one call at a time, so that a call which never
+    returns does not prevent the interpreter from exiting.
+    """
+
+    def __init__(self):
+        self._requests = SimpleQueue()
+        Thread(target=self._run, name="asyncmatch-sampler", daemon=True).start()
+
+    def submit(self, func: Callable[[], None]) -> Future:
+        future = Future()
+        self._requests.put((func, future))
+        return future
+
+    def retire(self) -> None:
+        self._requests.put(None)
+
+    def _run(self) -> None:
+        while (request := self._requests.get()) is not None:
+            func, future = request
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(func())
+                except BaseException as e:
+                    future.set_exception(e)
+
+class BudgetedSampler(Sampler):
+    """
+    Samples a Probe on a worker thread, waiting no longer than the budget for
+    each sample, even the last sample at the end of the Timeout, so that the
+    check ends at most one budget late. A sample that overruns is abandoned,
+    and the Poller goes on with the state the probe had before it.
+
+    The stuck sample cannot be interrupted, and may still change the state of
+    the probe whenever it completes. The policy decides whether its worker is
+    reused once it completes, so that samples never overlap, or discarded in
+    favour of a new one, in which case a later sample may run alongside the
+    stuck one, and the probe must allow that.
+
+    An AsyncProbe is sampled on the event loop, and an overrunning sample is
+    cancelled.
+    """
+
+    def __init__(self, budget: float, policy: StuckWorkerPolicy = StuckWorkerPolicy.DISCARD):
+        if budget <= 0:
+            raise ValueError(f"budget must be positive, not {budget}")
+        self._budget = budget
+        self._policy = policy
+        self._worker = None
+        self._stuck = None
+        self._abandoned = 0
+        self._skipped = 0
+        self._slowest = 0.0
+
+    def _stuck_wait_time(self, timeout: Timeout) -> float:
+        # Waiting for a stuck sample to recover is not itself a sample, so
+        # does not extend the check beyond its timeout
+        return max(0.0, min(self._budget, timeout.time_remaining()))
+
+    def _submit(self, probe: Probe) -> Future:
+        if self._worker is None:
+            self._worker = _Worker()
+        return self._worker.submit(probe.sample)
+
+    def _finish(self, future: Future, start: float) -> None:
+        self._slowest = max(self._slowest, monotonic() - start)
+        if future.done():
+            future.result()
+            return
+        self._abandoned += 1
+        if self._policy is StuckWorkerPolicy.REUSE:
+            self._stuck = future
+        else:
+            self._worker.retire()
+            self._worker = None
+
+    def _still_stuck(self) -> bool:
+        if self._stuck is not None and self._stuck.done():
+            self._stuck = None
+        if self._stuck is None:
+            return False
+        self._skipped += 1
+        return True
+
+    def sample(self, probe: Probe, timeout: Timeout) -> None:
+        if self._stuck is not None:
+            wait([self._stuck], self._stuck_wait_time(timeout))
+            if self._still_stuck():
+                return
+        start = monotonic()
+        future = self._submit(probe)
+        wait([future], self._budget)
+        self._finish(future, start)
+
+    async def sample_async(self, probe: Probe, timeout: Timeout) -> None:
+        if isinstance(probe, AsyncProbe):
+            start = monotonic()
+            try:
+                await wait_for(probe.sample(), self._budget)
+            except AsyncTimeoutError:
+                self._abandoned += 1
+            finally:
+                self._slowest = max(self._slowest, monotonic() - start)
+            return
+        # Sample on the worker thread, awaiting the result on the event loop
+        if self._stuck is not None:
+            await async_wait([wrap_future(self._stuck)], timeout=self._stuck_wait_time(timeout))
+            if self._still_stuck():
+                return
+        start = monotonic()
+        future = self._submit(probe)
+        await async_wait([wrap_future(future)], timeout=self._budget)
+        self._finish(future, start)
+
+    def notes(self) -> list[str]:
+        notes = []
+        if self._abandoned:
+            notes.append(f"{self._abandoned} sample(s) abandoned after exceeding the {self._budget}s sample budget")
+        if self._skipped:
+            notes.append(f"{self._skipped} sample(s) skipped while a stuck sample was still running")
+        if self._slowest:
+            notes.append(f"slowest sample took {self._slowest:.3f}s")
+        return notes
+
+    def release(self) -> None:
+        if self._worker is not None:
+            self._worker.retire()
+            self._worker = None
+        self._stuck = None
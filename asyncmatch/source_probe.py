@@ -0,0 +1,33 @@
+from .change_detecting_probe import ChangeDetectingProbe
+from .sample_source import SampleSource
+from collections.abc import Hashable
+from hamcrest.core.description import Description
+from hamcrest.core.matcher import Matcher
+from typing import Any
+
+class SourceProbe(ChangeDetectingProbe):
+    """
+    A Probe that matches the snapshots read from a SampleSource. Many
+    SourceProbes can cheaply share one expensive source. A snapshot is only
+    matched once, however many times it is read from the source.
+    """
+
+    def __init__(self, source: SampleSource, matcher: Matcher):
+        self._source = source
+        self._matcher = matcher
+        self.sample()
+
+    def snapshot(self) -> tuple[Any, int]:
+        return self._source.read_versioned()
+
+    def fingerprint(self, snapshot: tuple[Any, int]) -> Hashable:
+        return snapshot[1]
+
+    def matches(self, snapshot: tuple[Any, int]) -> bool:
+        return self._matcher.matches(snapshot[0])
+
+    def describe_to(self, description: Description) -> None:
+        description.append_description_of(self._matcher)
+
+    def describe_mismatch(self, description: Description) -> None:
+        self._matcher.describe_mismatch(self.last_snapshot[0], description)
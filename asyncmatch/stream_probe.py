@@ -0,0 +1,81 @@
+from .notifying_probe import NotifyingProbe
+from collections import deque
+from hamcrest.core.description import Description
+from hamcrest.core.matcher import Matcher
+from typing import Any, Optional
+
+class StreamProbe(NotifyingProbe):
+    """
+    Probes for the arrival of messages, e.g. those received by a test double
+    MQTT client. Feed the probe every message, from any thread, and each one
+    wakes the Poller. Each sample matches only the messages that have arrived
+    since the previous sample, so the cost of sampling does not grow with the
+    traffic.
+
+    Given several matchers, the probe is satisfied by distinct messages
+    matching each of them in turn, e.g. "A then B". Only messages fed after
+    the probe is created are considered, so create it before acting.
+    """
+
+    _item = "message"
+
+    def __init__(self, matcher: Matcher, *then: Matcher):
+        self._matchers = (matcher, *then)
+        self._arrived: deque = deque()
+        self._matched: list = []
+        self._received = 0
+        # The last message not matched, with the index of the matcher it
+        # failed, which may be behind the current one by the time it is told
+        self._last_unmatched: Optional[tuple[int, Any]] = None
+
+    def feed(self, message: Any) -> None:
+        """
+        Receive a message. Safe to call from any thread.
+        """
+        self._arrived.append(message)
+        self.notify()
+
+    @property
+    def matched(self) -> list:
+        """
+        The messages that matched, in order.
+        """
+        return list(self._matched)
+
+    def is_satisfied(self) -> bool:
+        return len(self._matched) == len(self._matchers)
+
+    def sample(self) -> None:
+        while not self.is_satisfied() and self._arrived:
+            message = self._arrived.popleft()
+            self._received += 1
+            stage = len(self._matched)
+            if self._matchers[stage].matches(message):
+                self._matched.append(message)
+            else:
+                self._last_unmatched = (stage, message)
+
+    def describe_to(self, description: Description) -> None:
+        if len(self._matchers) == 1:
+            description.append_text(f"a {self._item} matching ").append_description_of(self._matchers[0])
+            return
+        description.append_text(f"{self._item}s matching, in order: ")
+        for index, matcher in enumerate(self._matchers):
+            if index:
+                description.append_text(", then ")
+            description.append_description_of(matcher)
+
+    def describe_mismatch(self, description: Description) -> None:
+        if not self._received:
+            description.append_text(f"no {self._item}s were received")
+            return
+        description.append_text(f"{self._received} {self._item}(s) were received")
+        if len(self._matchers) > 1:
+            description.append_text(f", matching {len(self._matched)} of {len(self._matchers)} in order")
+        if self._last_unmatched is not None:
+            stage, message = self._last_unmatched
+            expected = self._matchers[stage]
+            description.append_text("; the last not matching ") \
+                .append_description_of(expected) \
+                .append_text(": ")
+            expected.describe_mismatch(message, description)
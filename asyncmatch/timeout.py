@@ -1,20 +1,63 @@
-from time import time, sleep
+from .clock import Clock, SystemClock
+from .notification import Notification
+from .poll_schedule import PollSchedule, as_poll_schedule
+from typing import Optional
 
 class Timeout:
     """
     A simple timeout class for synchronising a test harness with a system-under-test
+
+    Time is measured with a monotonic clock, so the timeout is unaffected by
+    changes to the system time. No sleep extends beyond the end of the
+    timeout, so the final sample is taken at the deadline. Given a
+    VirtualClock, the timeout takes no real time at all.
+
+    With ``fixed_rate``, the time since the previous poll, including the time
+    taken to sample, is deducted from each polling delay. A delay of 0.1
+    seconds then samples at 10Hz, however long sampling takes.
     """
 
-    def __init__(self, duration: float, poll_delay: float):
-        self._end_time = time() + duration
-        self._poll_delay = poll_delay
+    def __init__(self, duration: float, poll_delay: float | PollSchedule, fixed_rate: bool = False, clock: Optional[Clock] = None):
+        self.clock = clock or SystemClock()
+        now = self.clock.now()
+        self._end_time = now + duration
+        self._poll_delays = as_poll_schedule(poll_delay).delays_for(lambda: self.clock.now() - now)
+        self._fixed_rate = fixed_rate
+        self._next_poll_time = now
 
     def timed_out(self) -> bool:
-        return self._time_remaining() <= 0
+        return self.time_remaining() <= 0
 
     def sleep(self) -> None:
-        sleep(self._poll_delay)
+        self.clock.sleep(self.next_sleep())
+
+    async def sleep_async(self) -> None:
+        await self.clock.sleep_async(self.next_sleep())
+
+    def wait(self, notification: Notification) -> None:
+        """
+        Sleep for the next poll delay, or until notified if that is sooner.
+        """
+        self.clock.wait(notification, self.next_sleep())
+
+    async def wait_async(self, notification: Notification) -> None:
+        await self.clock.wait_async(notification, self.next_sleep())
+
+    def _next_poll_delay(self) -> float:
+        return next(self._poll_delays)
 
-    def _time_remaining(self) -> float:
-        return self._end_time - time()
+    def next_sleep(self) -> float:
+        """
+        How long to wait before the next poll, for a caller that waits for
+        itself rather than calling sleep or wait.
+        """
+        now = self.clock.now()
+        delay = self._next_poll_delay()
+        if self._fixed_rate:
+            # Having fallen behind, restart from now rather than rushing to catch up
+            self._next_poll_time = max(self._next_poll_time + delay, now)
+            delay = self._next_poll_time - now
+        return max(0.0, min(delay, self._end_time - now))
 
+    def time_remaining(self) -> float:
+        return self._end_time - self.clock.now()
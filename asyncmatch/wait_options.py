@@ -0,0 +1,32 @@
+from .abort_condition import AbortCondition
+from .clock import Clock
+from collections.abc import Callable, Iterable
+from typing import Optional, TypedDict
+
+class WaitOptions(TypedDict, total=False):
+    """
+    The keyword options taken by every wait, from assert_eventually to
+    PollScheduler.wait_until, which all pass them on to the Poller as they
+    are. An option left out has its default.
+
+    fixed_rate: deduct the time taken to sample from each polling delay.
+    Defaults to False.
+
+    sample_budget: sample on a worker thread, abandoning any sample,
+    including the first, that takes longer than this many seconds. Defaults
+    to None, for no budget.
+
+    history: report up to this many of the latest changes in the state of
+    the probe on failure. Defaults to 0, for none.
+
+    abort_if: conditions that end the wait at once with a WaitAborted.
+    Defaults to none, besides those added with add_abort_condition.
+
+    clock: tells and waits out time, e.g. a VirtualClock. Defaults to the
+    system clock. A PollScheduler times every wait by its own clock.
+    """
+    fixed_rate: bool
+    sample_budget: Optional[float]
+    history: int
+    abort_if: Iterable[AbortCondition | Callable[[], bool | str | None]]
+    clock: Optional[Clock]
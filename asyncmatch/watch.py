@@ -0,0 +1,87 @@
+from .abort_condition import AbortSignal
+from .assert_eventually import _get_probe, _make_poller, _report_abort_of_probe, _report_failure_of_probe
+from .poll_schedule import PollSchedule
+from .poller import Poller, PollerAborted, PollerTimeout
+from .probe import Probe
+from .wait_options import WaitOptions
+from collections.abc import Callable
+from threading import Thread
+from typing import Optional, Unpack
+
+class Watch:
+    """
+    A check of a probe running in the background, started by watch.
+    """
+
+    def __init__(self, probe: Probe, poller: Poller, reason: str, stop: AbortSignal):
+        self._probe = probe
+        self._poller = poller
+        self._reason = reason
+        self._stop = stop
+        self._error: Optional[BaseException] = None
+        self._reported = False
+        self._thread = Thread(target=self._run, name="asyncmatch-watch", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "Watch":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is not None:
+            self.close()
+        elif not self._reported:
+            self.result()
+
+    def _run(self) -> None:
+        try:
+            self._poller.check(self._probe)
+        except BaseException as e:
+            self._error = e
+
+    def done(self) -> bool:
+        """
+        Whether the probe has been satisfied, or the watch has ended without
+        it being satisfied.
+        """
+        return not self._thread.is_alive()
+
+    def result(self) -> None:
+        """
+        Waits for the probe to be satisfied, and raises an AssertionError, as
+        assert_eventually would, if it is not satisfied in time.
+        """
+        self._thread.join()
+        self._reported = True
+        if isinstance(self._error, PollerTimeout):
+            _report_failure_of_probe(self._probe, self._reason, AssertionError, self._error.notes)
+        if isinstance(self._error, PollerAborted):
+            _report_abort_of_probe(self._probe, self._reason, self._error)
+        if self._error is not None:
+            raise self._error
+
+    def close(self) -> None:
+        """
+        Stops watching, without reporting whether the probe was satisfied.
+        """
+        self._reported = True
+        self._stop.abort("the watch was closed")
+        self._thread.join()
+
+def watch(probe: Probe | Callable[[], bool], duration: float, poll_delay: float | PollSchedule, reason: Optional[str] = "", **options: Unpack[WaitOptions]) -> Watch:
+    """
+    Starts checking the probe on a background thread, as assert_eventually
+    would, and returns at once, so that the probe is sampled while the test
+    acts. The first satisfying sample is latched: the probe is not sampled
+    again, so a state that appears only briefly during the act is not
+    missed.
+
+    Call result to wait for the outcome, which raises an AssertionError
+    describing the mismatch if the probe was not satisfied in time. As a
+    context manager, the result is checked on leaving the block if it has
+    not been already, unless the block raised an exception, in which case
+    the watch is closed.
+    """
+    probe = _get_probe(probe, options.get("sample_budget"))
+    stop = AbortSignal()
+    poller = _make_poller(probe, duration, poll_delay, {**options, "abort_if": [*options.get("abort_if", ()), stop]})
+    return Watch(probe, poller, reason, stop)
@@ -0,0 +1,305 @@
+"""
+Benchmarks of the overhead and latency of the polling core.
+
+Run from the root of the repository, with no network needed:
+
+    python -m benchmarks.bench_polling --output results.json
+    python -m benchmarks.bench_polling --baseline results.json
+
+Results are written as JSON. Given a baseline, each result is compared with
+it on stderr, and the exit status is 1 if any has regressed by more than the
+tolerance.
+"""
+from asyncmatch import NotifyingProbe, PollScheduler, PollStatistics, VirtualClock, add_observer, remove_observer, assert_eventually_async
+from asyncmatch.callable_probe import CallableProbe
+from asyncmatch.poller import Poller
+from asyncmatch.probe import Probe
+from asyncmatch.timeout import Timeout
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from statistics import median, quantiles
+from threading import Event, Thread
+from time import perf_counter, process_time, sleep
+from typing import Any, Callable, Optional
+import asyncio
+import json
+import platform
+import sys
+
+class FlagProbe(Probe):
+    """
+    Satisfied once the flag is raised.
+    """
+
+    def __init__(self):
+        self.raised = Event()
+        self.raised_at = None
+        self.satisfied = False
+
+    def raise_flag(self) -> None:
+        self.raised_at = perf_counter()
+        self.raised.set()
+
+    def is_satisfied(self) -> bool:
+        return self.satisfied
+
+    def sample(self) -> None:
+        self.satisfied = self.raised.is_set()
+
+    def describe_to(self, description) -> None:
+        description.append_text("flag raised")
+
+    def describe_mismatch(self, description) -> None:
+        description.append_text("flag not raised")
+
+class NotifyingFlagProbe(FlagProbe, NotifyingProbe):
+    """
+    A FlagProbe that notifies the Poller when the flag is raised.
+    """
+
+    def raise_flag(self) -> None:
+        super().raise_flag()
+        self.notify()
+
+class CountdownProbe(Probe):
+    """
+    Satisfied after a given number of samples, for measuring loop overhead.
+    """
+
+    def __init__(self, samples: int):
+        self.remaining = samples
+
+    def is_satisfied(self) -> bool:
+        return self.remaining <= 0
+
+    def sample(self) -> None:
+        self.remaining -= 1
+
+    def describe_to(self, description) -> None:
+        description.append_text("countdown finished")
+
+    def describe_mismatch(self, description) -> None:
+        description.append_text(f"{self.remaining} remaining")
+
+def _summary(latencies: list[float]) -> dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "p50_ms": median(ordered) * 1e3,
+        "p95_ms": (quantiles(ordered, n=20, method="inclusive")[-1] if len(ordered) > 1 else ordered[0]) * 1e3,
+        "max_ms": ordered[-1] * 1e3,
+    }
+
+def bench_loop_overhead(iterations: int) -> dict[str, float]:
+    """
+    The cost of one iteration of Poller.check with no polling delay. The
+    Timeout waits on a VirtualClock, so that the cost of the loop is not
+    swamped by that of calling time.sleep(0).
+    """
+    results = {}
+    for label, observed in (("unobserved", False), ("observed", True)):
+        statistics = PollStatistics()
+        if observed:
+            add_observer(statistics)
+        try:
+            start = perf_counter()
+            Poller(Timeout(60.0, 0.0, clock=VirtualClock())).check(CountdownProbe(iterations))
+            elapsed = perf_counter() - start
+        finally:
+            remove_observer(statistics)
+        results[f"{label}_us_per_iteration"] = elapsed / iterations * 1e6
+
+    flips = iter([False] * iterations + [True])
+    start = perf_counter()
+    Poller(Timeout(60.0, 0.0, clock=VirtualClock())).check(CallableProbe(lambda: next(flips)))
+    results["callable_probe_us_per_iteration"] = (perf_counter() - start) / iterations * 1e6
+    return results
+
+def _detection_latency(make_probe: Callable[[], FlagProbe], poll_delay: float, delay: float) -> float:
+    probe = make_probe()
+    flipper = Thread(target=lambda: (sleep(delay), probe.raise_flag()))
+    flipper.start()
+    Poller(Timeout(60.0, poll_delay)).check(probe)
+    detected_at = perf_counter()
+    flipper.join()
+    return detected_at - probe.raised_at
+
+def bench_detection_latency(repeats: int) -> dict[str, Any]:
+    """
+    The time from a background thread raising a flag to a Poller detecting it.
+    """
+    results = {}
+    for label, make_probe, poll_delay in (
+            ("poll_1ms", FlagProbe, 0.001),
+            ("poll_10ms", FlagProbe, 0.01),
+            ("poll_100ms", FlagProbe, 0.1),
+            ("notify_1s_fallback", NotifyingFlagProbe, 1.0)):
+        # Vary the moment of raising across the polling interval
+        latencies = [_detection_latency(make_probe, poll_delay, 0.005 + (i % 7) * 0.003)
+                     for i in range(repeats)]
+        results[label] = _summary(latencies)
+    return results
+
+def bench_cpu_while_waiting(wait: float) -> dict[str, float]:
+    """
+    The fraction of a CPU used while waiting for a probe that is never satisfied.
+    """
+    results = {}
+    for label, probe, poll_delay in (
+            ("poll_1ms", FlagProbe(), 0.001),
+            ("poll_10ms", FlagProbe(), 0.01),
+            ("notify_1s_fallback", NotifyingFlagProbe(), 1.0)):
+        wall, cpu = perf_counter(), process_time()
+        try:
+            Poller(Timeout(wait, poll_delay)).check(probe)
+        except Exception:
+            pass
+        results[f"{label}_cpu_fraction"] = (process_time() - cpu) / (perf_counter() - wall)
+    return results
+
+def bench_threaded_waiters(counts: list[int], poll_delay: float) -> dict[str, Any]:
+    """
+    Many threads each waiting on its own probe, all raised at once.
+    """
+    results = {}
+    for count in counts:
+        probes = [FlagProbe() for _ in range(count)]
+        detected = [0.0] * count
+
+        def wait(index: int) -> None:
+            Poller(Timeout(60.0, poll_delay)).check(probes[index])
+            detected[index] = perf_counter()
+
+        threads = [Thread(target=wait, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        sleep(0.05)
+        cpu = process_time()
+        for probe in probes:
+            probe.raise_flag()
+        for thread in threads:
+            thread.join()
+        latencies = [d - p.raised_at for d, p in zip(detected, probes)]
+        results[f"n{count}"] = {**_summary(latencies), "cpu_s": process_time() - cpu}
+    return results
+
+def bench_async_waiters(counts: list[int], poll_delay: float) -> dict[str, Any]:
+    """
+    Many coroutines on one event loop each waiting on its own probe.
+    """
+    results = {}
+    for count in counts:
+        probes = [FlagProbe() for _ in range(count)]
+
+        async def scenario() -> list[float]:
+            detected = [0.0] * count
+
+            async def wait(index: int) -> None:
+                await assert_eventually_async(probes[index], 60.0, poll_delay)
+                detected[index] = perf_counter()
+
+            tasks = [asyncio.create_task(wait(i)) for i in range(count)]
+            await asyncio.sleep(0.05)
+            for probe in probes:
+                probe.raise_flag()
+            await asyncio.gather(*tasks)
+            return detected
+
+        cpu = process_time()
+        detected = asyncio.run(scenario())
+        latencies = [d - p.raised_at for d, p in zip(detected, probes)]
+        results[f"n{count}"] = {**_summary(latencies), "cpu_s": process_time() - cpu}
+    return results
+
+def bench_scheduled_waiters(counts: list[int], poll_delay: float) -> dict[str, Any]:
+    """
+    Many waits served by one PollScheduler, each on its own probe.
+    """
+    results = {}
+    for count in counts:
+        probes = [FlagProbe() for _ in range(count)]
+        detected = [0.0] * count
+        with PollScheduler() as scheduler:
+            futures = [scheduler.wait_until(probe, 60.0, poll_delay) for probe in probes]
+            for index, future in enumerate(futures):
+                future.add_done_callback(lambda _, index=index: detected.__setitem__(index, perf_counter()))
+            sleep(0.05)
+            cpu = process_time()
+            for probe in probes:
+                probe.raise_flag()
+            for future in futures:
+                future.result()
+        latencies = [d - p.raised_at for d, p in zip(detected, probes)]
+        results[f"n{count}"] = {**_summary(latencies), "cpu_s": process_time() - cpu}
+    return results
+
+def run(quick: bool) -> dict[str, Any]:
+    return {
+        "loop_overhead": bench_loop_overhead(10_000 if quick else 100_000),
+        "detection_latency": bench_detection_latency(10 if quick else 50),
+        "cpu_while_waiting": bench_cpu_while_waiting(0.2 if quick else 1.0),
+        "threaded_waiters": bench_threaded_waiters([1, 10, 100] if quick else [1, 10, 100, 500], 0.01),
+        "async_waiters": bench_async_waiters([10, 100] if quick else [10, 100, 1000], 0.01),
+        "scheduled_waiters": bench_scheduled_waiters([10, 100] if quick else [10, 100, 1000], 0.01),
+    }
+
+def _flatten(results: dict[str, Any], prefix: str = "") -> dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """
+    Returns the metrics that are worse than the baseline by more than the
+    tolerance. Every metric is a cost, so larger is worse.
+    """
+    current, previous = _flatten(results), _flatten(baseline)
+    regressions = []
+    for metric, value in current.items():
+        reference = previous.get(metric)
+        if reference is None:
+            continue
+        ratio = value / reference if reference else float("inf") if value else 1.0
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  REGRESSED"
+            regressions.append(metric)
+        print(f"{metric:55} {reference:12.4f} {value:12.4f} {ratio:7.2f}x{flag}", file=sys.stderr)
+    return regressions
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = ArgumentParser(prog="python -m benchmarks.bench_polling", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare the results with this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="fractional worsening treated as a regression (default 0.25)")
+    parser.add_argument("--quick", action="store_true", help="fewer iterations, for a smoke test")
+    args = parser.parse_args(argv)
+
+    document = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+        },
+        "results": run(args.quick),
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(document, output, indent=2)
+    else:
+        json.dump(document, sys.stdout, indent=2)
+        print()
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline:
+            regressions = compare(document["results"], json.load(baseline)["results"], args.tolerance)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+from asyncmatch import (
+    AbortCondition,
+    AbortSignal,
+    NotifyingProbe,
+    PollScheduler,
+    WaitAborted,
+    add_abort_condition,
+    remove_abort_condition,
+    assert_consistently,
+    assert_eventually,
+    assert_eventually_async,
+    wait_until,
+)
+from asyncmatch.probe import Probe
+from hamcrest import assert_that, contains_string, equal_to, less_than
+from threading import Timer
+from time import monotonic
+import asyncio
+import pytest
+
+class NeverProbe(Probe):
+    def is_satisfied(self):
+        return False
+    def sample(self):
+        pass
+    def describe_to(self, description):
+        description.append_text("service ready")
+    def describe_mismatch(self, description):
+        description.append_text("service not ready")
+
+class NeverNotifyingProbe(NeverProbe, NotifyingProbe):
+    pass
+
+def service_crashed():
+    return True
+
+class TestAbortCondition:
+    def test_should_not_give_reason_when_not_met(self):
+        assert AbortCondition(lambda: False).reason() is None
+        assert AbortCondition(lambda: None).reason() is None
+
+    def test_should_give_reason_returned_by_predicate(self):
+        assert_that(AbortCondition(lambda: "exit status 139").reason(), equal_to("exit status 139"))
+
+    def test_should_describe_itself_by_predicate_name(self):
+        assert_that(AbortCondition(service_crashed).reason(), equal_to("service_crashed"))
+        assert_that(AbortCondition(service_crashed, "the service crashed").reason(), equal_to("the service crashed"))
+
+    def test_should_reject_predicate_that_is_not_callable(self):
+        with pytest.raises(TypeError):
+            AbortCondition(True)
+
+class TestAbortSignal:
+    def test_should_give_reason_once_aborted_until_reset(self):
+        signal = AbortSignal()
+        assert signal.reason() is None
+        signal.abort("device disconnected")
+        assert_that(signal.reason(), equal_to("device disconnected"))
+        signal.reset()
+        assert signal.reason() is None
+
+class TestAbortingWaits:
+    def test_should_abort_at_once_when_condition_met(self):
+        start = monotonic()
+        with pytest.raises(WaitAborted) as error:
+            assert_eventually(NeverProbe(), 5.0, 0.01, "Service should start", abort_if=[lambda: "exit status 139"])
+        assert_that(monotonic() - start, less_than(1.0))
+        assert_that(error.value.reason, equal_to("exit status 139"))
+        assert_that(str(error.value), contains_string("Service should start\nExpected: service ready"))
+        assert_that(str(error.value), contains_string("note: aborted: exit status 139"))
+
+    def test_should_not_abort_satisfied_wait(self):
+        assert_eventually(lambda: True, 1.0, 0.01, abort_if=[service_crashed])
+
+    def test_should_abort_when_condition_met_later(self):
+        crashed_at = monotonic() + 0.05
+        with pytest.raises(WaitAborted):
+            wait_until(NeverProbe(), 5.0, 0.01, abort_if=[lambda: monotonic() >= crashed_at])
+
+    def test_should_wake_at_once_when_signalled(self):
+        signal = AbortSignal()
+        Timer(0.05, signal.abort, ["device disconnected"]).start()
+        start = monotonic()
+        with pytest.raises(WaitAborted):
+            wait_until(NeverProbe(), 5.0, 2.0, abort_if=[signal])
+        assert_that(monotonic() - start, less_than(1.0))
+
+    def test_should_wake_notifying_probe_at_once_when_signalled(self):
+        signal = AbortSignal()
+        Timer(0.05, signal.abort, ["device disconnected"]).start()
+        start = monotonic()
+        with pytest.raises(WaitAborted):
+            wait_until(NeverNotifyingProbe(), 5.0, 2.0, abort_if=[signal])
+        assert_that(monotonic() - start, less_than(1.0))
+
+    def test_should_abort_every_wait_once_added(self):
+        signal = add_abort_condition(AbortSignal())
+        try:
+            signal.abort("service crashed")
+            with pytest.raises(WaitAborted):
+                wait_until(NeverProbe(), 5.0, 0.01)
+            with pytest.raises(WaitAborted):
+                assert_consistently(lambda: True, 5.0, 0.01)
+        finally:
+            remove_abort_condition(signal)
+        with pytest.raises(AssertionError):
+            assert_eventually(NeverProbe(), 0.02, 0.01)
+
+    def test_should_abort_async_wait(self):
+        signal = AbortSignal()
+
+        async def scenario():
+            asyncio.get_running_loop().call_later(0.05, signal.abort, "device disconnected")
+            await assert_eventually_async(NeverProbe(), 5.0, 2.0, abort_if=[signal])
+
+        start = monotonic()
+        with pytest.raises(WaitAborted):
+            asyncio.run(scenario())
+        assert_that(monotonic() - start, less_than(1.0))
+
+    def test_should_abort_scheduled_wait(self):
+        signal = AbortSignal()
+        Timer(0.05, signal.abort, ["device disconnected"]).start()
+        start = monotonic()
+        with PollScheduler() as scheduler:
+            future = scheduler.wait_until(NeverProbe(), 5.0, 2.0, abort_if=[signal])
+            with pytest.raises(WaitAborted):
+                future.result(timeout=5.0)
+        assert_that(monotonic() - start, less_than(1.0))
+
+    def test_should_stop_watching_signal_once_wait_ends(self):
+        signal = AbortSignal()
+        assert_eventually(lambda: True, 1.0, 0.01, abort_if=[signal])
+        with pytest.raises(AssertionError):
+            assert_eventually(NeverProbe(), 0.02, 0.01, abort_if=[signal])
+        assert_that(signal.notification._callbacks, equal_to([]))
@@ -0,0 +1,107 @@
+from asyncmatch.assert_consistently import assert_consistently, assert_stable_for
+from asyncmatch.notifying_probe import NotifyingProbe
+from asyncmatch.poll_observer import PollObserver, add_observer, remove_observer
+from asyncmatch.probe import Probe
+from hamcrest import assert_that, contains_string, less_than
+from threading import Thread
+from time import monotonic, sleep
+import pytest
+
+class FakeProbe(Probe):
+    def __init__(self, *values):
+        self.values = list(values)
+        self.value = self.values.pop(0)
+    def is_satisfied(self):
+        return self.value
+    def sample(self):
+        if self.values:
+            self.value = self.values.pop(0)
+    def describe_to(self, description):
+        description.append_text("FakeProbe")
+    def describe_mismatch(self, description):
+        description.append_text("FakeProbe mismatch")
+
+class GlitchProbe(NotifyingProbe):
+    """
+    Latches any glitch reported to it between samples.
+    """
+    def __init__(self):
+        self.glitched = False
+    def glitch(self):
+        self.glitched = True
+        self.notify()
+    def is_satisfied(self):
+        return not self.glitched
+    def sample(self):
+        pass
+    def describe_to(self, description):
+        description.append_text("no glitch")
+    def describe_mismatch(self, description):
+        description.append_text("glitched")
+
+class TestAssertConsistently:
+    def test_should_pass_when_probe_remains_satisfied(self):
+        assert_consistently(FakeProbe(True), 0.05, 0.01)
+
+    def test_should_take_the_whole_duration_when_satisfied(self):
+        start = monotonic()
+        assert_consistently(FakeProbe(True), 0.1, 0.01)
+        assert monotonic() - start >= 0.1
+
+    def test_should_fail_as_soon_as_probe_is_not_satisfied(self):
+        start = monotonic()
+        with pytest.raises(AssertionError) as error:
+            assert_consistently(FakeProbe(True, True, False), 5.0, 0.01, "relay stays off")
+
+        assert_that(monotonic() - start, less_than(1.0))
+        assert_that(str(error.value), contains_string("relay stays off"))
+        assert_that(str(error.value), contains_string("but: FakeProbe mismatch"))
+        assert_that(str(error.value), contains_string("note: violated after "))
+
+    def test_should_accept_callable_as_probe(self):
+        with pytest.raises(AssertionError):
+            assert_consistently(lambda: False, 5.0, 0.01)
+
+    def test_should_catch_notified_violation_between_polls(self):
+        probe = GlitchProbe()
+        Thread(target=lambda: (sleep(0.05), probe.glitch())).start()
+        start = monotonic()
+        with pytest.raises(AssertionError):
+            assert_consistently(probe, 5.0, 1.0)
+        assert_that(monotonic() - start, less_than(0.5))
+
+    def test_should_tell_observers_of_violation(self):
+        class Recorder(PollObserver):
+            violations = 0
+            satisfied = 0
+            def on_violation(self, check):
+                self.violations += 1
+            def on_satisfied(self, check, time_remaining):
+                self.satisfied += 1
+
+        recorder = Recorder()
+        add_observer(recorder)
+        try:
+            assert_consistently(FakeProbe(True), 0.02, 0.01)
+            with pytest.raises(AssertionError):
+                assert_consistently(FakeProbe(False), 0.02, 0.01)
+        finally:
+            remove_observer(recorder)
+        assert recorder.violations == 1
+        assert recorder.satisfied == 0
+
+class TestAssertStableFor:
+    def test_should_pass_when_probe_becomes_satisfied_and_stays_so(self):
+        assert_stable_for(FakeProbe(False, False, True), 1.0, 0.05, 0.01)
+
+    def test_should_fail_when_probe_never_satisfied(self):
+        with pytest.raises(AssertionError) as error:
+            assert_stable_for(FakeProbe(False), 0.05, 0.05, 0.01)
+        assert_that(str(error.value), contains_string("but: FakeProbe mismatch"))
+
+    def test_should_fail_as_soon_as_satisfied_probe_bounces(self):
+        start = monotonic()
+        with pytest.raises(AssertionError) as error:
+            assert_stable_for(FakeProbe(False, True, True, False), 1.0, 5.0, 0.01)
+        assert_that(monotonic() - start, less_than(1.0))
+        assert_that(str(error.value), contains_string("note: violated after "))
@@ -1,6 +1,10 @@
 from asyncmatch.assert_eventually import (
     assert_eventually,
     wait_until,
+    assert_all_eventually,
+    assert_any_eventually,
+    wait_until_all,
+    wait_until_any,
     _report_failure_of_probe,
     SynchronisationTimeout
 )
@@ -88,4 +92,41 @@ class TestReportFailureOfProbe:
         probe = FakeProbe(False)
         with pytest.raises(SomeError) as err:
             _report_failure_of_probe(probe, "", SomeError)
-        assert_that(str(err.value), contains_string("     but: FakeProbe mismatch"))
\ No newline at end of file
+        assert_that(str(err.value), contains_string("     but: FakeProbe mismatch"))
+
+class TestMultiProbeWaits:
+    def test_should_pass_when_all_probes_satisfied(self):
+        assert_all_eventually([FakeProbe(True), lambda: True], 5.0, 0.01)
+
+    def test_should_raise_assertion_error_when_any_probe_unsatisfied(self):
+        with pytest.raises(AssertionError) as err:
+            assert_all_eventually([FakeProbe(True), FakeProbe(False)], 0.1, 0.01, "Bespoke reason")
+        assert_that(str(err.value), starts_with("Bespoke reason\nExpected: all of:"))
+        assert_that(str(err.value), contains_string("1 of 2 probes were not satisfied"))
+
+    def test_should_pass_when_any_probe_satisfied(self):
+        assert_any_eventually([FakeProbe(False), FakeProbe(True)], 5.0, 0.01)
+
+    def test_should_raise_assertion_error_when_no_probe_satisfied(self):
+        with pytest.raises(AssertionError):
+            assert_any_eventually([FakeProbe(False), lambda: False], 0.1, 0.01)
+
+    def test_wait_until_all_should_raise_synchronisation_timeout(self):
+        with pytest.raises(SynchronisationTimeout):
+            wait_until_all([FakeProbe(False)], 0.1, 0.01)
+
+    def test_wait_until_any_should_raise_synchronisation_timeout(self):
+        with pytest.raises(SynchronisationTimeout):
+            wait_until_any([FakeProbe(False)], 0.1, 0.01)
+
+    def test_should_append_notes_after_mismatch(self):
+        probe = FakeProbe(False)
+        with pytest.raises(SomeError) as err:
+            _report_failure_of_probe(probe, "", SomeError, ["first", "second"])
+        assert_that(str(err.value), contains_string(
+            "     but: FakeProbe mismatch\n    note: first\n    note: second"))
+
+def test_should_reject_unknown_wait_option():
+    with pytest.raises(TypeError) as err:
+        assert_eventually(lambda: True, 1.0, 0.01, calibrate=False)
+    assert_that(str(err.value), contains_string("calibrate"))
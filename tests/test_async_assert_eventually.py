@@ -0,0 +1,80 @@
+from asyncmatch import (
+    AsyncProbe,
+    assert_eventually_async,
+    wait_until_async,
+    SynchronisationTimeout
+)
+from hamcrest import assert_that, equal_to
+import asyncio
+import pytest
+
+class FakeAsyncProbe(AsyncProbe):
+    def __init__(self, value):
+        self.value = value
+        self.satisfied = None
+    def is_satisfied(self):
+        return self.satisfied
+    async def sample(self):
+        await asyncio.sleep(0)
+        self.satisfied = self.value
+    def describe_to(self, description):
+        description.append_text("FakeAsyncProbe")
+    def describe_mismatch(self, description):
+        description.append_text("FakeAsyncProbe mismatch")
+
+class TestAssertEventuallyAsync:
+    def test_should_not_timeout_when_probe_satisfied_immediately(self):
+        asyncio.run(assert_eventually_async(FakeAsyncProbe(True), 5.0, 0.01))
+
+    def test_should_raise_assertion_error_with_probe_description_when_timed_out(self):
+        with pytest.raises(AssertionError) as err:
+            asyncio.run(assert_eventually_async(FakeAsyncProbe(False), 0.1, 0.01, "Bespoke reason"))
+
+        assert_that(str(err.value),
+            equal_to("Bespoke reason\nExpected: FakeAsyncProbe\n     but: FakeAsyncProbe mismatch"))
+
+    def test_should_accept_coroutine_function_as_probe(self):
+        async def led_is_on():
+            return True
+        asyncio.run(assert_eventually_async(led_is_on, 5.0, 0.01))
+
+    def test_should_describe_coroutine_function_on_failure(self):
+        async def led_is_on():
+            return False
+        with pytest.raises(AssertionError) as err:
+            asyncio.run(assert_eventually_async(led_is_on, 0.1, 0.01))
+
+        assert_that(str(err.value),
+            equal_to("\nExpected: led_is_on to be satisfied\n     but: led_is_on was not satisfied"))
+
+    def test_should_accept_plain_callable_as_probe(self):
+        asyncio.run(assert_eventually_async(lambda: True, 5.0, 0.01))
+
+    def test_should_raise_error_if_not_probe_or_callable(self):
+        with pytest.raises(TypeError):
+            asyncio.run(assert_eventually_async([42], 5.0, 0.01))
+
+    def test_should_not_block_other_coroutines_while_waiting(self):
+        state = {"on": False}
+
+        async def led_is_on():
+            return state["on"]
+
+        async def switch_on():
+            await asyncio.sleep(0.05)
+            state["on"] = True
+
+        async def scenario():
+            await asyncio.gather(
+                assert_eventually_async(led_is_on, 5.0, 0.01),
+                switch_on())
+
+        asyncio.run(scenario())
+
+class TestWaitUntilAsync:
+    def test_should_not_timeout_when_probe_satisfied_immediately(self):
+        asyncio.run(wait_until_async(FakeAsyncProbe(True), 5.0, 0.01))
+
+    def test_should_raise_synchronisation_error_when_timed_out(self):
+        with pytest.raises(SynchronisationTimeout):
+            asyncio.run(wait_until_async(FakeAsyncProbe(False), 0.1, 0.01))
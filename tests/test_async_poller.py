@@ -0,0 +1,81 @@
+from asyncmatch.async_poller import AsyncPoller
+from asyncmatch.async_probe import AsyncProbe
+from asyncmatch.poller import PollerTimeout
+from asyncmatch.timeout import Timeout
+from unittest.mock import Mock, MagicMock, AsyncMock, call
+import asyncio
+import pytest
+
+@pytest.fixture
+def mockery():
+    m = Mock()
+    timeout = MagicMock()
+    probe = MagicMock()
+    m.attach_mock(timeout, 'timeout')
+    m.attach_mock(probe, 'probe')
+    timeout.sleep_async = AsyncMock()
+    yield m
+    m.reset_mock()
+
+class FlagProbe(AsyncProbe):
+    def __init__(self):
+        self.flag = False
+        self.satisfied = False
+        self.samples = 0
+    def is_satisfied(self):
+        return self.satisfied
+    async def sample(self):
+        self.samples += 1
+        self.satisfied = self.flag
+    def describe_to(self, description):
+        description.append_text("flag set")
+    def describe_mismatch(self, description):
+        description.append_text("flag not set")
+
+class TestAsyncPoller:
+    def test_should_not_timeout_when_probe_satisfied_immediately(self, mockery):
+        mockery.probe.is_satisfied.return_value = True
+        asyncio.run(AsyncPoller(mockery.timeout).check(mockery.probe))
+
+        mockery.assert_has_calls([
+            call.probe.is_satisfied()
+        ])
+
+    def test_should_raise_error_when_timed_out(self, mockery):
+        mockery.probe.is_satisfied.return_value = False
+        mockery.timeout.timed_out.return_value = True
+        with pytest.raises(PollerTimeout):
+            asyncio.run(AsyncPoller(mockery.timeout).check(mockery.probe))
+
+    def test_should_sleep_asynchronously_and_resample(self, mockery):
+        mockery.probe.is_satisfied.side_effect = [False, True]
+        mockery.timeout.timed_out.return_value = False
+        asyncio.run(AsyncPoller(mockery.timeout).check(mockery.probe))
+
+        mockery.assert_has_calls([
+            call.probe.is_satisfied(),
+            call.timeout.timed_out(),
+            call.timeout.sleep_async(),
+            call.probe.sample(),
+            call.probe.is_satisfied()
+        ])
+        mockery.timeout.sleep.assert_not_called()
+
+    def test_should_sample_async_probe_before_first_check(self):
+        probe = FlagProbe()
+        probe.flag = True
+        asyncio.run(AsyncPoller(Timeout(5.0, 0.01)).check(probe))
+        assert probe.samples == 1
+
+    def test_should_run_many_checks_concurrently_on_one_loop(self):
+        probes = [FlagProbe() for _ in range(200)]
+
+        async def scenario():
+            checks = [asyncio.create_task(AsyncPoller(Timeout(5.0, 0.01)).check(p)) for p in probes]
+            await asyncio.sleep(0.05)
+            for p in probes:
+                p.flag = True
+            await asyncio.gather(*checks)
+
+        asyncio.run(scenario())
+        assert all(p.is_satisfied() for p in probes)
@@ -0,0 +1,105 @@
+from asyncmatch import RemoteSource, SampleBroker, SampleSource, SourceProbe, assert_eventually
+from hamcrest import assert_that, equal_to, has_entry
+from tempfile import mkdtemp
+from threading import Lock, Thread
+from unittest.mock import MagicMock
+import os
+import pytest
+import shutil
+import socket
+import stat
+import subprocess
+import sys
+
+@pytest.fixture
+def socket_path():
+    # Unix domain socket paths must be short
+    directory = mkdtemp(prefix="am-")
+    yield os.path.join(directory, "broker.sock")
+    shutil.rmtree(directory, ignore_errors=True)
+
+def test_should_serve_snapshot_of_named_source(socket_path):
+    with SampleBroker(socket_path, {"gpios": lambda: {"gpio3": "high"}}):
+        assert_that(RemoteSource(socket_path, "gpios").read(), equal_to({"gpio3": "high"}))
+
+def test_should_make_socket_accessible_only_to_owner(socket_path):
+    with SampleBroker(socket_path, {"gpios": lambda: {}}):
+        assert_that(stat.S_IMODE(os.stat(socket_path).st_mode), equal_to(0o600))
+
+def test_should_leave_only_socket_in_its_directory(socket_path):
+    with SampleBroker(socket_path, {"gpios": lambda: {}}):
+        assert_that(os.listdir(os.path.dirname(socket_path)), equal_to(["broker.sock"]))
+
+def test_should_remove_socket_when_stopped(socket_path):
+    with SampleBroker(socket_path, {"gpios": lambda: {}}):
+        pass
+    assert not os.path.exists(socket_path)
+
+def test_should_sample_at_most_once_per_tick_for_all_clients(socket_path):
+    read = MagicMock(return_value={"gpio3": "high"})
+    with SampleBroker(socket_path, {"gpios": read}, tick=60.0):
+        clients = [RemoteSource(socket_path, "gpios") for _ in range(5)]
+        threads = [Thread(target=client.read) for client in clients]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5.0)
+        for client in clients:
+            client.close()
+    read.assert_called_once()
+
+def test_should_use_sample_source_as_given(socket_path):
+    source = SampleSource(lambda: 42)
+    with SampleBroker(socket_path, {"answer": source}):
+        RemoteSource(socket_path, "answer").read()
+    assert_that(source.version, equal_to(1))
+
+def test_should_raise_error_from_source(socket_path):
+    def read():
+        raise OSError("frame grabber gone")
+    with SampleBroker(socket_path, {"frames": read}):
+        with pytest.raises(OSError):
+            RemoteSource(socket_path, "frames").read()
+
+def test_should_raise_key_error_for_unknown_source(socket_path):
+    with SampleBroker(socket_path, {}):
+        with pytest.raises(KeyError):
+            RemoteSource(socket_path, "gpios").read()
+
+def test_should_raise_error_for_unpicklable_snapshot(socket_path):
+    with SampleBroker(socket_path, {"lock": Lock}):
+        with pytest.raises(RuntimeError):
+            RemoteSource(socket_path, "lock").read()
+
+def test_should_reconnect_to_restarted_broker(socket_path):
+    source = RemoteSource(socket_path, "gpios")
+    with SampleBroker(socket_path, {"gpios": lambda: 1}):
+        source.read()
+    with SampleBroker(socket_path, {"gpios": lambda: 2}):
+        assert_that(source.read(), equal_to(2))
+
+def test_source_probe_should_match_remote_snapshots(socket_path):
+    with SampleBroker(socket_path, {"gpios": lambda: {"gpio3": "high"}}):
+        assert_eventually(SourceProbe(RemoteSource(socket_path, "gpios"), has_entry("gpio3", "high")), 5.0, 0.01)
+
+def accepts_connections(path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(path)
+            return True
+        except OSError:
+            return False
+
+def gpio_sources():
+    return {"gpios": lambda: {"gpio3": "high"}}
+
+def test_should_serve_sources_from_factory_in_separate_process(socket_path):
+    broker = subprocess.Popen(
+        [sys.executable, "-m", "asyncmatch.broker", "--socket", socket_path, "tests.test_broker:gpio_sources"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    try:
+        assert_eventually(lambda: accepts_connections(socket_path), 10.0, 0.01)
+        assert_that(RemoteSource(socket_path, "gpios").read(), equal_to({"gpio3": "high"}))
+    finally:
+        broker.terminate()
+        broker.wait(10.0)
@@ -0,0 +1,139 @@
+from asyncmatch import CalibrationStore, ExponentialBackoff, SystemClock, assert_eventually
+from asyncmatch import calibration
+from asyncmatch.calibration import Observation, recommend
+from asyncmatch.callable_probe import CallableProbe
+from hamcrest import assert_that, equal_to, contains_string, has_length, none, close_to, instance_of
+from inspect import currentframe
+from unittest.mock import patch
+import pytest
+
+@pytest.fixture
+def store(tmp_path):
+    yield CalibrationStore(tmp_path / "calibration.jsonl")
+    calibration.disable()
+
+def led_is_on():
+    return True
+
+def next_line() -> str:
+    """
+    The call site of a wait made on the line after the call.
+    """
+    return f"tests/test_calibration.py:{currentframe().f_back.f_lineno + 1}"
+
+def wait_for_led():
+    assert_eventually(led_is_on, 60.0, 1.0)
+
+WAIT_FOR_LED = f"tests/test_calibration.py:{wait_for_led.__code__.co_firstlineno + 1}"
+
+def observations_starting(store, description):
+    return {probe: observations for probe, observations in store.observations().items() if probe.startswith(description)}
+
+def test_should_not_recommend_with_too_few_observations():
+    assert_that(recommend([Observation(0.1, True)] * 4), none())
+
+def test_should_recommend_duration_with_margin_over_99th_percentile():
+    observations = [Observation(elapsed / 100, True) for elapsed in range(1, 101)]
+    recommendation = recommend(observations, margin=3.0)
+    assert_that(recommendation.p50, close_to(0.5, 1e-9))
+    assert_that(recommendation.p99, close_to(0.99, 1e-9))
+    assert_that(recommendation.duration, close_to(2.97, 1e-9))
+    assert_that(recommendation.initial_poll_delay, close_to(0.05, 1e-9))
+    assert_that(recommendation.max_poll_delay, close_to(0.198, 1e-9))
+    assert_that(recommendation.poll_schedule(), instance_of(ExponentialBackoff))
+
+def test_should_count_timeouts_as_taking_as_long_as_they_waited():
+    observations = [Observation(0.01, True)] * 4 + [Observation(5.0, False)] * 1
+    assert_that(recommend(observations).max, equal_to(5.0))
+
+def test_store_should_read_back_recorded_observations(store):
+    store.record("led on", 0.25, True)
+    store.record("led on", 5.0, False)
+    assert_that(store.observations(), equal_to({
+        "led on": [Observation(0.25, True), Observation(5.0, False)]}))
+
+def test_store_should_be_empty_before_recording(store):
+    assert_that(store.observations(), equal_to({}))
+
+def test_store_should_compact_to_latest_observations(store):
+    for elapsed in range(10):
+        store.record("led on", elapsed, True)
+    store.compact(keep=3)
+    assert_that(store.observations()["led on"], equal_to([
+        Observation(7, True), Observation(8, True), Observation(9, True)]))
+
+def test_should_record_time_to_satisfy_once_enabled(store):
+    calibration.enable(store)
+    site = next_line()
+    assert_eventually(led_is_on, 5.0, 0.01)
+    with pytest.raises(AssertionError):
+        assert_eventually(lambda: False, 0.02, 0.01)
+    observations = store.observations()
+    assert_that(observations[f"led_is_on to be satisfied at {site}"][0].satisfied, equal_to(True))
+    assert_that(observations_starting(store, "<lambda> to be satisfied")
+                .popitem()[1][0].satisfied, equal_to(False))
+
+def test_should_tell_apart_lambdas_waited_for_at_different_sites(store):
+    calibration.enable(store)
+    for _ in range(5):
+        assert_eventually(lambda: True, 5.0, 0.01)
+        with pytest.raises(AssertionError):
+            assert_eventually(lambda: False, 0.02, 0.01)
+    lambdas = observations_starting(store, "<lambda> to be satisfied at ")
+    assert_that(lambdas, has_length(2))
+    assert_that(sorted(len(o) for o in lambdas.values()), equal_to([5, 5]))
+
+def test_should_not_apply_history_of_fast_lambda_to_slow_one(store):
+    calibration.enable(store)
+    for _ in range(5):
+        assert_eventually(lambda: True, 5.0, 0.01)
+    calibration.enable(store, apply=True)
+    with patch("asyncmatch.assert_eventually.Timeout") as timeout:
+        timeout.return_value.time_remaining.return_value = 1.0
+        timeout.return_value.clock = SystemClock()
+        assert_eventually(lambda: True, 180.0, 1.0)
+    assert_that(timeout.call_args.args[:2], equal_to((180.0, 1.0)))
+
+def test_should_not_record_once_disabled(store):
+    calibration.enable(store)
+    calibration.disable()
+    assert_eventually(led_is_on, 5.0, 0.01)
+    assert_that(store.observations(), equal_to({}))
+
+def test_should_apply_recommended_parameters(store):
+    for _ in range(5):
+        store.record(f"led_is_on to be satisfied at {WAIT_FOR_LED}", 0.1, True)
+    calibration.enable(store, apply=True)
+    with patch("asyncmatch.assert_eventually.Timeout") as timeout:
+        timeout.return_value.time_remaining.return_value = 1.0
+        timeout.return_value.clock = SystemClock()
+        wait_for_led()
+    duration, poll_delay = timeout.call_args.args[:2]
+    assert_that(duration, close_to(0.3, 1e-9))
+    assert_that(poll_delay, instance_of(ExponentialBackoff))
+
+def test_should_not_lengthen_given_duration(store):
+    for _ in range(5):
+        store.record("led_is_on to be satisfied at conftest.py:1", 10.0, True)
+    calibration.enable(store, apply=True)
+    duration, _ = calibration.calibrated(CallableProbe(led_is_on), 5.0, 0.1, "conftest.py:1")
+    assert_that(duration, equal_to(5.0))
+
+def test_should_use_given_parameters_for_probe_without_history(store):
+    calibration.enable(store, apply=True)
+    assert_that(calibration.calibrated(CallableProbe(led_is_on), 5.0, 0.1, "conftest.py:1"), equal_to((5.0, 0.1)))
+
+def test_should_not_apply_history_without_call_site(store):
+    for _ in range(5):
+        store.record("led_is_on to be satisfied", 0.1, True)
+    calibration.enable(store, apply=True)
+    assert_that(calibration.calibrated(CallableProbe(led_is_on), 5.0, 0.1), equal_to((5.0, 0.1)))
+
+def test_cli_should_report_recommendations(store, tmp_path, capsys):
+    for _ in range(5):
+        store.record("led on", 0.1, True)
+    store.record("rare", 0.1, True)
+    calibration.main([str(tmp_path / "calibration.jsonl")])
+    output = capsys.readouterr().out
+    assert_that(output, contains_string("led on"))
+    assert_that(output, contains_string("(too few observations)  rare"))
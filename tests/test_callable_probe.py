@@ -1,6 +1,7 @@
-from asyncmatch.callable_probe import CallableProbe
+from asyncmatch.callable_probe import AsyncCallableProbe, CallableProbe
+import asyncio
 import pytest
-from unittest.mock import MagicMock, call
+from unittest.mock import AsyncMock, MagicMock, call
 from hamcrest import assert_that, equal_to
 from hamcrest.core.string_description import StringDescription
 
@@ -129,3 +130,40 @@ def test_should_describe_to_using_closure_name():
     description = StringDescription()
     probe.describe_to(description)
     assert_that(str(description), equal_to("is_satisfied to be satisfied"))
+
+def test_async_callable_probe_should_not_sample_on_construction():
+    is_satisfied = AsyncMock(return_value=True)
+    probe = AsyncCallableProbe(is_satisfied)
+    is_satisfied.assert_not_called()
+    assert_that(not probe.is_satisfied())
+
+def test_async_callable_probe_should_await_underlying_callable_to_sample():
+    is_satisfied = AsyncMock(return_value=True)
+    probe = AsyncCallableProbe(is_satisfied)
+    asyncio.run(probe.sample())
+    is_satisfied.assert_awaited_once()
+    assert_that(probe.is_satisfied())
+
+def test_async_callable_probe_should_describe_to_using_name_of_coroutine_function():
+    async def some_state():
+        return True
+    probe = AsyncCallableProbe(some_state)
+    description = StringDescription()
+    probe.describe_to(description)
+    assert_that(str(description), equal_to("some_state to be satisfied"))
+
+def test_should_always_sample_on_construction_even_if_unchanged():
+    is_satisfied = MagicMock(return_value=True)
+    probe = CallableProbe(is_satisfied, changed=lambda: False)
+    is_satisfied.assert_called_once()
+    assert_that(probe.is_satisfied())
+
+def test_should_skip_sample_while_nothing_has_changed():
+    is_satisfied = MagicMock(side_effect=[False, True])
+    changed = MagicMock(return_value=False)
+    probe = CallableProbe(is_satisfied, changed=changed)
+    probe.sample()
+    assert_that(is_satisfied.call_count, equal_to(1))
+    changed.return_value = True
+    probe.sample()
+    assert_that(probe.is_satisfied())
@@ -0,0 +1,80 @@
+from asyncmatch import ChangeDetectingProbe, SampleSource, SourceProbe, assert_eventually
+from asyncmatch.change_detecting_probe import content_fingerprint
+from hamcrest import assert_that, equal_to, not_, has_item, has_entries
+from unittest.mock import MagicMock
+
+class DeviceTreeProbe(ChangeDetectingProbe):
+    def __init__(self, *trees, changed=None):
+        self.trees = list(trees)
+        self.snapshots = 0
+        self.matched = []
+        self.changed = changed
+        self.sample()
+    def snapshot(self):
+        self.snapshots += 1
+        return self.trees.pop(0) if len(self.trees) > 1 else self.trees[0]
+    def matches(self, snapshot):
+        self.matched.append(snapshot)
+        return has_item(has_entries(vid=0x17ef)).matches(snapshot)
+    def has_changed(self):
+        return self.changed() if self.changed else True
+    def describe_to(self, description):
+        description.append_text("a Lenovo device")
+    def describe_mismatch(self, description):
+        description.append_text(f"was {self.last_snapshot}")
+
+def test_content_fingerprint_should_be_equal_for_equal_snapshots():
+    assert_that(content_fingerprint([{"vid": 1}]), equal_to(content_fingerprint([{"vid": 1}])))
+
+def test_content_fingerprint_should_differ_for_different_snapshots():
+    assert_that(content_fingerprint([{"vid": 1}]), not_(equal_to(content_fingerprint([{"vid": 2}]))))
+
+def test_should_not_be_satisfied_before_sampling():
+    class Unsampled(DeviceTreeProbe):
+        def __init__(self):
+            pass
+    assert not Unsampled().is_satisfied()
+
+def test_should_match_first_snapshot():
+    probe = DeviceTreeProbe([{"vid": 0x17ef}])
+    assert probe.is_satisfied()
+
+def test_should_not_rematch_unchanged_snapshot():
+    probe = DeviceTreeProbe([{"vid": 1}], [{"vid": 1}], [{"vid": 1}])
+    probe.sample()
+    probe.sample()
+    assert_that(probe.snapshots, equal_to(3))
+    assert_that(len(probe.matched), equal_to(1))
+
+def test_should_rematch_changed_snapshot():
+    probe = DeviceTreeProbe([{"vid": 1}], [{"vid": 0x17ef}])
+    probe.sample()
+    assert_that(len(probe.matched), equal_to(2))
+    assert probe.is_satisfied()
+
+def test_should_keep_latest_snapshot_even_if_unchanged():
+    probe = DeviceTreeProbe([{"vid": 1}], [{"vid": 1}])
+    first = probe.last_snapshot
+    probe.sample()
+    assert probe.last_snapshot is not first
+
+def test_should_skip_snapshot_when_nothing_has_changed():
+    changed = MagicMock(return_value=False)
+    probe = DeviceTreeProbe([{"vid": 1}], [{"vid": 0x17ef}], changed=changed)
+    probe.sample()
+    assert_that(probe.snapshots, equal_to(1))
+    changed.return_value = True
+    probe.sample()
+    assert probe.is_satisfied()
+
+def test_should_work_with_assert_eventually():
+    assert_eventually(DeviceTreeProbe([], [], [{"vid": 0x17ef}]), 5.0, 0.001)
+
+def test_source_probe_should_match_each_snapshot_once():
+    matcher = MagicMock()
+    matcher.matches.return_value = False
+    source = SampleSource(lambda: {"gpio3": "low"}, ttl=60.0)
+    probe = SourceProbe(source, matcher)
+    probe.sample()
+    probe.sample()
+    matcher.matches.assert_called_once()
@@ -0,0 +1,184 @@
+from asyncmatch import CalibrationStore, NotifyingProbe, PollObserver, PollScheduler, VirtualClock, add_observer, assert_eventually, assert_eventually_async, assert_consistently, calibration, remove_observer, wait_until
+from asyncmatch.clock import SystemClock
+from asyncmatch.notification import Notification
+from hamcrest import assert_that, contains_string, equal_to, less_than
+from time import monotonic
+from unittest.mock import patch
+import asyncio
+import pytest
+
+class Led:
+    def __init__(self):
+        self.on = False
+    def switch_on(self):
+        self.on = True
+
+class LedProbe(NotifyingProbe):
+    def __init__(self, led):
+        self.led = led
+        self.on = led.on
+    def is_satisfied(self):
+        return self.on
+    def sample(self):
+        self.on = self.led.on
+    def describe_to(self, description):
+        description.append_text("LED on")
+    def describe_mismatch(self, description):
+        description.append_text("LED off")
+
+class TestSystemClock:
+    def test_should_sleep(self):
+        with patch("asyncmatch.clock.sleep") as sleep:
+            SystemClock().sleep(0.42)
+            sleep.assert_called_once_with(0.42)
+
+    def test_should_sleep_asynchronously(self):
+        with patch("asyncmatch.clock.async_sleep") as async_sleep:
+            asyncio.run(SystemClock().sleep_async(0.42))
+            async_sleep.assert_awaited_once_with(0.42)
+
+    def test_should_wait_on_notification(self):
+        notification = Notification()
+        notification.set()
+        assert SystemClock().wait(notification, 5.0)
+
+class TestVirtualClock:
+    def test_should_start_at_given_time(self):
+        assert_that(VirtualClock(100.0).now(), equal_to(100.0))
+
+    def test_should_advance_instantly(self):
+        clock = VirtualClock()
+        start = monotonic()
+        clock.sleep(3600.0)
+        assert_that(clock.now(), equal_to(3600.0))
+        assert_that(monotonic() - start, less_than(0.1))
+
+    def test_should_call_back_in_order_at_scheduled_times(self):
+        clock = VirtualClock()
+        calls = []
+        clock.call_at(2.0, lambda: calls.append(("b", clock.now())))
+        clock.call_later(1.0, lambda: calls.append(("a", clock.now())))
+        clock.call_at(2.0, lambda: calls.append(("c", clock.now())))
+        clock.call_at(5.0, lambda: calls.append(("d", clock.now())))
+        clock.advance(3.0)
+        assert_that(calls, equal_to([("a", 1.0), ("b", 2.0), ("c", 2.0)]))
+        assert_that(clock.now(), equal_to(3.0))
+
+    def test_should_end_wait_when_callback_notifies(self):
+        clock = VirtualClock()
+        notification = Notification()
+        clock.call_later(0.3, notification.set)
+        assert clock.wait(notification, 1.0)
+        assert_that(clock.now(), equal_to(0.3))
+
+    def test_should_wait_out_delay_without_notification(self):
+        clock = VirtualClock()
+        assert not clock.wait(Notification(), 1.0)
+        assert_that(clock.now(), equal_to(1.0))
+
+class TestWaitingInVirtualTime:
+    def test_should_be_satisfied_by_scripted_change(self):
+        clock = VirtualClock()
+        led = Led()
+        clock.call_at(42.0, led.switch_on)
+        start = monotonic()
+        assert_eventually(lambda: led.on, 60.0, 0.5, clock=clock)
+        assert_that(monotonic() - start, less_than(1.0))
+        assert_that(clock.now(), equal_to(42.0))
+
+    def test_should_time_out_in_virtual_time(self):
+        clock = VirtualClock()
+        start = monotonic()
+        with pytest.raises(AssertionError):
+            assert_eventually(lambda: False, 600.0, 0.1, clock=clock)
+        assert_that(monotonic() - start, less_than(1.0))
+        assert_that(clock.now(), equal_to(pytest.approx(600.0)))
+
+    def test_should_wake_notifying_probe_when_notified_by_callback(self):
+        clock = VirtualClock()
+        led = Led()
+        probe = LedProbe(led)
+        clock.call_at(1.25, lambda: (led.switch_on(), probe.notify()))
+        wait_until(probe, 60.0, 10.0, clock=clock)
+        assert_that(clock.now(), equal_to(1.25))
+
+    def test_should_report_violation_in_virtual_time(self):
+        clock = VirtualClock()
+        led = Led()
+        clock.call_at(1.5, led.switch_on)
+        with pytest.raises(AssertionError) as error:
+            assert_consistently(lambda: not led.on, 10.0, 1.0, clock=clock)
+        assert_that(str(error.value), contains_string("violated after 2.000s"))
+
+    def test_should_wait_asynchronously(self):
+        clock = VirtualClock()
+        led = Led()
+        clock.call_at(30.0, led.switch_on)
+        asyncio.run(assert_eventually_async(lambda: led.on, 60.0, 1.0, clock=clock))
+        assert_that(clock.now(), equal_to(30.0))
+
+class ElapsedObserver(PollObserver):
+    def __init__(self):
+        self.elapsed = []
+    def on_satisfied(self, check, time_remaining):
+        self.elapsed.append(check.elapsed())
+    def on_timeout(self, check):
+        self.elapsed.append(check.elapsed())
+
+@pytest.fixture
+def observer():
+    observer = ElapsedObserver()
+    add_observer(observer)
+    yield observer
+    remove_observer(observer)
+
+class TestObservingInVirtualTime:
+    def test_should_time_check_by_virtual_clock(self, observer):
+        clock = VirtualClock()
+        led = Led()
+        clock.call_at(42.0, led.switch_on)
+        assert_eventually(lambda: led.on, 60.0, 0.5, clock=clock)
+        assert_that(observer.elapsed, equal_to([42.0]))
+
+    def test_should_calibrate_in_virtual_time(self, tmp_path):
+        store = CalibrationStore(tmp_path / "calibration.jsonl")
+        try:
+            calibration.enable(store)
+            for apply in (False,) * 5 + (True,):
+                if apply:
+                    calibration.enable(store, apply=True)
+                clock = VirtualClock()
+                led = Led()
+                clock.call_at(42.0, led.switch_on)
+                assert_eventually(lambda: led.on, 60.0, 0.5, clock=clock)
+        finally:
+            calibration.disable()
+
+class TestSchedulingInVirtualTime:
+    def test_should_be_satisfied_by_scripted_change(self):
+        clock = VirtualClock()
+        led = Led()
+        clock.call_at(42.0, led.switch_on)
+        start = monotonic()
+        with PollScheduler(clock=clock) as scheduler:
+            scheduler.assert_eventually(lambda: led.on, 60.0, 0.5).result(timeout=5.0)
+        assert_that(monotonic() - start, less_than(1.0))
+        assert_that(clock.now(), equal_to(42.0))
+
+    def test_should_time_out_in_virtual_time(self):
+        clock = VirtualClock()
+        start = monotonic()
+        with PollScheduler(clock=clock) as scheduler:
+            future = scheduler.assert_eventually(lambda: False, 600.0, 0.1)
+            with pytest.raises(AssertionError):
+                future.result(timeout=5.0)
+        assert_that(monotonic() - start, less_than(5.0))
+        assert_that(clock.now(), equal_to(pytest.approx(600.0)))
+
+    def test_should_time_observed_check_by_virtual_clock(self, observer):
+        clock = VirtualClock()
+        led = Led()
+        clock.call_at(42.0, led.switch_on)
+        with PollScheduler(clock=clock) as scheduler:
+            scheduler.assert_eventually(lambda: led.on, 60.0, 0.5).result(timeout=5.0)
+        assert_that(observer.elapsed, equal_to([42.0]))
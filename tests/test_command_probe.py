@@ -0,0 +1,92 @@
+from asyncmatch import CommandProbe, CommandStreamProbe, Shell, assert_eventually
+from hamcrest import assert_that, contains_string, equal_to, has_item, less_than
+from time import monotonic, sleep
+import pytest
+import sys
+
+@pytest.fixture
+def shell():
+    with Shell() as shell:
+        yield shell
+
+def lines(output):
+    return output.decode().splitlines()
+
+class TestShell:
+    def test_should_return_output_and_exit_status(self, shell):
+        assert_that(shell.run("echo hello"), equal_to((0, b"hello\n")))
+        assert_that(shell.run("printf partial; false"), equal_to((1, b"partial")))
+
+    def test_should_run_commands_in_the_same_process(self, shell):
+        assert_that(shell.run("echo $$"), equal_to(shell.run("echo $$")))
+
+    def test_should_not_let_commands_read_its_input(self, shell):
+        assert_that(shell.run("cat"), equal_to((0, b"")))
+        assert_that(shell.run("echo still here"), equal_to((0, b"still here\n")))
+
+class TestCommandProbe:
+    def test_should_match_parsed_output(self):
+        probe = CommandProbe([sys.executable, "-c", "print('a'); print('b')"], has_item("b"), lines)
+        assert probe.is_satisfied()
+
+    def test_should_match_decoded_output_by_default(self, tmp_path):
+        state = tmp_path / "state"
+        state.write_text("off")
+        probe = CommandProbe(f"cat {state}", equal_to("off"))
+        assert probe.is_satisfied()
+        state.write_text("on")
+        probe.sample()
+        assert not probe.is_satisfied()
+
+    def test_should_only_parse_changed_output(self, shell, tmp_path):
+        state = tmp_path / "state"
+        state.write_text("off")
+        parsed = []
+        probe = CommandProbe(f"cat {state}", equal_to("on"), lambda output: parsed.append(output) or output.decode(), shell=shell)
+        probe.sample()
+        probe.sample()
+        state.write_text("on")
+        probe.sample()
+        assert probe.is_satisfied()
+        assert_that(parsed, equal_to([b"off", b"on"]))
+
+    def test_should_not_run_command_more_often_than_min_interval(self, shell):
+        runs = []
+        shell_run = shell.run
+        shell.run = lambda command: runs.append(command) or shell_run(command)
+        probe = CommandProbe("echo", equal_to("\n"), min_interval=0.1, shell=shell)
+        probe.sample()
+        probe.sample()
+        assert len(runs) == 1
+        sleep(0.1)
+        probe.sample()
+        assert len(runs) == 2
+
+    def test_should_require_shell_command_to_be_string(self, shell):
+        with pytest.raises(TypeError):
+            CommandProbe(["echo"], equal_to(""), shell=shell)
+
+    def test_should_describe_mismatch_with_exit_status(self, shell):
+        probe = CommandProbe("echo nope; false", contains_string("yes"), shell=shell)
+        with pytest.raises(AssertionError) as error:
+            assert_eventually(probe, 0.05, 0.01)
+        assert_that(str(error.value), contains_string("Expected: output of `echo nope; false` matching a string containing 'yes'"))
+        assert_that(str(error.value), contains_string("(exit status 1)"))
+
+class TestCommandStreamProbe:
+    def test_should_match_lines_written_by_command(self):
+        with CommandStreamProbe("echo add; echo bind; sleep 10", contains_string("add"), equal_to("bind")) as probe:
+            assert_eventually(probe, 5.0, 0.01)
+            assert_that(probe.matched, equal_to(["add", "bind"]))
+
+    def test_should_wake_poller_for_each_line(self):
+        with CommandStreamProbe("sleep 0.1; echo ready; sleep 10", equal_to("ready")) as probe:
+            start = monotonic()
+            assert_eventually(probe, 5.0, 2.0)
+            assert_that(monotonic() - start, less_than(1.0))
+
+    def test_should_stop_command_when_closed(self):
+        start = monotonic()
+        with CommandStreamProbe("sleep 10", equal_to("never")):
+            pass
+        assert_that(monotonic() - start, less_than(1.0))
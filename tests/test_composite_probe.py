@@ -0,0 +1,105 @@
+from asyncmatch.composite_probe import AllOfProbe, AnyOfProbe
+from asyncmatch.probe import Probe
+from hamcrest import assert_that, equal_to, contains_string
+from hamcrest.core.string_description import StringDescription
+from threading import Barrier
+import pytest
+
+class ScriptedProbe(Probe):
+    def __init__(self, name, *results):
+        self.name = name
+        self.results = list(results)
+        self.satisfied = self.results.pop(0)
+        self.samples = 0
+    def is_satisfied(self):
+        return self.satisfied
+    def sample(self):
+        self.samples += 1
+        result = self.results.pop(0) if self.results else self.satisfied
+        if isinstance(result, Exception):
+            raise result
+        self.satisfied = result
+    def describe_to(self, description):
+        description.append_text(f"{self.name} on")
+    def describe_mismatch(self, description):
+        description.append_text(f"{self.name} was off")
+
+def describe_mismatch(probe):
+    description = StringDescription()
+    probe.describe_mismatch(description)
+    return str(description)
+
+class TestAllOfProbe:
+    def test_should_require_at_least_one_probe(self):
+        with pytest.raises(ValueError):
+            AllOfProbe([])
+
+    def test_should_be_satisfied_once_every_probe_has_been_satisfied(self):
+        with AllOfProbe([ScriptedProbe("red", False, True), ScriptedProbe("green", False, False, True)]) as probe:
+            assert not probe.is_satisfied()
+            probe.sample()
+            assert not probe.is_satisfied()
+            probe.sample()
+            assert probe.is_satisfied()
+
+    def test_should_not_resample_satisfied_probes(self):
+        red = ScriptedProbe("red", True)
+        with AllOfProbe([red, ScriptedProbe("green", False)]) as probe:
+            probe.sample()
+        assert_that(red.samples, equal_to(0))
+
+    def test_should_sample_probes_concurrently(self):
+        barrier = Barrier(3, timeout=5.0)
+
+        class RendezvousProbe(ScriptedProbe):
+            def sample(self):
+                barrier.wait()
+                super().sample()
+
+        probes = [RendezvousProbe(str(i), False, True) for i in range(3)]
+        with AllOfProbe(probes) as probe:
+            probe.sample()
+            assert probe.is_satisfied()
+
+    def test_should_raise_at_once_if_a_probe_fails_to_sample(self):
+        with AllOfProbe([ScriptedProbe("red", False, OSError("gone"))]) as probe:
+            with pytest.raises(OSError):
+                probe.sample()
+
+    def test_should_describe_every_probe(self):
+        probe = AllOfProbe([ScriptedProbe("red", False), ScriptedProbe("green", False)])
+        description = StringDescription()
+        probe.describe_to(description)
+        assert_that(str(description), equal_to("all of:\n          red on\n          green on"))
+
+    def test_should_describe_mismatch_of_each_unsatisfied_probe(self):
+        probe = AllOfProbe([ScriptedProbe("red", True), ScriptedProbe("green", False)])
+        assert_that(describe_mismatch(probe), equal_to(
+            "1 of 2 probes were not satisfied\n          green on: green was off"))
+
+class TestAnyOfProbe:
+    def test_should_be_satisfied_when_any_probe_is_satisfied(self):
+        with AnyOfProbe([ScriptedProbe("red", False, False), ScriptedProbe("green", False, True)]) as probe:
+            assert not probe.is_satisfied()
+            probe.sample()
+            assert probe.is_satisfied()
+
+    def test_should_stop_sampling_probe_that_fails_to_sample(self):
+        red = ScriptedProbe("red", False, OSError("gone"))
+        with AnyOfProbe([red, ScriptedProbe("green", False)]) as probe:
+            probe.sample()
+            probe.sample()
+        assert_that(red.samples, equal_to(1))
+        assert_that(describe_mismatch(probe), contains_string("red on: raised OSError('gone')"))
+
+    def test_should_raise_when_every_probe_has_failed_to_sample(self):
+        with AnyOfProbe([ScriptedProbe("red", False, OSError("gone"))]) as probe:
+            with pytest.raises(OSError):
+                probe.sample()
+
+    def test_should_describe_mismatch_of_each_probe(self):
+        probe = AnyOfProbe([ScriptedProbe("red", False), ScriptedProbe("green", False)])
+        assert_that(describe_mismatch(probe), equal_to(
+            "none of 2 probes were satisfied\n"
+            "          red on: red was off\n"
+            "          green on: green was off"))
@@ -0,0 +1,137 @@
+import pytest
+np = pytest.importorskip("numpy")
+
+from asyncmatch import assert_eventually
+from asyncmatch.frame_probe import FrameProbe, has_colour, has_mean_between, resembles
+from hamcrest import assert_that, contains_string, equal_to, is_not, same_instance
+from hamcrest.core.string_description import StringDescription
+
+GREEN = (0, 255, 0)
+
+def frame(colour=(0, 0, 0), width=64, height=48):
+    return np.full((height, width, 3), colour, dtype=np.uint8)
+
+def mismatch(matcher, item):
+    description = StringDescription()
+    matcher.describe_mismatch(item, description)
+    return str(description)
+
+class Grabber:
+    """
+    A fake frame grabber, showing a frame that a test can change.
+    """
+    def __init__(self, shown):
+        self.shown = shown
+        self.given = []
+
+    def grab(self, out):
+        self.given.append(out)
+        if out is None:
+            return self.shown.copy()
+        out[...] = self.shown
+        return out
+
+def test_should_match_colour_of_whole_frame():
+    assert_that(frame(GREEN), has_colour(GREEN))
+    assert_that(frame((0, 250, 0)), is_not(has_colour(GREEN)))
+
+def test_should_match_colour_within_tolerance_without_wrapping():
+    assert_that(frame((0, 250, 5)), has_colour(GREEN, tolerance=5))
+    assert_that(frame((250, 255, 0)), is_not(has_colour(GREEN, tolerance=5)))
+
+def test_should_match_fractional_colour_within_tolerance():
+    assert_that(frame((200, 200, 200)), has_colour((200, 200, 199.6), tolerance=1))
+    assert_that(frame((200, 200, 201)), is_not(has_colour((200, 200, 199.6), tolerance=1)))
+
+def test_should_match_colour_of_region_only():
+    image = frame()
+    image[10:20, 30:40] = GREEN
+    assert_that(image, has_colour(GREEN, region=(30, 10, 10, 10)))
+    assert_that(image, is_not(has_colour(GREEN, region=(29, 10, 10, 10))))
+
+def test_should_reject_pixel_missed_by_downsampling():
+    image = frame(GREEN)
+    image[1, 1] = (0, 0, 0)
+    assert_that(image, is_not(has_colour(GREEN, downsample=4)))
+
+def test_should_not_match_region_outside_frame():
+    matcher = has_colour(GREEN, region=(60, 0, 10, 10))
+    assert_that(frame(GREEN), is_not(matcher))
+    assert_that(mismatch(matcher, frame(GREEN)), equal_to("was a frame of 64x48, without the frame region of 10x10 at (60, 0)"))
+
+def test_should_match_greyscale_frame():
+    image = np.full((48, 64), 200, dtype=np.uint8)
+    assert_that(image, has_colour(210, tolerance=10))
+    assert_that(image, has_mean_between(150, 255))
+
+def test_should_not_match_colour_with_more_channels_than_greyscale_frame():
+    image = np.full((48, 64), 100, dtype=np.uint8)
+    matcher = has_colour((100,))
+    assert_that(image, is_not(matcher))
+    assert_that(mismatch(matcher, image), equal_to("the frame was greyscale, but the colour has 1 channel(s)"))
+
+def test_should_not_match_colour_with_fewer_channels_than_frame():
+    image = np.zeros((48, 64, 4), dtype=np.uint8)
+    matcher = has_colour((0, 0, 0), region=(0, 0, 8, 8))
+    assert_that(image, is_not(matcher))
+    assert_that(mismatch(matcher, image), equal_to("the frame region of 8x8 at (0, 0) had 4 channel(s), but the colour has 3 channel(s)"))
+
+def test_should_describe_colour_mismatch_with_region_statistics():
+    image = frame(GREEN)
+    image[:, :16] = (0, 0, 0)
+    matcher = has_colour(GREEN, tolerance=8, region=(0, 0, 32, 48))
+    assert_that(str(StringDescription().append_description_of(matcher)), equal_to("a frame region of 32x48 at (0, 0) of colour (0, 255, 0) within 8"))
+    assert_that(mismatch(matcher, image), equal_to(
+        "the frame region of 32x48 at (0, 0) had mean (0, 127.5, 0), min (0, 0, 0), max (0, 255, 0), "
+        "differing by up to 255 and by 127.5 on average, with 50.0% of pixels within 8"))
+
+def test_should_match_mean_between_bounds():
+    image = frame((100, 200, 0))
+    assert_that(image, has_mean_between(90, 110))
+    matcher = has_mean_between(120, 255)
+    assert_that(image, is_not(matcher))
+    assert_that(mismatch(matcher, image), equal_to("the frame had mean (100, 200, 0), min (100, 200, 0), max (100, 200, 0)"))
+
+def test_should_match_resemblance_to_reference():
+    rng = np.random.default_rng(1)
+    reference = rng.integers(0, 256, (48, 64, 3), dtype=np.uint8)
+    noisy = np.clip(reference.astype(int) + rng.integers(-3, 4, reference.shape), 0, 255).astype(np.uint8)
+    assert_that(noisy, resembles(reference, tolerance=3))
+    assert_that(noisy, is_not(resembles(reference, tolerance=1)))
+
+def test_should_match_resemblance_to_float_reference():
+    reference = frame(GREEN).astype(float) + 0.4
+    assert_that(frame(GREEN), resembles(reference, tolerance=0.5))
+    assert_that(frame(GREEN), is_not(resembles(reference, tolerance=0.3)))
+    assert_that(mismatch(resembles(reference, tolerance=0.3), frame(GREEN)), contains_string("differing by up to 0.4"))
+
+def test_should_match_resemblance_of_region():
+    reference = frame(GREEN, 10, 10)
+    image = frame()
+    image[5:15, 20:30] = GREEN
+    assert_that(image, resembles(reference, region=(20, 5, 10, 10)))
+    assert_that(mismatch(resembles(reference), image), contains_string("had shape (48, 64, 3), not the reference's (10, 10, 3)"))
+
+def test_should_reuse_frame_buffer_between_samples():
+    grabber = Grabber(frame())
+    probe = FrameProbe(grabber.grab, has_colour(GREEN))
+    first = probe.frame
+    probe.sample()
+    assert_that(grabber.given[0], equal_to(None))
+    assert_that(grabber.given[1], same_instance(first))
+    assert_that(probe.frame, same_instance(first))
+
+def test_should_be_satisfied_when_frame_changes():
+    grabber = Grabber(frame())
+    probe = FrameProbe(grabber.grab, has_colour(GREEN))
+    assert not probe.is_satisfied()
+    grabber.shown = frame(GREEN)
+    probe.sample()
+    assert probe.is_satisfied()
+
+def test_should_describe_mismatch_of_last_frame():
+    probe = FrameProbe(Grabber(frame()).grab, has_colour(GREEN))
+    with pytest.raises(AssertionError) as error:
+        assert_eventually(probe, 0.05, 0.01, "The splash screen should be shown")
+    assert_that(str(error.value), contains_string("Expected: a frame of colour (0, 255, 0)"))
+    assert_that(str(error.value), contains_string("but: the frame had mean (0, 0, 0)"))
@@ -0,0 +1,186 @@
+from asyncmatch import HttpConnectionPool, HttpProbe, assert_eventually
+from hamcrest import assert_that, contains_string, equal_to, has_entries
+from http.client import HTTPConnection
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+import socket
+import json
+import pytest
+
+class Resource:
+    """
+    The state served by the stand-in server, and what the server saw.
+    """
+    def __init__(self):
+        self.status = 200
+        self.version = 1
+        self.body = {"state": "booting"}
+        self.raw = None
+        self.etag = True
+        self.drop_connections = False
+        self.requests = 0
+        self.not_modified = 0
+        self.connections = set()
+
+    def update(self, **body):
+        self.body = body
+        self.raw = None
+        self.version += 1
+
+    def serve_raw(self, raw):
+        self.raw = raw
+        self.version += 1
+
+def make_handler(resource):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            resource.requests += 1
+            resource.connections.add(self.client_address)
+            etag = f'"v{resource.version}"'
+            if resource.status != 200:
+                self._send(resource.status, b"unavailable")
+            elif resource.etag and self.headers.get("If-None-Match") == etag:
+                resource.not_modified += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+            else:
+                body = resource.raw if resource.raw is not None else json.dumps(resource.body).encode()
+                self._send(200, body, etag if resource.etag else None)
+
+        def _send(self, status, body, etag=None):
+            self.send_response(status)
+            if etag is not None:
+                self.send_header("ETag", etag)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            # Hang up without saying so, as a server timing out idle connections does
+            self.close_connection = resource.drop_connections
+
+        def log_message(self, *args):
+            pass
+    return Handler
+
+@pytest.fixture
+def resource():
+    return Resource()
+
+@pytest.fixture
+def url(resource):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(resource))
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, args=(0.01,), daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/status"
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def pool():
+    with HttpConnectionPool() as pool:
+        yield pool
+
+def test_should_match_parsed_json_body(url, pool):
+    probe = HttpProbe(url, has_entries(state="booting"), pool=pool)
+    assert probe.is_satisfied()
+
+def test_should_see_changed_resource(url, resource, pool):
+    probe = HttpProbe(url, has_entries(state="ready"), pool=pool)
+    assert not probe.is_satisfied()
+    resource.update(state="ready")
+    probe.sample()
+    assert probe.is_satisfied()
+
+def test_should_make_conditional_requests_for_unchanged_resource(url, resource, pool):
+    probe = HttpProbe(url, has_entries(state="ready"), pool=pool)
+    for _ in range(3):
+        probe.sample()
+    assert_that(resource.requests, equal_to(4))
+    assert_that(resource.not_modified, equal_to(3))
+
+def test_should_only_parse_changed_body(url, resource, pool):
+    parsed = []
+    def parse(body):
+        parsed.append(body)
+        return json.loads(body)
+    probe = HttpProbe(url, has_entries(state="ready"), parse, pool=pool)
+    probe.sample()
+    resource.etag = False
+    probe.sample()
+    probe.sample()
+    resource.update(state="ready")
+    probe.sample()
+    assert_that(len(parsed), equal_to(2))
+    assert probe.is_satisfied()
+
+def test_should_keep_connection_alive(url, resource, pool):
+    probe = HttpProbe(url, has_entries(state="ready"), pool=pool)
+    for _ in range(5):
+        probe.sample()
+    assert_that(len(resource.connections), equal_to(1))
+
+def test_should_reconnect_when_server_closes_idle_connection(url, resource, pool):
+    resource.drop_connections = True
+    probe = HttpProbe(url, has_entries(state="ready"), pool=pool)
+    resource.update(state="ready")
+    probe.sample()
+    assert probe.is_satisfied()
+    assert_that(len(resource.connections), equal_to(2))
+
+def test_should_describe_mismatch_of_body(url, pool):
+    probe = HttpProbe(url, has_entries(state="ready"), pool=pool)
+    with pytest.raises(AssertionError) as error:
+        assert_eventually(probe, 0.05, 0.01)
+    assert_that(str(error.value), contains_string(f"Expected: GET {url} returning a dictionary containing {{'state': 'ready'}}"))
+    assert_that(str(error.value), contains_string("but: value for 'state' was 'booting'"))
+
+def test_should_not_be_satisfied_by_error_status(url, resource, pool):
+    resource.status = 503
+    probe = HttpProbe(url, has_entries(state="booting"), pool=pool)
+    with pytest.raises(AssertionError) as error:
+        assert_eventually(probe, 0.05, 0.01)
+    assert_that(str(error.value), contains_string("but: the response was 503 Service Unavailable"))
+
+def test_should_not_be_satisfied_until_service_listens(pool):
+    probe = HttpProbe("http://127.0.0.1:1/status", has_entries(state="ready"), pool=pool)
+    assert not probe.is_satisfied()
+    with pytest.raises(AssertionError) as error:
+        assert_eventually(probe, 0.05, 0.01)
+    assert_that(str(error.value), contains_string("but: the request failed with ConnectionRefusedError"))
+
+def test_should_reject_url_that_is_not_http(pool):
+    with pytest.raises(ValueError):
+        pool.request("GET", "ftp://example.com/")
+
+def test_should_not_be_satisfied_by_body_that_cannot_be_parsed(url, resource, pool):
+    resource.serve_raw(b"<html>Starting...</html>")
+    probe = HttpProbe(url, has_entries(state="ready"), pool=pool)
+    with pytest.raises(AssertionError) as error:
+        assert_eventually(probe, 0.05, 0.01)
+    assert_that(str(error.value), contains_string("but: the body b'<html>Starting...</html>' could not be parsed: Expecting value"))
+    resource.update(state="ready")
+    probe.sample()
+    assert probe.is_satisfied()
+
+def test_should_not_be_satisfied_by_empty_body(url, resource, pool):
+    resource.serve_raw(b"")
+    assert not HttpProbe(url, has_entries(state="ready"), pool=pool).is_satisfied()
+
+def test_should_close_connection_when_request_times_out(mocker):
+    close = mocker.spy(HTTPConnection, "close")
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        def accept_and_never_respond():
+            connection, _ = server.accept()
+            with connection:
+                while connection.recv(4096):
+                    pass
+        Thread(target=accept_and_never_respond, daemon=True).start()
+        with HttpConnectionPool(timeout=0.1) as pool:
+            with pytest.raises(TimeoutError):
+                pool.request("GET", f"http://127.0.0.1:{server.getsockname()[1]}/status")
+            assert_that(close.call_count, equal_to(1))
+            assert_that(pool._idle, equal_to({}))
@@ -7,6 +7,7 @@ from asyncmatch import (
 from asyncmatch.timeout import Timeout
 from asyncmatch.poller import Poller, PollerTimeout
 from threading import Thread, Event
+from time import monotonic
 from hamcrest import (
     greater_than,
     less_than,
@@ -125,4 +126,18 @@ def test_timeout_of_assert_eventually_with_callable_as_probe(counting_thread):
         assert_eventually(led_is_on, 0.1, 0.01, "Bespoke reason")
 
     assert_that(str(err.value),
-        equal_to("Bespoke reason\nExpected: led_is_on to be satisfied\n     but: led_is_on was not satisfied"))
\ No newline at end of file
+        equal_to("Bespoke reason\nExpected: led_is_on to be satisfied\n     but: led_is_on was not satisfied"))
+
+def test_should_take_final_sample_at_deadline():
+    sample_times = []
+
+    def led_is_on() -> bool:
+        sample_times.append(monotonic())
+        return False
+
+    start = monotonic()
+    with pytest.raises(AssertionError):
+        assert_eventually(led_is_on, 0.25, 0.2)
+
+    assert_that(sample_times[-1] - start, greater_than(0.24))
+    assert_that(monotonic() - start, less_than(0.35))
\ No newline at end of file
@@ -0,0 +1,138 @@
+from asyncmatch import LogFileProbe, assert_eventually
+from asyncmatch.log_file_probe import _FileTail
+from hamcrest import assert_that, contains_string, equal_to, less_than
+from threading import Thread, enumerate as threads
+from time import monotonic, sleep
+import gc
+import os
+import pytest
+
+def write(path, text):
+    with open(path, "a") as log:
+        log.write(text)
+
+@pytest.fixture
+def log(tmp_path):
+    path = tmp_path / "service.log"
+    write(path, "starting\n")
+    return path
+
+class TestLogFileProbe:
+    def test_should_match_lines_written_after_creation(self, log):
+        with LogFileProbe(log, contains_string("ready")) as probe:
+            write(log, "loading\nready on port 80\n")
+            probe.sample()
+            assert probe.is_satisfied()
+            assert_that(probe.matched, equal_to(["ready on port 80"]))
+
+    def test_should_ignore_lines_written_before_creation(self, log):
+        with LogFileProbe(log, contains_string("starting")) as probe:
+            probe.sample()
+            assert not probe.is_satisfied()
+
+    def test_should_match_lines_written_before_creation_from_start(self, log):
+        with LogFileProbe(log, contains_string("starting"), from_start=True) as probe:
+            probe.sample()
+            assert probe.is_satisfied()
+
+    def test_should_not_match_incomplete_line_until_it_is_finished(self, log):
+        with LogFileProbe(log, equal_to("ready")) as probe:
+            write(log, "rea")
+            probe.sample()
+            assert not probe.is_satisfied()
+            write(log, "dy\r\n")
+            probe.sample()
+            assert probe.is_satisfied()
+
+    def test_should_match_lines_in_order(self, log):
+        with LogFileProbe(log, contains_string("B"), contains_string("A")) as probe:
+            write(log, "A\nB\n")
+            probe.sample()
+            assert not probe.is_satisfied()
+            write(log, "A\n")
+            probe.sample()
+            assert probe.is_satisfied()
+
+    def test_should_follow_rotated_log(self, log):
+        with LogFileProbe(log, contains_string("after rotation")) as probe:
+            write(log, "before rotation\n")
+            os.rename(log, log.with_suffix(".log.1"))
+            write(log, "after rotation\n")
+            probe.sample()
+            assert_that(probe.matched, equal_to(["after rotation"]))
+
+    def test_should_read_rest_of_old_log_after_rotation(self, log):
+        with LogFileProbe(log, contains_string("last words"), contains_string("new")) as probe:
+            write(log, "last words\n")
+            os.rename(log, log.with_suffix(".log.1"))
+            write(log, "new\n")
+            probe.sample()
+            assert probe.is_satisfied()
+
+    def test_should_start_from_beginning_of_truncated_log(self, log):
+        with LogFileProbe(log, contains_string("fresh")) as probe:
+            write(log, "a long line that will be truncated\n")
+            probe.sample()
+            with open(log, "w") as truncated:
+                truncated.write("fresh\n")
+            probe.sample()
+            assert probe.is_satisfied()
+
+    def test_should_wait_for_log_to_be_created(self, tmp_path):
+        path = tmp_path / "later.log"
+        with LogFileProbe(path, contains_string("hello")) as probe:
+            probe.sample()
+            write(path, "hello\n")
+            probe.sample()
+            assert probe.is_satisfied()
+
+    def test_should_read_only_appended_bytes(self, log):
+        write(log, "x" * 1000 + "\n")
+        with LogFileProbe(log, contains_string("never")) as probe:
+            chunks = []
+            read_chunk = probe._tail._read_chunk
+            probe._tail._read_chunk = lambda: chunks.append(read_chunk()) or chunks[-1]
+            write(log, "one\n")
+            probe.sample()
+            assert_that(b"".join(chunks), equal_to(b"one\n"))
+
+    def test_should_describe_itself_and_mismatch(self, log):
+        with LogFileProbe(log, contains_string("ready")) as probe:
+            write(log, "loading\n")
+            probe.sample()
+            with pytest.raises(AssertionError) as error:
+                assert_eventually(probe, 0.05, 0.01)
+        assert_that(str(error.value), contains_string("a line matching a string containing 'ready' in "))
+        assert_that(str(error.value), contains_string("1 line(s) were received"))
+
+    def test_should_wake_poller_when_log_written(self, log):
+        with LogFileProbe(log, contains_string("ready")) as probe:
+            if not probe.watching:
+                pytest.skip("inotify is not available")
+            Thread(target=lambda: (sleep(0.05), write(log, "ready\n"))).start()
+            start = monotonic()
+            assert_eventually(probe, 5.0, 2.0)
+            assert_that(monotonic() - start, less_than(1.0))
+
+    def test_should_stop_watching_when_collected_without_closing(self, log):
+        watchers = lambda: [t for t in threads() if t.name == "asyncmatch-inotify"]
+        before, fds = watchers(), len(os.listdir("/proc/self/fd"))
+        probe = LogFileProbe(log, contains_string("ready"))
+        if not probe.watching:
+            pytest.skip("inotify is not available")
+        with pytest.raises(AssertionError):
+            assert_eventually(probe, 0.05, 0.01)
+        del probe
+        gc.collect()
+        assert_that(watchers(), equal_to(before))
+        assert_that(len(os.listdir("/proc/self/fd")), equal_to(fds))
+
+class TestFileTail:
+    def test_should_read_line_longer_than_chunk(self, log, mocker):
+        mocker.patch("asyncmatch.log_file_probe._CHUNK_SIZE", 4)
+        tail = _FileTail(log, from_start=False)
+        write(log, "a long line\nshort\n")
+        assert_that(tail.read_lines(), equal_to([b"a long line"]))
+        assert_that(tail.read_lines(), equal_to([b"short"]))
+        assert_that(tail.read_lines(), equal_to([]))
+        tail.close()
@@ -0,0 +1,82 @@
+from asyncmatch import NotifyingProbe, assert_eventually, assert_eventually_async
+from asyncmatch.notification import Notification
+from asyncmatch.poller import Poller
+from asyncmatch.timeout import Timeout
+from threading import Timer
+from time import monotonic
+import asyncio
+
+class Mailbox(NotifyingProbe):
+    def __init__(self):
+        self.delivered = []
+        self.received = []
+        self.sample()
+    def on_message(self, message):
+        self.delivered.append(message)
+        self.notify()
+    def is_satisfied(self):
+        return len(self.received) > 0
+    def sample(self):
+        self.received = list(self.delivered)
+    def describe_to(self, description):
+        description.append_text("a message")
+    def describe_mismatch(self, description):
+        description.append_text("no message")
+
+class TestNotification:
+    def test_should_report_not_notified_after_timeout(self):
+        assert not Notification().wait(0.01)
+
+    def test_should_return_immediately_if_already_set(self):
+        notification = Notification()
+        notification.set()
+        assert notification.wait(5.0)
+
+    def test_should_clear_once_waited_on(self):
+        notification = Notification()
+        notification.set()
+        notification.wait(5.0)
+        assert not notification.wait(0.01)
+
+    def test_should_wake_coroutine_when_set_from_another_thread(self):
+        notification = Notification()
+
+        async def scenario():
+            Timer(0.05, notification.set).start()
+            start = monotonic()
+            notified = await notification.wait_async(5.0)
+            return notified, monotonic() - start
+
+        notified, elapsed = asyncio.run(scenario())
+        assert notified
+        assert elapsed < 1.0
+
+    def test_should_report_not_notified_to_coroutine_after_timeout(self):
+        assert not asyncio.run(Notification().wait_async(0.01))
+
+class TestNotifyingProbe:
+    def test_should_wake_poller_before_poll_delay_when_notified(self):
+        mailbox = Mailbox()
+        Timer(0.05, mailbox.on_message, ["hello"]).start()
+        start = monotonic()
+        Poller(Timeout(10.0, 5.0)).check(mailbox)
+        assert monotonic() - start < 1.0
+
+    def test_should_wake_assert_eventually_when_notified(self):
+        mailbox = Mailbox()
+        Timer(0.05, mailbox.on_message, ["hello"]).start()
+        start = monotonic()
+        assert_eventually(mailbox, 10.0, 5.0)
+        assert monotonic() - start < 1.0
+
+    def test_should_wake_assert_eventually_async_when_notified(self):
+        mailbox = Mailbox()
+        Timer(0.05, mailbox.on_message, ["hello"]).start()
+        start = monotonic()
+        asyncio.run(assert_eventually_async(mailbox, 10.0, 5.0))
+        assert monotonic() - start < 1.0
+
+    def test_should_fall_back_to_polling_when_not_notified(self):
+        mailbox = Mailbox()
+        Timer(0.05, mailbox.delivered.append, ["hello"]).start()
+        assert_eventually(mailbox, 5.0, 0.01)
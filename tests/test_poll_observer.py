@@ -0,0 +1,69 @@
+from asyncmatch import add_observer, remove_observer, assert_eventually, assert_eventually_async
+from asyncmatch.poll_observer import PollObserver, observe
+from asyncmatch.poller import Poller, PollerTimeout
+from asyncmatch.timeout import Timeout
+from hamcrest import assert_that, equal_to, contains_exactly, greater_than, none
+from unittest.mock import MagicMock
+import asyncio
+import pytest
+
+class RecordingObserver(PollObserver):
+    def __init__(self):
+        self.events = []
+    def on_start(self, check):
+        self.events.append(("start", check.description))
+    def on_sample(self, check, start, duration):
+        self.events.append(("sample", check.samples))
+    def on_check(self, check, satisfied, start, duration):
+        self.events.append(("check", satisfied))
+    def on_satisfied(self, check, time_remaining):
+        self.events.append(("satisfied", check.samples))
+    def on_timeout(self, check):
+        self.events.append(("timeout", check.samples))
+
+@pytest.fixture
+def observer():
+    observer = RecordingObserver()
+    add_observer(observer)
+    yield observer
+    remove_observer(observer)
+
+def test_should_not_observe_without_observers():
+    assert_that(observe(MagicMock(), ()), none())
+
+def test_should_report_events_of_satisfied_check(observer):
+    samples = iter([False, True])
+
+    def led_is_on():
+        return next(samples)
+
+    assert_eventually(led_is_on, 5.0, 0.001)
+    assert_that(observer.events, contains_exactly(
+        ("start", "led_is_on to be satisfied"),
+        ("check", False),
+        ("sample", 1),
+        ("check", True),
+        ("satisfied", 1)))
+
+def test_should_report_timeout(observer):
+    with pytest.raises(AssertionError):
+        assert_eventually(lambda: False, 0.05, 0.01)
+    assert_that(observer.events[-1][0], equal_to("timeout"))
+    assert_that(observer.events[-1][1], greater_than(0))
+
+def test_should_report_events_of_async_check(observer):
+    asyncio.run(assert_eventually_async(lambda: True, 5.0, 0.01))
+    assert_that([event[0] for event in observer.events], contains_exactly("start", "check", "satisfied"))
+
+def test_should_report_to_observers_given_to_poller():
+    observer = RecordingObserver()
+    with pytest.raises(PollerTimeout):
+        Poller(Timeout(0.02, 0.01), observers=[observer]).check(MagicMock(**{"is_satisfied.return_value": False}))
+    assert_that(observer.events[-1][0], equal_to("timeout"))
+
+def test_should_stop_reporting_once_removed():
+    observer = RecordingObserver()
+    add_observer(observer)
+    remove_observer(observer)
+    assert_eventually(lambda: True, 5.0, 0.01)
+    assert_that(observer.events, equal_to([]))
@@ -0,0 +1,87 @@
+from asyncmatch import (
+    FixedDelay,
+    ExponentialBackoff,
+    DecorrelatedJitter,
+    FastStart,
+    assert_eventually
+)
+from asyncmatch.clock import VirtualClock
+from asyncmatch.poll_schedule import as_poll_schedule
+from asyncmatch.timeout import Timeout
+from hamcrest import assert_that, equal_to, contains_exactly, same_instance, instance_of, only_contains, all_of, greater_than_or_equal_to, less_than_or_equal_to
+from itertools import islice
+from random import Random
+import pytest
+
+def first(n, schedule):
+    return list(islice(schedule.delays(), n))
+
+def test_fixed_delay_should_repeat_delay():
+    assert_that(first(3, FixedDelay(0.1)), contains_exactly(0.1, 0.1, 0.1))
+
+def test_exponential_backoff_should_multiply_delay_up_to_maximum():
+    assert_that(first(6, ExponentialBackoff(0.01, 0.1)),
+        contains_exactly(0.01, 0.02, 0.04, 0.08, 0.1, 0.1))
+
+def test_exponential_backoff_should_use_factor():
+    assert_that(first(3, ExponentialBackoff(1.0, 100.0, factor=3.0)),
+        contains_exactly(1.0, 3.0, 9.0))
+
+def test_exponential_backoff_should_reject_factor_less_than_one():
+    with pytest.raises(ValueError):
+        ExponentialBackoff(0.1, 1.0, factor=0.5)
+
+def test_exponential_backoff_should_reject_non_positive_delays():
+    with pytest.raises(ValueError):
+        ExponentialBackoff(0.0, 1.0)
+
+def test_decorrelated_jitter_should_stay_between_base_and_maximum():
+    delays = first(100, DecorrelatedJitter(0.01, 0.5, Random(42)))
+    assert_that(delays, only_contains(all_of(
+        greater_than_or_equal_to(0.01),
+        less_than_or_equal_to(0.5))))
+
+def test_decorrelated_jitter_should_be_reproducible_with_seeded_rng():
+    assert_that(first(10, DecorrelatedJitter(0.01, 0.5, Random(1))),
+        equal_to(first(10, DecorrelatedJitter(0.01, 0.5, Random(1)))))
+
+def test_fast_start_should_poll_quickly_for_period_then_follow_schedule():
+    elapsed = iter([0.0, 0.01, 0.02, 0.03])
+    schedule = FastStart(0.01, 0.03, then=FixedDelay(1.0))
+    delays = list(islice(schedule.delays_for(lambda: next(elapsed)), 5))
+    assert_that(delays, contains_exactly(0.01, 0.01, 0.01, 1.0, 1.0))
+
+def test_each_wait_should_get_a_fresh_sequence_of_delays():
+    schedule = ExponentialBackoff(0.01, 1.0)
+    first(3, schedule)
+    assert_that(first(1, schedule), contains_exactly(0.01))
+
+def test_should_convert_number_to_fixed_delay():
+    assert_that(as_poll_schedule(0.1), instance_of(FixedDelay))
+
+def test_should_not_convert_poll_schedule():
+    schedule = FixedDelay(0.1)
+    assert_that(as_poll_schedule(schedule), same_instance(schedule))
+
+def test_timeout_should_sleep_according_to_schedule():
+    clock = VirtualClock()
+    timeout = Timeout(10.0, ExponentialBackoff(0.1, 0.3), clock=clock)
+    times = []
+    for _ in range(3):
+        timeout.sleep()
+        times.append(clock.now())
+    assert_that(times, contains_exactly(pytest.approx(0.1), pytest.approx(0.3), pytest.approx(0.6)))
+
+def test_timeout_should_end_fast_start_after_period_of_slow_samples():
+    clock = VirtualClock()
+    timeout = Timeout(60.0, FastStart(0.01, 0.5, then=FixedDelay(1.0)), clock=clock)
+    delays = []
+    for _ in range(3):
+        delays.append(timeout.next_sleep())
+        # Each sample takes 0.3 seconds
+        clock.sleep(delays[-1] + 0.3)
+    assert_that(delays, contains_exactly(0.01, 0.01, 1.0))
+
+def test_assert_eventually_should_accept_poll_schedule():
+    samples = iter([False, False, True])
+    assert_eventually(lambda: next(samples), 5.0, ExponentialBackoff(0.001, 0.01))
@@ -0,0 +1,125 @@
+from asyncmatch import NotifyingProbe, PollScheduler, SynchronisationTimeout, SystemClock, VirtualClock
+from asyncmatch.probe import Probe
+from concurrent.futures import CancelledError, wait
+from hamcrest import assert_that, contains_string, less_than, less_than_or_equal_to
+from threading import Timer, active_count
+from time import monotonic, sleep
+import pytest
+
+class FlagProbe(Probe):
+    def __init__(self, satisfied_after=0):
+        self.samples = 0
+        self.satisfied_after = satisfied_after
+    def is_satisfied(self):
+        return self.samples >= self.satisfied_after
+    def sample(self):
+        self.samples += 1
+    def describe_to(self, description):
+        description.append_text("FlagProbe")
+    def describe_mismatch(self, description):
+        description.append_text(f"sampled {self.samples} time(s)")
+
+class NotifyingFlagProbe(NotifyingProbe):
+    def __init__(self):
+        self.flag = False
+        self.satisfied = False
+    def set(self):
+        self.flag = True
+        self.notify()
+    def is_satisfied(self):
+        return self.satisfied
+    def sample(self):
+        self.satisfied = self.flag
+    def describe_to(self, description):
+        description.append_text("flag set")
+    def describe_mismatch(self, description):
+        description.append_text("flag not set")
+
+@pytest.fixture
+def scheduler():
+    with PollScheduler(workers=2) as scheduler:
+        yield scheduler
+
+def test_should_resolve_future_when_probe_satisfied(scheduler):
+    probe = FlagProbe(satisfied_after=3)
+    scheduler.assert_eventually(probe, 5.0, 0.01).result(timeout=5.0)
+    assert probe.samples == 3
+
+def test_should_not_sample_probe_satisfied_immediately(scheduler):
+    probe = FlagProbe()
+    scheduler.wait_until(probe, 5.0, 0.01).result(timeout=5.0)
+    assert probe.samples == 0
+
+def test_should_fail_future_with_assertion_error_on_timeout(scheduler):
+    future = scheduler.assert_eventually(FlagProbe(satisfied_after=1000), 0.05, 0.01, "Not ready")
+    with pytest.raises(AssertionError) as error:
+        future.result(timeout=5.0)
+    assert_that(str(error.value), contains_string("Not ready\nExpected: FlagProbe"))
+
+def test_should_fail_future_with_synchronisation_timeout_from_wait_until(scheduler):
+    future = scheduler.wait_until(FlagProbe(satisfied_after=1000), 0.05, 0.01)
+    with pytest.raises(SynchronisationTimeout):
+        future.result(timeout=5.0)
+
+def test_should_fail_future_with_exception_raised_by_probe(scheduler):
+    def broken():
+        raise ValueError("broken")
+    with pytest.raises(ValueError):
+        scheduler.wait_until(broken, 5.0, 0.01).result(timeout=5.0)
+
+def test_should_accept_callable_as_probe(scheduler):
+    scheduler.wait_until(lambda: True, 5.0, 0.01).result(timeout=5.0)
+
+def test_should_poll_notifying_probe_as_soon_as_notified(scheduler):
+    probe = NotifyingFlagProbe()
+    Timer(0.05, probe.set).start()
+    start = monotonic()
+    scheduler.wait_until(probe, 5.0, 2.0).result(timeout=5.0)
+    assert_that(monotonic() - start, less_than(1.0))
+
+def test_should_serve_many_waits_with_a_fixed_number_of_threads(scheduler):
+    threads = active_count()
+    probes = [FlagProbe(satisfied_after=5) for _ in range(1000)]
+    futures = [scheduler.wait_until(probe, 10.0, 0.01) for probe in probes]
+    assert_that(active_count(), less_than_or_equal_to(threads + 2))
+    done, not_done = wait(futures, timeout=10.0)
+    assert not not_done
+    for future in done:
+        future.result()
+
+def test_should_cancel_pending_waits_when_closed():
+    scheduler = PollScheduler()
+    future = scheduler.wait_until(FlagProbe(satisfied_after=1000), 10.0, 1.0)
+    scheduler.close()
+    with pytest.raises(CancelledError):
+        future.result(timeout=1.0)
+
+def test_should_not_accept_waits_once_closed():
+    scheduler = PollScheduler()
+    scheduler.close()
+    with pytest.raises(RuntimeError):
+        scheduler.wait_until(FlagProbe(), 1.0, 0.1)
+
+def test_should_not_accept_clock_of_its_own_for_a_wait(scheduler):
+    with pytest.raises(TypeError):
+        scheduler.assert_eventually(FlagProbe(), 1.0, 0.1, clock=SystemClock())
+
+def test_should_stop_polling_wait_whose_future_is_cancelled():
+    with PollScheduler(workers=1) as scheduler:
+        probe = FlagProbe(satisfied_after=1000)
+        future = scheduler.wait_until(probe, 0.2, 0.01)
+        sleep(0.05)
+        assert future.cancel()
+        sleep(0.05)
+        samples = probe.samples
+        sleep(0.2)
+        assert_that(probe.samples, less_than_or_equal_to(samples + 1))
+        scheduler.wait_until(FlagProbe(satisfied_after=3), 5.0, 0.01).result(timeout=5.0)
+
+def test_should_serve_later_waits_after_future_is_cancelled_in_virtual_time():
+    clock = VirtualClock()
+    with PollScheduler(workers=1, clock=clock) as scheduler:
+        future = scheduler.wait_until(FlagProbe(satisfied_after=1000), 2.0, 1.0)
+        later = scheduler.wait_until(FlagProbe(satisfied_after=10), 60.0, 1.0)
+        assert future.cancel()
+        later.result(timeout=3.0)
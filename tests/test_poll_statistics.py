@@ -0,0 +1,60 @@
+from asyncmatch import PollStatistics, add_observer, remove_observer, assert_eventually
+from asyncmatch.poll_statistics import Histogram
+from hamcrest import assert_that, equal_to, has_entries, contains_string, close_to, less_than_or_equal_to
+import json
+import pytest
+
+@pytest.fixture
+def statistics():
+    statistics = PollStatistics()
+    add_observer(statistics)
+    yield statistics
+    remove_observer(statistics)
+
+def test_histogram_should_count_durations():
+    histogram = Histogram()
+    for duration in [0.001, 0.002, 0.5]:
+        histogram.record(duration)
+    assert_that(histogram.as_dict(), has_entries(count=3, max=0.5, mean=close_to(0.1677, 0.001)))
+
+def test_histogram_percentile_should_bound_duration():
+    histogram = Histogram()
+    for _ in range(99):
+        histogram.record(0.001)
+    histogram.record(2.0)
+    assert_that(histogram.percentile(50), close_to(0.001, 0.0008))
+    assert_that(histogram.percentile(100), equal_to(2.0))
+
+def test_histogram_percentile_should_not_exceed_max():
+    histogram = Histogram()
+    histogram.record(0.0011)
+    assert_that(histogram.percentile(99), less_than_or_equal_to(0.0011))
+
+def test_should_aggregate_checks_per_probe_description(statistics):
+    def led_is_on():
+        return True
+
+    assert_eventually(led_is_on, 5.0, 0.01)
+    assert_eventually(led_is_on, 5.0, 0.01)
+    with pytest.raises(AssertionError):
+        assert_eventually(lambda: False, 0.05, 0.01)
+
+    probes = statistics.as_dict()
+    assert_that(probes["led_is_on to be satisfied"], has_entries(checks=2, satisfied=2, timed_out=0))
+    assert_that(probes["<lambda> to be satisfied"], has_entries(checks=1, satisfied=0, timed_out=1))
+
+def test_should_count_samples_and_their_latency(statistics):
+    samples = iter([False, False, True])
+    assert_eventually(lambda: next(samples), 5.0, 0.001)
+    probe = statistics.probes()["<lambda> to be satisfied"]
+    assert_that(probe.samples, equal_to(2))
+    assert_that(probe.sample_latency.count, equal_to(2))
+    assert_that(probe.check_latency.count, equal_to(3))
+
+def test_should_be_serialisable_as_json(statistics):
+    assert_eventually(lambda: True, 5.0, 0.01)
+    json.dumps(statistics.as_dict())
+
+def test_should_report_table_of_probes(statistics):
+    assert_eventually(lambda: True, 5.0, 0.01)
+    assert_that(statistics.report(), contains_string("<lambda> to be satisfied"))
@@ -0,0 +1,93 @@
+from asyncmatch import PollScheduler, PollTracer, VirtualClock, add_observer, remove_observer, assert_eventually, assert_consistently
+from hamcrest import assert_that, contains_inanyorder, equal_to, has_entries, has_item, only_contains
+from time import monotonic, perf_counter
+import json
+import pytest
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "trace.json"
+
+@pytest.fixture
+def tracer(path):
+    tracer = PollTracer(path)
+    add_observer(tracer)
+    yield tracer
+    remove_observer(tracer)
+    tracer.close()
+
+def after(seconds):
+    start = monotonic()
+    def led_is_on():
+        return monotonic() - start >= seconds
+    return led_is_on
+
+def events(path, phase):
+    return [event for event in json.loads(path.read_text()) if event["ph"] == phase]
+
+def test_should_write_valid_trace_with_no_events(path):
+    PollTracer(path).close()
+    assert_that(events(path, "X"), equal_to([]))
+
+def test_should_trace_each_wait_as_an_async_span(tracer, path):
+    assert_eventually(after(0.02), 1.0, 0.01)
+    with pytest.raises(AssertionError):
+        assert_eventually(lambda: False, 0.02, 0.01)
+    tracer.close()
+
+    begins = events(path, "b")
+    assert_that(begins, contains_inanyorder(
+        has_entries(name="led_is_on to be satisfied", cat="wait", args=has_entries(outcome="satisfied")),
+        has_entries(name="<lambda> to be satisfied", cat="wait", args=has_entries(outcome="timed out"))))
+    ends = events(path, "e")
+    assert_that(sorted(e["id"] for e in ends), equal_to(sorted(b["id"] for b in begins)))
+    for begin in begins:
+        end = next(e for e in ends if e["id"] == begin["id"])
+        assert end["ts"] >= begin["ts"]
+
+def test_should_trace_each_sample_and_check(tracer, path):
+    assert_eventually(after(0.02), 1.0, 0.01)
+    tracer.close()
+
+    spans = events(path, "X")
+    assert_that(spans, has_item(has_entries(name="sample", args=has_entries(probe="led_is_on to be satisfied"))))
+    assert_that(spans, has_item(has_entries(name="is_satisfied", args=has_entries(satisfied=True))))
+    assert_that([span["dur"] >= 0 for span in spans], only_contains(True))
+
+def test_should_trace_violation(tracer, path):
+    with pytest.raises(AssertionError):
+        assert_consistently(lambda: False, 1.0, 0.01)
+    tracer.close()
+    assert_that(events(path, "b"), has_item(has_entries(args=has_entries(outcome="violated"))))
+
+def test_should_trace_scheduled_waits(tracer, path):
+    with PollScheduler() as scheduler:
+        scheduler.wait_until(after(0.02), 1.0, 0.01).result()
+    tracer.close()
+    assert_that(events(path, "b"), has_item(has_entries(name="led_is_on to be satisfied")))
+
+def test_should_leave_out_waits_in_virtual_time(tracer, path):
+    with pytest.raises(AssertionError):
+        assert_eventually(lambda: False, 60.0, 1.0, clock=VirtualClock())
+    tracer.close()
+    assert_that(events(path, "b"), equal_to([]))
+    assert_that(events(path, "X"), equal_to([]))
+
+def test_should_add_other_spans(tracer, path):
+    start = perf_counter()
+    tracer.add_span("act", start, start + 0.5)
+    tracer.close()
+    assert_that(events(path, "X"), has_item(has_entries(name="act", cat="test", dur=500000.0)))
+
+def test_should_flush_when_buffer_full(path):
+    tracer = PollTracer(path, buffer_size=2)
+    tracer.add_span("one", 0.0, 1.0)
+    assert "one" in path.read_text()
+    tracer.close()
+
+def test_should_discard_events_after_close(path):
+    tracer = PollTracer(path)
+    tracer.close()
+    tracer.add_span("late", 0.0, 1.0)
+    tracer.close()
+    assert_that(events(path, "X"), equal_to([]))
@@ -1,4 +1,5 @@
-from asyncmatch.poller import Poller, PollerTimeout
+from asyncmatch.notifying_probe import NotifyingProbe
+from asyncmatch.poller import Poller, PollerTimeout, PollerViolation
 from unittest.mock import Mock, MagicMock, call
 import pytest
 
@@ -6,6 +7,7 @@ import pytest
 def mockery():
     m = Mock()
     timeout = MagicMock()
+    timeout.clock.now.return_value = 0.0
     probe = MagicMock()
     m.attach_mock(timeout, 'timeout')
     m.attach_mock(probe, 'probe')
@@ -55,4 +57,52 @@ class TestPoller:
         mockery.timeout.timed_out.return_value = False
         poller = Poller(mockery.timeout)
         with pytest.raises(TypeError):
-            poller.check(mockery.probe)
\ No newline at end of file
+            poller.check(mockery.probe)
+
+class TestPollerWithNotifyingProbe:
+    def test_should_wait_on_probe_notification_instead_of_sleeping(self, mockery):
+        probe = MagicMock(spec=NotifyingProbe)
+        probe.is_satisfied.side_effect = [False, True]
+        mockery.timeout.timed_out.return_value = False
+        poller = Poller(mockery.timeout)
+        poller.check(probe)
+
+        mockery.timeout.wait.assert_called_once_with(probe.notification)
+        mockery.timeout.sleep.assert_not_called()
+
+
+class TestPollerCheckConsistently:
+    def test_should_return_when_probe_remains_satisfied_until_timeout(self, mockery):
+        mockery.probe.is_satisfied.return_value = True
+        mockery.timeout.timed_out.side_effect = [False, True]
+        poller = Poller(mockery.timeout)
+        poller.check_consistently(mockery.probe)
+
+        mockery.assert_has_calls([
+            call.probe.is_satisfied(),
+            call.timeout.timed_out(),
+            call.timeout.sleep(),
+            call.probe.sample(),
+            call.probe.is_satisfied(),
+            call.timeout.timed_out()
+        ])
+
+    def test_should_raise_violation_as_soon_as_probe_not_satisfied(self, mockery):
+        mockery.probe.is_satisfied.side_effect = [True, False]
+        mockery.timeout.timed_out.return_value = False
+        poller = Poller(mockery.timeout)
+        with pytest.raises(PollerViolation) as violation:
+            poller.check_consistently(mockery.probe)
+
+        assert mockery.probe.is_satisfied.call_count == 2
+        assert violation.value.notes[0].startswith("violated after ")
+
+    def test_should_wait_on_notification_of_notifying_probe(self, mockery):
+        probe = MagicMock(spec=NotifyingProbe)
+        probe.is_satisfied.side_effect = [True, False]
+        mockery.timeout.timed_out.return_value = False
+        poller = Poller(mockery.timeout)
+        with pytest.raises(PollerViolation):
+            poller.check_consistently(probe)
+
+        mockery.timeout.wait.assert_called_once_with(probe.notification)
@@ -0,0 +1,102 @@
+from hamcrest import assert_that, contains_string, has_entries, has_item, not_
+import json
+import pytest
+
+pytest_plugins = ["pytester"]
+
+@pytest.fixture
+def run(pytester):
+    def run(source, *args, ini=None):
+        if ini is not None:
+            pytester.makeini(ini)
+        pytester.makepyfile(source)
+        return pytester.runpytest("-p", "asyncmatch.pytest_plugin", *args)
+    return run
+
+PROBES = """
+    from time import monotonic
+    import pytest
+
+    def after(seconds):
+        start = monotonic()
+        def led_is_on():
+            return monotonic() - start >= seconds
+        return led_is_on
+"""
+
+def test_fixtures_should_use_default_timing(run):
+    result = run(PROBES + """
+    def test_timing(asyncmatch_timing):
+        assert asyncmatch_timing == (5.0, 0.1)
+    """)
+    result.assert_outcomes(passed=1)
+
+def test_fixtures_should_use_ini_timing(run):
+    result = run(PROBES + """
+    def test_timing(asyncmatch_timing):
+        assert asyncmatch_timing == (2.0, 0.05)
+    """, ini="[pytest]\nasyncmatch_duration = 2.0\nasyncmatch_poll_delay = 0.05\n")
+    result.assert_outcomes(passed=1)
+
+def test_command_line_should_override_ini_timing(run):
+    result = run(PROBES + """
+    def test_timing(asyncmatch_timing):
+        assert asyncmatch_timing == (3.0, 0.05)
+    """, "--asyncmatch-duration=3.0", ini="[pytest]\nasyncmatch_duration = 2.0\nasyncmatch_poll_delay = 0.05\n")
+    result.assert_outcomes(passed=1)
+
+def test_marker_should_override_timing(run):
+    result = run(PROBES + """
+    @pytest.mark.asyncmatch(duration=180.0)
+    def test_timing(asyncmatch_timing):
+        assert asyncmatch_timing == (180.0, 0.1)
+    """, "--strict-markers")
+    result.assert_outcomes(passed=1)
+
+def test_assert_eventually_fixture_should_use_configured_duration(run):
+    result = run(PROBES + """
+    def test_led(assert_eventually):
+        assert_eventually(after(60), "The red LED is not on")
+    """, "--asyncmatch-duration=0.1", "--asyncmatch-poll-delay=0.01")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*The red LED is not on*"])
+
+def test_wait_until_fixture_should_wait(run):
+    result = run(PROBES + """
+    def test_led(wait_until):
+        wait_until(after(0.05), poll_delay=0.01)
+    """)
+    result.assert_outcomes(passed=1)
+
+def test_should_report_slowest_waits_and_total_per_test(run):
+    result = run(PROBES + """
+    def test_slow(assert_eventually):
+        assert_eventually(after(0.2), poll_delay=0.01)
+
+    def test_fast(assert_eventually):
+        assert_eventually(after(0.0))
+    """, "--asyncmatch-slowest=1")
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines([
+        "*asyncmatch: 1 slowest waits*",
+        "*s test_should_report_slowest_waits_and_total_per_test.py::test_slow: led_is_on to be satisfied",
+        "*asyncmatch: total wait time per test*",
+    ])
+    assert_that(result.stdout.str(), not_(contains_string("::test_fast: led_is_on")))
+
+def test_should_not_report_when_disabled(run):
+    result = run(PROBES + """
+    def test_fast(assert_eventually):
+        assert_eventually(after(0.0))
+    """, "--asyncmatch-slowest=0")
+    assert_that(result.stdout.str(), not_(contains_string("slowest waits")))
+
+def test_should_write_trace_of_tests_and_waits(run, pytester):
+    result = run(PROBES + """
+    def test_led(assert_eventually):
+        assert_eventually(after(0.02), poll_delay=0.01)
+    """, "--asyncmatch-trace=trace.json")
+    result.assert_outcomes(passed=1)
+    events = json.loads((pytester.path / "trace.json").read_text())
+    assert_that(events, has_item(has_entries(ph="X", cat="test", name=contains_string("::test_led"))))
+    assert_that(events, has_item(has_entries(ph="b", name="led_is_on to be satisfied")))
@@ -0,0 +1,71 @@
+from asyncmatch import assert_eventually
+from asyncmatch.clock import Clock
+from asyncmatch.poller import Poller, PollerTimeout
+from asyncmatch.probe import Probe
+from asyncmatch.sample_history import SampleHistory
+from asyncmatch.timeout import Timeout
+from hamcrest import assert_that, equal_to, contains_exactly, contains_string, matches_regexp, has_length
+from unittest.mock import MagicMock
+import pytest
+
+class ValueProbe(Probe):
+    def __init__(self, *values):
+        self.values = list(values)
+        self.value = self.values.pop(0)
+    def is_satisfied(self):
+        return self.value == "on"
+    def sample(self):
+        if self.values:
+            self.value = self.values.pop(0)
+    def describe_to(self, description):
+        description.append_text("on")
+    def describe_mismatch(self, description):
+        description.append_text(f"was {self.value}")
+
+def record_all(history, probe, samples):
+    for _ in range(samples):
+        history.record(probe, probe.is_satisfied())
+        probe.sample()
+
+def test_should_reject_non_positive_capacity():
+    with pytest.raises(ValueError):
+        SampleHistory(0)
+
+def test_should_record_only_changes_of_state_with_repeats():
+    clock = MagicMock(spec=Clock)
+    clock.now.side_effect = [10.0, 10.1, 10.2, 10.3, 10.4]
+    history = SampleHistory(10, clock)
+    record_all(history, ValueProbe("off", "off", "booting", "booting", "on"), 5)
+    assert_that(history.timeline(), contains_exactly(
+        "+0.000s was off (x2)",
+        "+0.200s was booting (x2)",
+        "+0.400s satisfied"))
+
+def test_should_keep_only_latest_changes():
+    history = SampleHistory(2)
+    record_all(history, ValueProbe("a", "b", "c", "d"), 4)
+    timeline = history.timeline()
+    assert_that(timeline, has_length(3))
+    assert_that(timeline[0], equal_to("... 2 earlier state(s) not kept"))
+    assert_that(timeline[1], contains_string("was c"))
+    assert_that(timeline[2], contains_string("was d"))
+
+def test_should_have_no_notes_until_recorded():
+    assert_that(SampleHistory(5).notes(), equal_to([]))
+
+def test_poller_should_report_history_on_timeout():
+    probe = ValueProbe("off", "booting", "error")
+    with pytest.raises(PollerTimeout) as err:
+        Poller(Timeout(0.1, 0.01), history=SampleHistory(5)).check(probe)
+    assert_that(err.value.notes[-1], matches_regexp(
+        r"^states seen:\n {10}\+0\.000s was off\n {10}\+\d\.\d{3}s was booting\n {10}\+\d\.\d{3}s was error \(x\d+\)$"))
+
+def test_assert_eventually_should_include_timeline_in_failure_message():
+    with pytest.raises(AssertionError) as err:
+        assert_eventually(ValueProbe("off", "booting"), 0.1, 0.01, "Bespoke reason", history=5)
+    assert_that(str(err.value), contains_string("     but: was booting\n    note: states seen:\n          +0.000s was off\n"))
+
+def test_assert_eventually_should_not_record_history_by_default():
+    with pytest.raises(AssertionError) as err:
+        assert_eventually(ValueProbe("off", "booting"), 0.05, 0.01)
+    assert_that(str(err.value), equal_to("\nExpected: on\n     but: was booting"))
@@ -0,0 +1,68 @@
+from asyncmatch.sample_source import SampleSource
+from hamcrest import assert_that, equal_to
+from threading import Event, Thread
+from unittest.mock import MagicMock, patch
+import pytest
+
+def test_should_read_snapshot():
+    source = SampleSource(lambda: {"gpio3": "high"})
+    assert_that(source.read(), equal_to({"gpio3": "high"}))
+
+def test_should_take_new_snapshot_every_read_without_ttl():
+    read = MagicMock(side_effect=[1, 2])
+    source = SampleSource(read)
+    assert_that([source.read(), source.read()], equal_to([1, 2]))
+
+def test_should_reuse_snapshot_within_ttl():
+    read = MagicMock(side_effect=[1, 2])
+    with patch("asyncmatch.sample_source.monotonic") as monotonic:
+        monotonic.side_effect = [0.0, 0.05]
+        source = SampleSource(read, ttl=0.1)
+        assert_that([source.read(), source.read()], equal_to([1, 1]))
+    read.assert_called_once()
+
+def test_should_take_new_snapshot_after_ttl():
+    read = MagicMock(side_effect=[1, 2])
+    with patch("asyncmatch.sample_source.monotonic") as monotonic:
+        monotonic.side_effect = [0.0, 0.1, 0.1]
+        source = SampleSource(read, ttl=0.1)
+        assert_that([source.read(), source.read()], equal_to([1, 2]))
+
+def test_should_count_snapshots_taken():
+    source = SampleSource(lambda: 1)
+    source.read()
+    source.read()
+    assert_that(source.version, equal_to(2))
+
+def test_should_share_snapshot_in_flight_with_concurrent_reads():
+    reading = Event()
+    release = Event()
+    calls = []
+
+    def read():
+        calls.append(1)
+        reading.set()
+        release.wait(5.0)
+        return len(calls)
+
+    source = SampleSource(read)
+    results = []
+    leader = Thread(target=lambda: results.append(source.read()))
+    leader.start()
+    reading.wait(5.0)
+    followers = [Thread(target=lambda: results.append(source.read())) for _ in range(5)]
+    for follower in followers:
+        follower.start()
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5.0)
+
+    assert_that(len(calls), equal_to(1))
+    assert_that(results, equal_to([1] * 6))
+
+def test_should_raise_read_error_and_read_again_next_time():
+    read = MagicMock(side_effect=[OSError("lsusb failed"), 2])
+    source = SampleSource(read, ttl=10.0)
+    with pytest.raises(OSError):
+        source.read()
+    assert_that(source.read(), equal_to(2))
@@ -0,0 +1,170 @@
+from asyncmatch import AsyncProbe, assert_eventually, assert_eventually_async
+from asyncmatch.poller import Poller, PollerTimeout
+from asyncmatch.probe import Probe
+from asyncmatch.sampler import BudgetedSampler, Sampler, StuckWorkerPolicy
+from asyncmatch.timeout import Timeout
+from hamcrest import assert_that, equal_to, contains_string, has_item, is_not, only_contains, starts_with
+from threading import Event, Timer
+from time import sleep
+from time import monotonic
+import asyncio
+import pytest
+
+class HangingProbe(Probe):
+    """
+    Hangs when sampled until released, or for ever.
+    """
+    def __init__(self):
+        self.release = Event()
+        self.samples = 0
+    def is_satisfied(self):
+        return False
+    def sample(self):
+        self.samples += 1
+        self.release.wait()
+    def describe_to(self, description):
+        description.append_text("frame grabbed")
+    def describe_mismatch(self, description):
+        description.append_text("no frame")
+
+class FailingProbe(HangingProbe):
+    def sample(self):
+        raise OSError("device gone")
+
+class AsyncHangingProbe(AsyncProbe):
+    def is_satisfied(self):
+        return False
+    async def sample(self):
+        await asyncio.sleep(60)
+    def describe_to(self, description):
+        description.append_text("frame grabbed")
+    def describe_mismatch(self, description):
+        description.append_text("no frame")
+
+@pytest.fixture
+def hanging_probe():
+    probe = HangingProbe()
+    yield probe
+    probe.release.set()
+
+def test_sampler_should_sample_probe_directly():
+    probe = HangingProbe()
+    probe.release.set()
+    Sampler().sample(probe, Timeout(5.0, 0.1))
+    assert_that(probe.samples, equal_to(1))
+
+def test_should_reject_non_positive_budget():
+    with pytest.raises(ValueError):
+        BudgetedSampler(0.0)
+
+def test_should_abandon_sample_that_exceeds_budget(hanging_probe):
+    sampler = BudgetedSampler(0.05)
+    start = monotonic()
+    sampler.sample(hanging_probe, Timeout(5.0, 0.1))
+    assert monotonic() - start < 1.0
+    assert_that(sampler.notes(), has_item(starts_with("1 sample(s) abandoned after exceeding the 0.05s sample budget")))
+
+def test_should_give_sample_at_end_of_timeout_its_full_budget():
+    probe = HangingProbe()
+    Timer(0.05, probe.release.set).start()
+    sampler = BudgetedSampler(1.0)
+    sampler.sample(probe, Timeout(0.0, 0.1))
+    assert_that(sampler.notes(), only_contains(starts_with("slowest sample took")))
+
+def test_should_not_wait_beyond_budget_at_end_of_timeout(hanging_probe):
+    sampler = BudgetedSampler(0.05)
+    start = monotonic()
+    sampler.sample(hanging_probe, Timeout(0.0, 0.1))
+    assert monotonic() - start < 1.0
+
+def test_should_raise_exception_from_sample():
+    with pytest.raises(OSError):
+        BudgetedSampler(1.0).sample(FailingProbe(), Timeout(5.0, 0.1))
+
+def test_should_sample_with_new_worker_after_discarding_stuck_one(hanging_probe):
+    sampler = BudgetedSampler(0.02, StuckWorkerPolicy.DISCARD)
+    sampler.sample(hanging_probe, Timeout(5.0, 0.1))
+    sampler.sample(hanging_probe, Timeout(5.0, 0.1))
+    assert_that(hanging_probe.samples, equal_to(2))
+
+def test_should_skip_sampling_while_reused_worker_is_stuck(hanging_probe):
+    sampler = BudgetedSampler(0.02, StuckWorkerPolicy.REUSE)
+    sampler.sample(hanging_probe, Timeout(5.0, 0.1))
+    sampler.sample(hanging_probe, Timeout(5.0, 0.1))
+    assert_that(hanging_probe.samples, equal_to(1))
+    assert_that(sampler.notes(), has_item(
+        "1 sample(s) skipped while a stuck sample was still running"))
+
+def test_should_sample_again_once_reused_worker_recovers(hanging_probe):
+    sampler = BudgetedSampler(0.02, StuckWorkerPolicy.REUSE)
+    sampler.sample(hanging_probe, Timeout(5.0, 0.1))
+    hanging_probe.release.set()
+    sampler.sample(hanging_probe, Timeout(5.0, 0.1))
+    assert_that(hanging_probe.samples, equal_to(2))
+
+def test_poller_should_time_out_on_schedule_despite_hung_sample(hanging_probe):
+    start = monotonic()
+    with pytest.raises(PollerTimeout) as err:
+        Poller(Timeout(0.2, 0.01), BudgetedSampler(0.05)).check(hanging_probe)
+    assert monotonic() - start < 1.0
+    assert_that(err.value.notes, has_item(contains_string("abandoned")))
+
+def test_assert_eventually_should_report_abandoned_samples(hanging_probe):
+    start = monotonic()
+    with pytest.raises(AssertionError) as err:
+        assert_eventually(hanging_probe, 0.2, 0.01, sample_budget=0.05)
+    assert monotonic() - start < 1.0
+    assert_that(str(err.value), contains_string(
+        "     but: no frame\n    note: "))
+    assert_that(str(err.value), contains_string("sample(s) abandoned after exceeding the 0.05s sample budget"))
+
+def test_assert_eventually_async_should_cancel_overrunning_async_sample():
+    start = monotonic()
+    with pytest.raises(AssertionError) as err:
+        asyncio.run(assert_eventually_async(AsyncHangingProbe(), 0.2, 0.01, sample_budget=0.05))
+    assert monotonic() - start < 1.0
+    assert_that(str(err.value), contains_string("abandoned"))
+
+def test_assert_eventually_async_should_sample_blocking_probe_on_worker(hanging_probe):
+    start = monotonic()
+    with pytest.raises(AssertionError):
+        asyncio.run(assert_eventually_async(hanging_probe, 0.2, 0.01, sample_budget=0.05))
+    assert monotonic() - start < 1.0
+
+def test_assert_eventually_should_take_first_sample_of_callable_under_budget():
+    released = Event()
+    def hung():
+        released.wait(10.0)
+        return False
+    start = monotonic()
+    try:
+        with pytest.raises(AssertionError) as err:
+            assert_eventually(hung, 0.2, 0.05, sample_budget=0.1)
+    finally:
+        released.set()
+    assert monotonic() - start < 1.0
+    assert_that(str(err.value), contains_string("abandoned"))
+
+def test_assert_eventually_async_should_take_first_sample_of_callable_under_budget():
+    released = Event()
+    def hung():
+        released.wait(10.0)
+        return False
+    start = monotonic()
+    try:
+        with pytest.raises(AssertionError):
+            asyncio.run(assert_eventually_async(hung, 0.2, 0.05, sample_budget=0.1))
+    finally:
+        released.set()
+    assert monotonic() - start < 1.0
+
+def test_assert_eventually_should_not_report_quick_samples_as_abandoned():
+    def slowish():
+        sleep(0.002)
+        return False
+    with pytest.raises(AssertionError) as err:
+        assert_eventually(slowish, 0.2, 0.05, sample_budget=1.0)
+    assert_that(str(err.value), is_not(contains_string("abandoned")))
+
+def test_assert_eventually_should_be_satisfied_by_first_sample_under_budget():
+    assert_eventually(lambda: True, 0.2, 0.05, sample_budget=1.0)
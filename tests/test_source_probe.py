@@ -0,0 +1,32 @@
+from asyncmatch import SampleSource, SourceProbe, assert_eventually
+from hamcrest import assert_that, equal_to, has_entry
+from hamcrest.core.string_description import StringDescription
+from unittest.mock import MagicMock
+
+def test_should_sample_on_construction():
+    read = MagicMock(return_value={})
+    SourceProbe(SampleSource(read), has_entry("gpio3", "high"))
+    read.assert_called_once()
+
+def test_should_match_snapshot():
+    probe = SourceProbe(SampleSource(lambda: {"gpio3": "high"}), has_entry("gpio3", "high"))
+    assert_that(probe.is_satisfied())
+
+def test_should_describe_using_matcher():
+    probe = SourceProbe(SampleSource(lambda: {"gpio3": "low"}), has_entry("gpio3", "high"))
+    description = StringDescription()
+    probe.describe_to(description)
+    assert_that(str(description), equal_to("a dictionary containing ['gpio3': 'high']"))
+
+def test_should_describe_mismatch_using_last_snapshot():
+    probe = SourceProbe(SampleSource(lambda: {"gpio3": "low"}), has_entry("gpio3", "high"))
+    description = StringDescription()
+    probe.describe_mismatch(description)
+    assert_that(str(description), equal_to("value for 'gpio3' was 'low'"))
+
+def test_probes_sharing_source_should_share_snapshot():
+    read = MagicMock(return_value={"gpio3": "high", "gpio4": "low"})
+    source = SampleSource(read, ttl=10.0)
+    assert_eventually(SourceProbe(source, has_entry("gpio3", "high")), 5.0, 0.01)
+    assert_eventually(SourceProbe(source, has_entry("gpio4", "low")), 5.0, 0.01)
+    read.assert_called_once()
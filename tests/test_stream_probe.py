@@ -0,0 +1,102 @@
+from asyncmatch import StreamProbe, assert_eventually
+from hamcrest import assert_that, equal_to, has_entry, contains_string
+from hamcrest.core.string_description import StringDescription
+from threading import Timer
+from time import monotonic
+from unittest.mock import MagicMock
+
+def describe(probe):
+    description = StringDescription()
+    probe.describe_to(description)
+    return str(description)
+
+def describe_mismatch(probe):
+    description = StringDescription()
+    probe.describe_mismatch(description)
+    return str(description)
+
+def test_should_not_be_satisfied_without_messages():
+    probe = StreamProbe(equal_to("on"))
+    probe.sample()
+    assert not probe.is_satisfied()
+
+def test_should_be_satisfied_once_matching_message_sampled():
+    probe = StreamProbe(equal_to("on"))
+    probe.feed("off")
+    probe.feed("on")
+    assert not probe.is_satisfied()
+    probe.sample()
+    assert probe.is_satisfied()
+    assert_that(probe.matched, equal_to(["on"]))
+
+def test_should_match_each_message_only_once():
+    matcher = MagicMock()
+    matcher.matches.return_value = False
+    probe = StreamProbe(matcher)
+    probe.feed("a")
+    probe.sample()
+    probe.feed("b")
+    probe.sample()
+    probe.sample()
+    assert_that(matcher.matches.call_count, equal_to(2))
+
+def test_should_match_sequence_in_order():
+    probe = StreamProbe(equal_to("A"), equal_to("B"))
+    for message in ["B", "A", "x", "B"]:
+        probe.feed(message)
+    probe.sample()
+    assert probe.is_satisfied()
+    assert_that(probe.matched, equal_to(["A", "B"]))
+
+def test_should_not_match_sequence_out_of_order():
+    probe = StreamProbe(equal_to("A"), equal_to("B"))
+    probe.feed("B")
+    probe.feed("A")
+    probe.sample()
+    assert not probe.is_satisfied()
+
+def test_should_describe_single_matcher():
+    assert_that(describe(StreamProbe(equal_to("on"))), equal_to("a message matching 'on'"))
+
+def test_should_describe_sequence():
+    assert_that(describe(StreamProbe(equal_to("A"), equal_to("B"))),
+        equal_to("messages matching, in order: 'A', then 'B'"))
+
+def test_should_describe_mismatch_when_nothing_received():
+    assert_that(describe_mismatch(StreamProbe(equal_to("on"))), equal_to("no messages were received"))
+
+def test_should_describe_mismatch_of_last_unmatched_message():
+    probe = StreamProbe(has_entry("led", "on"))
+    probe.feed({"led": "off"})
+    probe.sample()
+    assert_that(describe_mismatch(probe), equal_to(
+        "1 message(s) were received; the last not matching a dictionary containing ['led': 'on']: "
+        "value for 'led' was 'off'"))
+
+def test_should_describe_progress_through_sequence():
+    probe = StreamProbe(equal_to("A"), equal_to("B"))
+    probe.feed("A")
+    probe.feed("C")
+    probe.sample()
+    assert_that(describe_mismatch(probe), contains_string("matching 1 of 2 in order"))
+
+def test_should_describe_unmatched_message_against_matcher_that_rejected_it():
+    probe = StreamProbe(equal_to("A"), equal_to("B"))
+    probe.feed("C")
+    probe.feed("A")
+    probe.sample()
+    assert_that(describe_mismatch(probe), equal_to(
+        "2 message(s) were received, matching 1 of 2 in order; the last not matching 'A': was 'C'"))
+
+def test_should_describe_unmatched_message_that_is_none():
+    probe = StreamProbe(equal_to("on"))
+    probe.feed(None)
+    probe.sample()
+    assert_that(describe_mismatch(probe), contains_string("the last not matching 'on': was <None>"))
+
+def test_should_wake_poller_when_message_arrives():
+    probe = StreamProbe(equal_to("on"))
+    Timer(0.05, probe.feed, ["on"]).start()
+    start = monotonic()
+    assert_eventually(probe, 10.0, 5.0)
+    assert monotonic() - start < 1.0
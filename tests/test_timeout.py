@@ -1,27 +1,90 @@
-from unittest.mock import patch
+from unittest.mock import MagicMock
+import asyncio
+import pytest
+from asyncmatch.clock import Clock, SystemClock, VirtualClock
 from asyncmatch.timeout import Timeout
 from hamcrest import assert_that, equal_to
 
-def test_should_not_be_timed_out_if_no_time_elapsed():
-    with patch("asyncmatch.timeout.time") as time:
-        time.return_value = 0.0
-        timeout = Timeout(5.0, 0.1)
-        assert_that(timeout.timed_out(), equal_to(False))
-
-def test_should_be_timed_out_if_time_elapsed_exceeds_duration():
-    with patch("asyncmatch.timeout.time") as time:
-        time.side_effect = [0.0, 100.0]
-        timeout = Timeout(5.0, 0.1)
-        assert_that(timeout.timed_out(), equal_to(True))
-
-def test_should_be_timed_out_if_time_elapsed_equals_duration():
-    with patch("asyncmatch.timeout.time") as time:
-        time.side_effect = [0.0, 9.0]
-        timeout = Timeout(9.0, 0.1)
-        assert_that(timeout.timed_out(), equal_to(True))
-
-def test_should_use_system_sleep():
-    with patch("asyncmatch.timeout.sleep") as sleep:
-        timeout = Timeout(10.0, 0.42)
+@pytest.fixture
+def clock():
+    clock = MagicMock(spec=Clock)
+    clock.now.return_value = 0.0
+    return clock
+
+def test_should_not_be_timed_out_if_no_time_elapsed(clock):
+    timeout = Timeout(5.0, 0.1, clock=clock)
+    assert_that(timeout.timed_out(), equal_to(False))
+
+def test_should_be_timed_out_if_time_elapsed_exceeds_duration(clock):
+    clock.now.side_effect = [0.0, 100.0]
+    timeout = Timeout(5.0, 0.1, clock=clock)
+    assert_that(timeout.timed_out(), equal_to(True))
+
+def test_should_be_timed_out_if_time_elapsed_equals_duration(clock):
+    clock.now.side_effect = [0.0, 9.0]
+    timeout = Timeout(9.0, 0.1, clock=clock)
+    assert_that(timeout.timed_out(), equal_to(True))
+
+def test_should_use_system_clock_by_default():
+    assert isinstance(Timeout(10.0, 0.42).clock, SystemClock)
+
+def test_should_sleep_with_clock(clock):
+    timeout = Timeout(10.0, 0.42, clock=clock)
+    timeout.sleep()
+    clock.sleep.assert_called_once_with(0.42)
+
+def test_should_sleep_asynchronously(clock):
+    timeout = Timeout(10.0, 0.42, clock=clock)
+    asyncio.run(timeout.sleep_async())
+    clock.sleep_async.assert_awaited_once_with(0.42)
+
+def test_should_wait_on_notification_for_at_most_poll_delay(clock):
+    notification = MagicMock()
+    timeout = Timeout(10.0, 0.42, clock=clock)
+    timeout.wait(notification)
+    clock.wait.assert_called_once_with(notification, 0.42)
+
+def test_should_not_sleep_beyond_end_of_timeout(clock):
+    clock.now.side_effect = [0.0, 4.99]
+    timeout = Timeout(5.0, 1.0, clock=clock)
+    timeout.sleep()
+    clock.sleep.assert_called_once_with(pytest.approx(0.01))
+
+def test_should_not_wait_on_notification_beyond_end_of_timeout(clock):
+    clock.now.side_effect = [0.0, 4.5]
+    notification = MagicMock()
+    timeout = Timeout(5.0, 1.0, clock=clock)
+    timeout.wait(notification)
+    clock.wait.assert_called_once_with(notification, pytest.approx(0.5))
+
+def test_should_deduct_time_since_previous_poll_at_fixed_rate(clock):
+    clock.now.side_effect = [0.0, 0.03, 0.13]
+    timeout = Timeout(5.0, 0.1, fixed_rate=True, clock=clock)
+    timeout.sleep()
+    timeout.sleep()
+    assert_that([c.args[0] for c in clock.sleep.call_args_list],
+        equal_to([pytest.approx(0.07), pytest.approx(0.07)]))
+
+def test_should_not_sleep_at_fixed_rate_when_sampling_overruns_delay(clock):
+    clock.now.side_effect = [0.0, 0.25, 0.3]
+    timeout = Timeout(5.0, 0.1, fixed_rate=True, clock=clock)
+    timeout.sleep()
+    timeout.sleep()
+    assert_that([c.args[0] for c in clock.sleep.call_args_list],
+        equal_to([0.0, pytest.approx(0.05)]))
+
+def test_should_not_deduct_sampling_time_by_default(clock):
+    clock.now.side_effect = [0.0, 0.03]
+    timeout = Timeout(5.0, 0.1, clock=clock)
+    timeout.sleep()
+    clock.sleep.assert_called_once_with(0.1)
+
+def test_should_time_out_in_virtual_time():
+    clock = VirtualClock()
+    timeout = Timeout(60.0, 1.0, clock=clock)
+    sleeps = 0
+    while not timeout.timed_out():
         timeout.sleep()
-        sleep.assert_called_once_with(0.42)
\ No newline at end of file
+        sleeps += 1
+    assert_that(sleeps, equal_to(60))
+    assert_that(clock.now(), equal_to(60.0))
@@ -0,0 +1,100 @@
+from asyncmatch import Probe, WaitAborted, watch
+from hamcrest import assert_that, contains_string, equal_to, is_not, less_than, same_instance
+from threading import Event, current_thread
+from time import monotonic, sleep
+import pytest
+
+class BlinkProbe(Probe):
+    """
+    Satisfied only while the LED is on.
+    """
+    def __init__(self, led):
+        self.led = led
+        self.on = False
+        self.samples = 0
+    def is_satisfied(self):
+        return self.on
+    def sample(self):
+        self.samples += 1
+        self.on = self.led.is_set()
+    def describe_to(self, description):
+        description.append_text("LED on")
+    def describe_mismatch(self, description):
+        description.append_text("LED off")
+
+def blink(led, seconds):
+    led.set()
+    sleep(seconds)
+    led.clear()
+
+def test_should_latch_state_that_appears_during_act():
+    led = Event()
+    with watch(BlinkProbe(led), 5.0, 0.005) as w:
+        sleep(0.02)
+        blink(led, 0.05)
+        w.result()
+
+def test_should_not_sample_again_once_satisfied():
+    led = Event()
+    probe = BlinkProbe(led)
+    with watch(probe, 5.0, 0.005):
+        blink(led, 0.05)
+        sleep(0.05)
+    samples = probe.samples
+    sleep(0.05)
+    assert_that(probe.samples, equal_to(samples))
+    assert probe.is_satisfied()
+
+def test_should_report_mismatch_when_not_satisfied_in_time():
+    with pytest.raises(AssertionError) as error:
+        with watch(BlinkProbe(Event()), 0.05, 0.01, "LED should blink") as w:
+            w.result()
+    assert_that(str(error.value), contains_string("LED should blink\nExpected: LED on\n     but: LED off"))
+
+def test_should_check_result_on_leaving_block():
+    with pytest.raises(AssertionError):
+        with watch(lambda: False, 0.05, 0.01):
+            pass
+
+def test_should_be_usable_without_block():
+    led = Event()
+    w = watch(BlinkProbe(led), 5.0, 0.005)
+    blink(led, 0.05)
+    w.result()
+    assert w.done()
+
+def test_should_stop_watching_when_block_raises():
+    start = monotonic()
+    with pytest.raises(ValueError):
+        with watch(lambda: False, 5.0, 0.01) as w:
+            raise ValueError("act failed")
+    assert_that(monotonic() - start, less_than(1.0))
+    assert w.done()
+
+def test_should_be_aborted_by_abort_condition():
+    with pytest.raises(WaitAborted):
+        with watch(lambda: False, 5.0, 0.01, abort_if=[lambda: "device disconnected"]):
+            pass
+
+class BrokenProbe(Probe):
+    """
+    Raises when sampled, which happens only on the watch's thread.
+    """
+    def __init__(self):
+        self.sampled_on = None
+    def is_satisfied(self):
+        return False
+    def sample(self):
+        self.sampled_on = current_thread()
+        raise RuntimeError("broken")
+    def describe_to(self, description):
+        description.append_text("not broken")
+    def describe_mismatch(self, description):
+        description.append_text("broken")
+
+def test_should_raise_exception_from_probe():
+    probe = BrokenProbe()
+    with pytest.raises(RuntimeError):
+        with watch(probe, 5.0, 0.01):
+            pass
+    assert_that(probe.sampled_on, is_not(same_instance(current_thread())))